@@ -2,6 +2,7 @@ from typing import Dict, List, Optional
 from datetime import datetime
 from bson import ObjectId
 from app.database.mongodb import get_database
+from app.operations.solution_cache import solution_cache
 import logging
 
 logging.basicConfig(level=logging.DEBUG)  # Enable debug logging
@@ -76,6 +77,13 @@ class FeedbackAgent:
             logging.exception("Database error while updating solution")
             raise e
 
+        # Ratings decide whether the cached solution keeps being served
+        if solution.get("cache_key"):
+            try:
+                await solution_cache.record_feedback(db, solution["cache_key"], rating, was_helpful, issues)
+            except Exception:
+                logging.exception("Error while applying feedback to solution cache")
+
         return {
             "feedback_id": str(result.inserted_id),
             "average_rating": avg_rating
@@ -2,6 +2,7 @@ from typing import Dict
 from datetime import datetime
 from app.tools.ai_flashcard_gen import AIFlashcardGenerator
 from app.database.mongodb import get_database
+from app.schemas.flashcard import FlashcardSetDB
 
 class FlashcardAgent:
     """Main agent for flashcard operations"""
@@ -24,7 +25,7 @@ class FlashcardAgent:
             raise ValueError("Solution not found for this homework")
 
         # Generate flashcards
-        cards = self.ai_generator.generate_flashcards(
+        cards = await self.ai_generator.generate_flashcards(
             question=solution["question"],
             solution_data=solution,
             subject=solution["subject"],
@@ -43,6 +44,31 @@ class FlashcardAgent:
             "total_cards": len(cards)
         }
 
+    async def create_flashcard_set(
+        self,
+        homework_id: str,
+        output_language: str
+    ) -> Dict:
+        """Generate flashcards and save them to the flashcard_sets collection"""
+
+        flashcard_data = await self.generate_flashcards(
+            homework_id=homework_id,
+            output_language=output_language
+        )
+
+        # Save to database
+        flashcard_db = FlashcardSetDB(**flashcard_data)
+
+        db = get_database()
+        flashcard_dict = flashcard_db.dict(by_alias=True, exclude={"id"})
+        insert_result = await db.flashcard_sets.insert_one(flashcard_dict)
+
+        return {
+            "set_id": str(insert_result.inserted_id),
+            "created_at": flashcard_db.created_at,
+            **flashcard_data
+        }
+
     async def track_review(
         self,
         set_id: str,
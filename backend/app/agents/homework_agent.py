@@ -1,8 +1,15 @@
+import asyncio
 from fastapi import UploadFile
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from app.operations.file_operations import FileOperations
 from app.operations.image_processor import ImageProcessor
 from app.operations.audio_processor import AudioProcessor
+from app.operations.ocr_pool import ocr_pool
+from app.operations.ocr_cache import ocr_cache
+from app.operations.ocr_router import ocr_route_stats
+from app.operations.layout_segmenter import LayoutSegmenter
+from app.database.mongodb import get_database
 from app.utils.constants import SUPPORTED_LANGUAGES
 from app.config import settings
 
@@ -13,6 +20,7 @@ class HomeworkAgent:
         self.file_ops = FileOperations()
         self.image_processor = ImageProcessor()
         self.audio_processor = AudioProcessor()
+        self.layout_segmenter = LayoutSegmenter()
 
     async def process_homework_submission(
         self,
@@ -72,14 +80,7 @@ class HomeworkAgent:
         # Get tesseract language code
         tesseract_code = SUPPORTED_LANGUAGES[input_language]["tesseract_code"]
 
-        # Extract text using OCR with automatic fallback to EasyOCR
-        extracted_text = self.image_processor.extract_text_with_ocr_fallback(
-            image_path,
-            tesseract_code
-        )
-
-        # Classify subject
-        subject = self.image_processor.classify_subject(extracted_text)
+        extracted_text, subject = await self._extract_text_cached(image_path, tesseract_code)
 
         return {
             "input_type": input_type,
@@ -91,6 +92,140 @@ class HomeworkAgent:
             "output_language": output_language
         }
 
+    async def process_worksheet_submission(
+        self,
+        file: UploadFile,
+        input_language: str,
+        output_language: str
+    ) -> Dict:
+        """
+        Split a worksheet into question regions and OCR them in parallel
+
+        Pages are segmented one at a time in a worker thread; the regions of a
+        page are queued for OCR while the next page is being rendered. If the
+        request fails or is cancelled, the upload and every region crop
+        written so far are deleted.
+
+        Args:
+            file: Worksheet upload (image, multi-page TIFF or PDF)
+            input_language: Language of input
+            output_language: Language for output
+
+        Returns:
+            Dict with source_path, page_count and regions (page_number,
+            region_index, bbox, image_path, extracted_text, subject)
+        """
+        self.file_ops.validate_worksheet_file(file)
+
+        source_path = await self.file_ops.save_upload_file(file, settings.STORAGE_PATH)
+        region_dir = str(Path(settings.STORAGE_PATH) / "uploads" / "regions")
+        tesseract_code = SUPPORTED_LANGUAGES[input_language]["tesseract_code"]
+
+        # Bound this request's share of the OCR queue so large worksheets don't get rejected
+        semaphore = asyncio.Semaphore(settings.WORKSHEET_OCR_CONCURRENCY)
+
+        async def ocr_region(page_number: int, region: Dict) -> Dict:
+            async with semaphore:
+                extracted_text, subject = await self._extract_text_cached(
+                    region["image_path"], tesseract_code, near_duplicates=False
+                )
+            return {**region, "page_number": page_number, "extracted_text": extracted_text, "subject": subject}
+
+        written_files = [source_path]
+        pages = self.layout_segmenter.split_to_files(source_path, region_dir, written_files)
+        tasks: List[asyncio.Task] = []
+        render: Optional[asyncio.Task] = None
+        page_count = 0
+        completed = False
+
+        try:
+            while True:
+                # Shielded: a cancelled request lets the page finish so the generator can be closed
+                render = asyncio.create_task(asyncio.to_thread(next, pages, None))
+                page = await asyncio.shield(render)
+                if page is None:
+                    break
+                page_count += 1
+                if page_count > settings.WORKSHEET_MAX_PAGES:
+                    raise ValueError(f"Worksheet has more than {settings.WORKSHEET_MAX_PAGES} pages")
+                tasks.extend(
+                    asyncio.create_task(ocr_region(page["page_number"], region))
+                    for region in page["regions"]
+                )
+
+            regions = await asyncio.gather(*tasks)
+            completed = True
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            try:
+                if render is not None and not render.done():
+                    await asyncio.gather(render, return_exceptions=True)
+                pages.close()
+            finally:
+                # Includes the crops of a page that was still rendering
+                if not completed:
+                    self.file_ops.delete_files(written_files)
+
+        return {
+            "input_type": "worksheet",
+            "source_path": source_path,
+            "page_count": page_count,
+            "regions": list(regions),
+            "input_language": input_language,
+            "output_language": output_language
+        }
+
+    async def _extract_text_cached(
+        self,
+        image_path: str,
+        tesseract_code: str,
+        near_duplicates: bool = True
+    ) -> Tuple[str, str]:
+        """
+        OCR an uploaded image, reusing cached results for identical or near-identical uploads
+
+        Worksheet regions pass near_duplicates=False: crops of neighbouring
+        questions look alike and must only ever match exactly.
+
+        Returns:
+            Tuple of (extracted_text, subject)
+        """
+        db = get_database()
+
+        if not settings.OCR_CACHE_ENABLED:
+            extracted_text = await self._run_ocr(db, image_path, tesseract_code)
+            return extracted_text, self.image_processor.classify_subject(extracted_text)
+
+        # Exact match on the uploaded bytes first, then verified near-duplicates
+        sha256 = await asyncio.to_thread(ocr_cache.hash_file, image_path)
+        cached, fingerprint = await ocr_cache.lookup(db, sha256, tesseract_code, image_path, near_duplicates)
+
+        if cached:
+            return cached["extracted_text"], cached["subject"]
+
+        extracted_text = await self._run_ocr(db, image_path, tesseract_code)
+
+        # Classify subject
+        subject = self.image_processor.classify_subject(extracted_text)
+
+        # Empty extractions are not cached so a retry gets a fresh OCR run
+        if extracted_text:
+            await ocr_cache.store(db, sha256, tesseract_code, fingerprint, extracted_text, subject)
+
+        return extracted_text, subject
+
+    async def _run_ocr(self, db, image_path: str, tesseract_code: str) -> str:
+        """Run OCR off the event loop and record which engine won a comparison run"""
+        result = await ocr_pool.run_ocr(image_path, tesseract_code)
+
+        if result["route"] and result["compared"]:
+            await ocr_route_stats.record(db, result["route"], result["tried"], result["winners"])
+
+        return result["text"]
+
     async def _process_text_input(
         self,
         text_input: str,
@@ -0,0 +1,109 @@
+from typing import Dict, Optional
+from fastapi.encoders import jsonable_encoder
+from app.agents.solution_agent import SolutionAgent
+from app.agents.practice_agent import PracticeAgent
+from app.agents.flashcard_agent import FlashcardAgent
+from app.agents.study_pack_agent import StudyPackAgent
+from app.operations.job_queue import job_queue, SUCCEEDED, FAILED
+from app.database.mongodb import get_database
+from app.schemas.jobs import AsyncJobRequest
+
+# Request fields that control queueing rather than the generation itself
+JOB_CONTROL_FIELDS = set(AsyncJobRequest.__fields__)
+
+
+class JobAgent:
+    """Main agent for background generation jobs"""
+
+    def __init__(self):
+        self.solution_agent = SolutionAgent()
+        self.practice_agent = PracticeAgent()
+        self.flashcard_agent = FlashcardAgent()
+        self.study_pack_agent = StudyPackAgent()
+
+    def register_handlers(self) -> None:
+        """Register a handler per job type with the queue (called at startup)"""
+        job_queue.register("solution", self._run_solution)
+        job_queue.register("practice", self._run_practice)
+        job_queue.register("flashcards", self._run_flashcards)
+        job_queue.register("audio", self._run_audio)
+        job_queue.register("audio_pregen", self._run_audio_pregen)
+        job_queue.register("study_pack", self._run_study_pack)
+
+    async def _run_solution(self, payload: Dict) -> Dict:
+        return jsonable_encoder(await self.solution_agent.create_solution(**payload))
+
+    async def _run_practice(self, payload: Dict) -> Dict:
+        return jsonable_encoder(await self.practice_agent.create_practice_test(**payload))
+
+    async def _run_flashcards(self, payload: Dict) -> Dict:
+        return jsonable_encoder(await self.flashcard_agent.create_flashcard_set(**payload))
+
+    async def _run_study_pack(self, payload: Dict) -> Dict:
+        return jsonable_encoder(await self.study_pack_agent.create_study_pack(**payload))
+
+    async def _run_audio(self, payload: Dict) -> Dict:
+        audio_url = await self.solution_agent.regenerate_audio(**payload)
+        return {
+            "solution_id": payload["solution_id"],
+            "audio_url": audio_url,
+            "language": payload["language"]
+        }
+
+    async def _run_audio_pregen(self, payload: Dict) -> Dict:
+        return await self.solution_agent.pregenerate_audio(**payload)
+
+    async def submit(
+        self,
+        job_type: str,
+        payload: Dict,
+        idempotency_key: Optional[str] = None,
+        priority: int = 0
+    ) -> Dict:
+        """
+        Queue a generation job
+
+        Args:
+            job_type: solution, practice, flashcards, study_pack or audio
+            payload: Request fields (queue control fields are dropped)
+            idempotency_key: Client-supplied key for safe retries
+            priority: Higher runs first
+
+        Returns:
+            Dict with job_id, status and polling URLs
+        """
+        payload = {k: v for k, v in payload.items() if k not in JOB_CONTROL_FIELDS}
+        job = await job_queue.enqueue(get_database(), job_type, payload, idempotency_key, priority)
+        job_id = str(job["_id"])
+        return {
+            "job_id": job_id,
+            "type": job["type"],
+            "status": job["status"],
+            "status_url": f"/api/jobs/{job_id}",
+            "result_url": f"/api/jobs/{job_id}/result"
+        }
+
+    async def get_job(self, job_id: str) -> Dict:
+        job = await job_queue.get(get_database(), job_id)
+        if not job:
+            raise ValueError("Job not found")
+        job["job_id"] = str(job.pop("_id"))
+        return job
+
+    async def get_result(self, job_id: str) -> Dict:
+        """
+        Result of a finished job
+
+        Raises:
+            ValueError: Job not found
+            RuntimeError: Job failed (message is the job error)
+        """
+        job = await self.get_job(job_id)
+        if job["status"] == FAILED:
+            raise RuntimeError(job["error"])
+        return {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "ready": job["status"] == SUCCEEDED,
+            "result": job["result"]
+        }
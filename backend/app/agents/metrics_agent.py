@@ -0,0 +1,59 @@
+from typing import Dict
+from app.operations.ocr_pool import ocr_pool
+from app.operations.ocr_cache import ocr_cache
+from app.operations.ocr_router import ocr_route_stats
+from app.operations.solution_cache import solution_cache
+from app.operations.job_queue import job_queue
+from app.operations.audio_cache import audio_cache
+from app.operations.loop_monitor import loop_monitor
+from app.database.mongodb import get_database
+from app.tools.llm_client import llm_client
+from app.tools.token_budget import token_budget
+from app.tools.llm_resilience import llm_resilience
+from app.tools.tts_engine import tts_latency
+from app.config import settings
+
+
+class MetricsAgent:
+    """Main agent for runtime performance metrics"""
+
+    async def get_ocr_metrics(self) -> Dict:
+        """OCR worker pool, result cache, routing win rates and per-worker model load statistics"""
+        return {
+            "pool": ocr_pool.stats(),
+            "cache": ocr_cache.stats(),
+            "routes": ocr_route_stats.stats(),
+            "workers": await ocr_pool.model_stats()
+        }
+
+    async def get_llm_metrics(self) -> Dict:
+        """Shared OpenAI client concurrency, request counters and solution cache hit rates"""
+        return {
+            "client": llm_client.stats(),
+            "token_budget": token_budget.stats(),
+            "resilience": llm_resilience.stats(),
+            "solution_cache": solution_cache.stats()
+        }
+
+    async def get_llm_usage(self, minutes: int) -> Dict:
+        """Recorded tokens, cost and latency per tool and language"""
+        return {
+            "minutes": minutes,
+            "usage": await token_budget.usage_summary(get_database(), minutes)
+        }
+
+    async def get_job_metrics(self) -> Dict:
+        """Background job counts by type and status, plus worker retry/failure counters"""
+        return await job_queue.stats(get_database())
+
+    async def get_event_loop_metrics(self) -> Dict:
+        """How late the event loop runs timers (blocking work on the loop shows up here)"""
+        return loop_monitor.stats()
+
+    async def get_audio_metrics(self) -> Dict:
+        """Audio cache size, hit/miss counters, evictions and synthesis latency per TTS engine"""
+        return {
+            **await audio_cache.usage(get_database()),
+            "default_engine": settings.TTS_ENGINE,
+            "engines": tts_latency.stats()
+        }
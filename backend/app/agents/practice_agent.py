@@ -2,6 +2,7 @@ from typing import Dict, List
 from bson import ObjectId
 from app.tools.ai_practice_gen import AIPracticeGenerator
 from app.database.mongodb import get_database
+from app.schemas.practice import PracticeTestDB
 
 class PracticeAgent:
     """Main agent for practice test operations"""
@@ -30,7 +31,7 @@ class PracticeAgent:
         topic = ", ".join(concepts) if concepts else solution.get("question", "")[:100]
 
         # Generate questions
-        questions = self.ai_generator.generate_practice_questions(
+        questions = await self.ai_generator.generate_practice_questions(
             topic=topic,
             subject=solution["subject"],
             question_count=question_count,
@@ -46,6 +47,35 @@ class PracticeAgent:
             "questions": questions
         }
 
+    async def create_practice_test(
+        self,
+        homework_id: str,
+        question_count: int,
+        difficulty: str,
+        output_language: str
+    ) -> Dict:
+        """Generate a practice test and save it to the practice_tests collection"""
+
+        test_data = await self.generate_practice_test(
+            homework_id=homework_id,
+            question_count=question_count,
+            difficulty=difficulty,
+            output_language=output_language
+        )
+
+        # Save to database
+        test_db = PracticeTestDB(**test_data)
+
+        db = get_database()
+        test_dict = test_db.dict(by_alias=True, exclude={"id"})
+        insert_result = await db.practice_tests.insert_one(test_dict)
+
+        return {
+            "test_id": str(insert_result.inserted_id),
+            "created_at": test_db.created_at,
+            **test_data
+        }
+
     async def submit_practice_test(
         self,
         test_id: str,
@@ -1,22 +1,36 @@
-from typing import Dict, Optional
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 from bson import ObjectId
 from app.tools.ai_solver import AISolver
-from app.tools.local_tts import LocalTTS
+from app.tools.tts_engines import get_tts_engine
+from app.tools.llm_client import llm_client
+from app.tools.llm_resilience import llm_resilience, CLOSED
+from app.tools.token_budget import token_budget
+from app.operations.solution_cache import solution_cache
+from app.operations.audio_cache import audio_cache
+from app.operations.job_queue import job_queue, JobDeferred
 from app.database.mongodb import get_database
+from app.schemas.solution import SolutionDB
+from app.config import settings
+
+logger = logging.getLogger(__name__)
 
 class SolutionAgent:
     """Main agent for solution generation"""
 
     def __init__(self):
         self.ai_solver = AISolver()
-        self.tts = LocalTTS()  # Using free gTTS instead of expensive OpenAI TTS
+        # Chunk syntheses still running in the background (keeps them referenced)
+        self._audio_tasks: Set[asyncio.Task] = set()
 
     async def generate_solution(
         self,
         homework_id: str,
         generate_audio: bool,
         output_language: str,
-        audio_language: Optional[str] = None
+        audio_language: Optional[str] = None,
+        tts_engine: Optional[str] = None
     ) -> Dict:
         """
         Generate solution for homework
@@ -26,11 +40,95 @@ class SolutionAgent:
             generate_audio: Whether to generate audio
             output_language: Language for solution text
             audio_language: Language for audio (if None, uses output_language)
+            tts_engine: TTS engine for the audio (if None, uses TTS_ENGINE)
 
         Returns:
             Dict with solution data including audio URL if requested
         """
-        # Get homework from database
+        homework = await self.get_homework(homework_id)
+        return await self.generate_solution_for_homework(
+            homework, generate_audio, output_language, audio_language, tts_engine
+        )
+
+    async def create_solution(
+        self,
+        homework_id: str,
+        generate_audio: bool,
+        output_language: str,
+        audio_language: Optional[str] = None,
+        tts_engine: Optional[str] = None
+    ) -> Dict:
+        """
+        Generate a solution and save it to the solutions collection
+
+        Returns:
+            Dict with solution_id, created_at and the solution data
+        """
+        solution_data = await self.generate_solution(
+            homework_id=homework_id,
+            generate_audio=generate_audio,
+            output_language=output_language,
+            audio_language=audio_language,
+            tts_engine=tts_engine
+        )
+
+        # Save to database
+        solution_db = SolutionDB(
+            homework_id=homework_id,
+            **solution_data
+        )
+
+        return {
+            "solution_id": await self.save_solution(solution_db),
+            "homework_id": homework_id,
+            "created_at": solution_db.created_at,
+            **solution_data
+        }
+
+    async def generate_solution_for_homework(
+        self,
+        homework: Dict,
+        generate_audio: bool,
+        output_language: str,
+        audio_language: Optional[str] = None,
+        tts_engine: Optional[str] = None
+    ) -> Dict:
+        """
+        Generate solution for an already fetched homework document
+
+        Args:
+            homework: Homework document (see get_homework)
+            generate_audio: Whether to generate audio
+            output_language: Language for solution text
+            audio_language: Language for audio (if None, uses output_language)
+            tts_engine: TTS engine for the audio (if None, uses TTS_ENGINE)
+
+        Returns:
+            Dict with solution data including audio URL if requested
+        """
+        db = get_database()
+
+        # Reuse a cached solution for the same question, otherwise generate with AI
+        solution_data, cache_key = await self._solve_cached(db, homework, output_language)
+
+        # Generate audio if requested
+        audio_url = None
+        if generate_audio:
+            audio_url = await self._generate_audio(solution_data, audio_language or output_language, tts_engine)
+
+        return {
+            "question": homework["extracted_text"],
+            "subject": homework["subject"],
+            "solution_steps": solution_data["solution_steps"],
+            "final_answer": solution_data["final_answer"],
+            "concepts_covered": solution_data["concepts_covered"],
+            "audio_url": audio_url,
+            "output_language": output_language,
+            "cache_key": cache_key
+        }
+
+    async def get_homework(self, homework_id: str) -> Dict:
+        """Fetch a homework submission, raising ValueError if the ID is invalid or unknown"""
         db = get_database()
         try:
             object_id = ObjectId(homework_id)
@@ -42,38 +140,415 @@ class SolutionAgent:
         if not homework:
             raise ValueError("Homework not found")
 
-        # Generate solution using AI
-        solution_data = self.ai_solver.generate_solution(
-            question=homework["extracted_text"],
-            subject=homework["subject"],
-            output_language=output_language,
-            grade_level=5
-        )
+        return homework
+
+    async def stream_solution(
+        self,
+        homework: Dict,
+        generate_audio: bool,
+        output_language: str,
+        audio_language: Optional[str] = None,
+        tts_engine: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Generate a solution, yielding each part as soon as it is available
+
+        Args:
+            homework: Homework document (see get_homework)
+            generate_audio: Whether to generate audio once the text is complete
+            output_language: Language for solution text
+            audio_language: Language for audio (if None, uses output_language)
+            tts_engine: TTS engine for the audio (if None, uses TTS_ENGINE)
+
+        Yields:
+            (event, data) pairs: "meta", one "step" per solution step,
+            "final_answer", "concepts", and finally "solution" with the same
+            dict generate_solution() returns
+        """
+        db = get_database()
+        question = homework["extracted_text"]
+
+        yield "meta", {
+            "homework_id": str(homework["_id"]),
+            "question": question,
+            "subject": homework["subject"],
+            "output_language": output_language
+        }
+
+        cache_key = None
+        embedding = None
+        solution_data = None
+
+        if settings.SOLUTION_CACHE_ENABLED:
+            cached, cache_key, embedding = await self.lookup_cached_solution(db, question, output_language)
+            if cached:
+                cache_key = cached["key"]
+                solution_data = cached
+                for step in cached["solution_steps"]:
+                    yield "step", step
+                yield "final_answer", {"final_answer": cached["final_answer"]}
+                yield "concepts", {"concepts_covered": cached["concepts_covered"]}
+
+        if solution_data is None:
+            solution_data = {}
+            async for key, index, value in self.ai_solver.stream_solution(
+                question=question,
+                subject=homework["subject"],
+                output_language=output_language,
+                grade_level=5
+            ):
+                if key == "solution_steps" and index is not None:
+                    yield "step", value
+                elif key == "final_answer":
+                    yield "final_answer", {"final_answer": value}
+                elif key == "concepts_covered" and index is None:
+                    yield "concepts", {"concepts_covered": value}
+                if index is None:
+                    solution_data[key] = value
+
+            missing = {"solution_steps", "final_answer", "concepts_covered"} - solution_data.keys()
+            if missing:
+                raise Exception(f"Error generating solution: response is missing {', '.join(sorted(missing))}")
+
+            if cache_key:
+                await solution_cache.store(
+                    db, cache_key, question, homework["subject"], output_language, solution_data, embedding
+                )
 
-        # Generate audio if requested
         audio_url = None
         if generate_audio:
-            # Use audio_language if provided, otherwise fall back to output_language
-            audio_lang = audio_language if audio_language else output_language
-            audio_url = self.tts.generate_audio(
-                solution_data,
-                audio_lang
-            )
+            audio_url = await self._generate_audio(solution_data, audio_language or output_language, tts_engine)
 
-        return {
-            "question": homework["extracted_text"],
+        yield "solution", {
+            "question": question,
             "subject": homework["subject"],
             "solution_steps": solution_data["solution_steps"],
             "final_answer": solution_data["final_answer"],
             "concepts_covered": solution_data["concepts_covered"],
             "audio_url": audio_url,
-            "output_language": output_language
+            "output_language": output_language,
+            "cache_key": cache_key
         }
 
+    def _synthesize_chunks(self, solution_data: Dict, language: str, tts_engine: Optional[str] = None) -> List[asyncio.Task]:
+        """
+        Start synthesising every narration chunk in parallel
+
+        Each chunk is cached on its own, so chunks already synthesised (for
+        this or any other solution) are lookups and an edited step only
+        re-synthesises that step.
+        """
+        db = get_database()
+        engine = get_tts_engine(tts_engine)
+        tasks = [
+            asyncio.create_task(audio_cache.get_or_create(
+                db,
+                chunk,
+                language,
+                engine.engine,
+                engine.voice,
+                lambda audio_path, chunk=chunk: engine.render(chunk, language, audio_path)
+            ))
+            for chunk in engine.narration_chunks(solution_data)
+        ]
+        for task in tasks:
+            self._audio_tasks.add(task)
+            task.add_done_callback(self._audio_task_done)
+        return tasks
+
+    @staticmethod
+    def _chunk_keys(solution_data: Dict, language: str, tts_engine: Optional[str] = None) -> List[str]:
+        """Audio cache keys of a solution's narration chunks, for pinning them until they are joined"""
+        engine = get_tts_engine(tts_engine)
+        return [
+            audio_cache.key(chunk, language, engine.engine, engine.voice)
+            for chunk in engine.narration_chunks(solution_data)
+        ]
+
+    def _audio_task_done(self, task: asyncio.Task) -> None:
+        self._audio_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.warning(f"Audio chunk synthesis failed: {str(task.exception())}")
+
+    async def _generate_audio(self, solution_data: Dict, language: str, tts_engine: Optional[str] = None) -> str:
+        """Narrate a solution step by step and join the chunks into one file"""
+        # Pinned so a quota eviction can't remove a finished chunk before the join
+        with audio_cache.pinned(self._chunk_keys(solution_data, language, tts_engine)):
+            tasks = self._synthesize_chunks(solution_data, language, tts_engine)
+            try:
+                filenames = await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+            filename = await audio_cache.concatenate(get_database(), filenames, language)
+        return f"/api/solution/audio/{filename}"
+
+    async def get_audio_playlist(
+        self,
+        solution_id: str,
+        language: Optional[str] = None,
+        tts_engine: Optional[str] = None
+    ) -> Dict:
+        """
+        Per-step audio URLs for progressive playback
+
+        Missing chunks are synthesised in the background; this waits only for
+        the first one, so a player can start while the rest are made. Poll
+        again for chunks that are not ready yet.
+
+        Args:
+            solution_id: Solution document ID
+            language: Audio language (default: the solution's language)
+            tts_engine: TTS engine (default: TTS_ENGINE)
+
+        Returns:
+            Dict with the chunk list (url, ready) and the stream URL
+        """
+        solution = await self._get_solution(solution_id)
+        language = language or solution["output_language"]
+
+        engine = get_tts_engine(tts_engine)
+        tasks = self._synthesize_chunks(solution, language, engine.engine)
+        await tasks[0]
+
+        chunks = []
+        for index, (chunk, task) in enumerate(zip(engine.narration_chunks(solution), tasks)):
+            filename = task.result() if task.done() and not task.exception() else None
+            chunks.append({
+                "index": index,
+                "kind": "final_answer" if index == len(tasks) - 1 else "step",
+                "text": chunk,
+                "ready": filename is not None,
+                "url": f"/api/solution/audio/{filename}" if filename else None
+            })
+
+        return {
+            "solution_id": solution_id,
+            "language": language,
+            "engine": engine.engine,
+            "ready": all(chunk["ready"] for chunk in chunks),
+            "chunks": chunks,
+            "stream_url": f"/api/solution/{solution_id}/audio/stream?language={language}&engine={engine.engine}"
+        }
+
+    async def open_audio_stream(
+        self,
+        solution_id: str,
+        language: Optional[str] = None,
+        tts_engine: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Narration as one MP3 stream that starts as soon as step 1 is ready
+
+        Raises ValueError for an unknown solution before anything is streamed.
+
+        Returns:
+            Async iterator of MP3 bytes, chunk by chunk in narration order
+        """
+        solution = await self._get_solution(solution_id)
+        language = language or solution["output_language"]
+        keys = self._chunk_keys(solution, language, tts_engine)
+        tasks = self._synthesize_chunks(solution, language, tts_engine)
+        return self._stream_chunks(tasks, keys)
+
+    async def _stream_chunks(self, tasks: List[asyncio.Task], keys: List[str]) -> AsyncIterator[bytes]:
+        with audio_cache.pinned(keys):
+            try:
+                for task in tasks:
+                    filename = await task
+                    # Frames only: per-chunk tags and VBR headers would break the joined stream
+                    yield await asyncio.to_thread(audio_cache.read_frames, filename)
+            finally:
+                # Client went away: stop waiting (syntheses already running still finish into the cache)
+                for task in tasks:
+                    task.cancel()
+
+    async def save_solution(self, solution_db: SolutionDB) -> str:
+        """
+        Insert a solution, reference its audio in the audio cache and queue
+        audio pregeneration when the user has auto_generate_audio on
+
+        Returns:
+            The new solution_id
+        """
+        db = get_database()
+        insert_result = await db.solutions.insert_one(solution_db.dict(by_alias=True, exclude={"id"}))
+        solution_id = str(insert_result.inserted_id)
+        await audio_cache.add_ref(db, solution_db.audio_url, solution_id)
+        await self._queue_audio_pregeneration(db, solution_id, solution_db)
+        return solution_id
+
+    async def _queue_audio_pregeneration(self, db, solution_id: str, solution_db: SolutionDB) -> None:
+        """
+        Queue low-priority audio jobs for the preferred languages
+
+        The voice_language audio becomes the solution's audio_url (unless it
+        already has one); audio in the solution's own language is cached so
+        the playlist and stream endpoints start without waiting.
+        """
+        if not settings.AUDIO_PREGEN_ENABLED:
+            return
+        try:
+            prefs = await db.preferences.find_one({"is_default": True})
+            if not prefs or not prefs.get("auto_generate_audio"):
+                return
+
+            voice_language = prefs.get("voice_language", "en")
+            languages = [voice_language]
+            if solution_db.output_language != voice_language:
+                languages.append(solution_db.output_language)
+
+            for language in languages:
+                await job_queue.enqueue(
+                    db,
+                    "audio_pregen",
+                    {"solution_id": solution_id, "language": language, "attach": language == voice_language},
+                    idempotency_key=f"{solution_id}:{language}",
+                    priority=settings.AUDIO_PREGEN_PRIORITY
+                )
+        except Exception as e:
+            # Audio is still generated on demand
+            logger.warning(f"Could not queue audio pregeneration for solution {solution_id}: {str(e)}")
+
+    def _pregeneration_busy(self) -> Optional[str]:
+        """Why background audio should wait, or None when there is spare capacity"""
+        if llm_resilience.breaker.state != CLOSED:
+            return "AI service circuit breaker is not closed"
+        llm_stats = llm_client.stats()
+        if llm_stats["waiting"] or llm_stats["in_flight"] >= settings.OPENAI_MAX_CONCURRENT_REQUESTS * settings.AUDIO_PREGEN_BUSY_RATIO:
+            return f"{llm_stats['in_flight']} AI requests in flight, {llm_stats['waiting']} waiting"
+        if token_budget.stats()["waiting"]:
+            return "requests are waiting for the token budget"
+        if audio_cache.in_flight >= settings.TTS_WORKERS:
+            return f"{audio_cache.in_flight} narration chunks being synthesised"
+        return None
+
+    async def pregenerate_audio(
+        self,
+        solution_id: str,
+        language: str,
+        attach: bool = False,
+        tts_engine: Optional[str] = None
+    ) -> Dict:
+        """
+        Background audio generation for a stored solution (audio_pregen jobs)
+
+        Raises JobDeferred while the API or TTS is busy, so interactive
+        requests keep priority.
+
+        Args:
+            solution_id: Solution document ID
+            language: Audio language
+            attach: Set as the solution's audio_url if it has none yet
+            tts_engine: TTS engine (if None, uses TTS_ENGINE)
+
+        Returns:
+            Dict with solution_id, language, audio_url and whether it was attached
+        """
+        busy = self._pregeneration_busy()
+        if busy:
+            raise JobDeferred(settings.AUDIO_PREGEN_DEFER_SECONDS, busy)
+
+        db = get_database()
+        solution = await self._get_solution(solution_id)
+        audio_url = await self._generate_audio(solution, language, tts_engine)
+
+        attached = False
+        if attach:
+            # Never replaces audio the user generated or regenerated in the meantime
+            result = await db.solutions.update_one(
+                {"_id": solution["_id"], "audio_url": None},
+                {"$set": {"audio_url": audio_url}}
+            )
+            attached = result.modified_count > 0
+            if attached:
+                await audio_cache.add_ref(db, audio_url, solution_id)
+
+        return {
+            "solution_id": solution_id,
+            "language": language,
+            "audio_url": audio_url,
+            "attached": attached
+        }
+
+    async def _solve_cached(self, db, homework: Dict, output_language: str) -> Tuple[Dict, Optional[str]]:
+        """
+        Look the question up in the solution cache before calling the LLM
+
+        Returns:
+            Tuple of (solution data, key of the cache entry the solution belongs to)
+        """
+        question = homework["extracted_text"]
+
+        if not settings.SOLUTION_CACHE_ENABLED:
+            solution_data = await self.ai_solver.generate_solution(
+                question=question,
+                subject=homework["subject"],
+                output_language=output_language,
+                grade_level=5
+            )
+            return solution_data, None
+
+        cached, key, embedding = await self.lookup_cached_solution(db, question, output_language)
+        if cached:
+            return cached, cached["key"]
+
+        # Generate solution using AI
+        solution_data = await self.ai_solver.generate_solution(
+            question=question,
+            subject=homework["subject"],
+            output_language=output_language,
+            grade_level=5
+        )
+
+        await solution_cache.store(
+            db, key, question, homework["subject"], output_language, solution_data, embedding
+        )
+        return solution_data, key
+
+    async def lookup_cached_solution(
+        self,
+        db,
+        question: str,
+        output_language: str
+    ) -> Tuple[Optional[Dict], str, Optional[List[float]]]:
+        """
+        Solution cache lookup without generating on a miss
+
+        The question is only embedded when the exact key misses, so repeated
+        questions never pay for an embedding call.
+
+        Returns:
+            Tuple of (cache entry or None, question key, question embedding or None);
+            the key and embedding are what solution_cache.store expects on a miss
+        """
+        key = solution_cache.question_key(question, output_language)
+        cached = await solution_cache.lookup_exact(db, key)
+        if cached:
+            return cached, key, None
+
+        embedding = await self._embed_question(question)
+        cached = await solution_cache.lookup_similar(db, question, output_language, embedding)
+        return cached, key, embedding
+
+    async def _embed_question(self, question: str) -> Optional[List[float]]:
+        """Embedding for the similarity tier; the exact-match tier still works if this fails"""
+        if not settings.SOLUTION_CACHE_EMBEDDINGS:
+            return None
+        try:
+            return await llm_client.embedding(
+                solution_cache.normalize_question(question),
+                settings.SOLUTION_CACHE_EMBEDDING_MODEL
+            )
+        except Exception as e:
+            logger.warning(f"Question embedding failed, using exact cache lookup only: {str(e)}")
+            return None
+
     async def regenerate_audio(
         self,
         solution_id: str,
-        language: str
+        language: str,
+        tts_engine: Optional[str] = None
     ) -> str:
         """
         Regenerate audio for existing solution in different language
@@ -81,29 +556,40 @@ class SolutionAgent:
         Args:
             solution_id: Solution document ID
             language: New language for audio
+            tts_engine: TTS engine (if None, uses TTS_ENGINE)
 
         Returns:
             New audio URL
         """
-        # Get solution from database
         db = get_database()
-        try:
-            object_id = ObjectId(solution_id)
-        except Exception:
-            raise ValueError("Invalid solution ID format")
-
-        solution = await db.solutions.find_one({"_id": object_id})
-
-        if not solution:
-            raise ValueError("Solution not found")
+        solution = await self._get_solution(solution_id)
 
         # Generate new audio
-        audio_url = self.tts.generate_audio(solution, language)
+        audio_url = await self._generate_audio(solution, language, tts_engine)
 
         # Update solution in database (only update audio_url, not output_language)
         await db.solutions.update_one(
-            {"_id": object_id},
+            {"_id": solution["_id"]},
             {"$set": {"audio_url": audio_url}}
         )
 
+        # The previous audio stays cached for when this language is requested again
+        if solution.get("audio_url") != audio_url:
+            await audio_cache.add_ref(db, audio_url, solution_id)
+            await audio_cache.release(db, solution.get("audio_url"), solution_id)
+
         return audio_url
+
+    async def _get_solution(self, solution_id: str) -> Dict:
+        """Fetch a solution, raising ValueError if the ID is invalid or unknown"""
+        try:
+            object_id = ObjectId(solution_id)
+        except Exception:
+            raise ValueError("Invalid solution ID format")
+
+        solution = await get_database().solutions.find_one({"_id": object_id})
+
+        if not solution:
+            raise ValueError("Solution not found")
+
+        return solution
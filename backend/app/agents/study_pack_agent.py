@@ -0,0 +1,158 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+from app.agents.solution_agent import SolutionAgent
+from app.tools.ai_study_pack import AIStudyPackGenerator
+from app.tools.ai_practice_gen import AIPracticeGenerator
+from app.tools.ai_flashcard_gen import AIFlashcardGenerator
+from app.operations.solution_cache import solution_cache
+from app.schemas.solution import SolutionDB
+from app.schemas.practice import PracticeTestDB
+from app.schemas.flashcard import FlashcardSetDB
+from app.database.mongodb import get_database
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+class StudyPackAgent:
+    """Main agent for combined solution + practice test + flashcard generation"""
+
+    def __init__(self):
+        self.solution_agent = SolutionAgent()
+        self.study_pack_generator = AIStudyPackGenerator()
+        self.practice_generator = AIPracticeGenerator()
+        self.flashcard_generator = AIFlashcardGenerator()
+
+    async def create_study_pack(
+        self,
+        homework_id: str,
+        question_count: int,
+        difficulty: str,
+        output_language: str,
+        generate_audio: bool = False,
+        audio_language: Optional[str] = None,
+        tts_engine: Optional[str] = None
+    ) -> Dict:
+        """
+        Generate a solution, practice test and flashcard set for homework and save all three
+
+        On a solution cache miss everything comes from one combined LLM call.
+        On a hit only the practice questions and flashcards are generated, as
+        two concurrent calls.
+
+        Args:
+            homework_id: Homework document ID
+            question_count: Number of practice questions
+            difficulty: Practice question difficulty
+            output_language: Language for all content
+            generate_audio: Whether to generate solution audio
+            audio_language: Language for audio (if None, uses output_language)
+            tts_engine: TTS engine for the audio (if None, uses TTS_ENGINE)
+
+        Returns:
+            Dict with solution, practice_test and flashcard_set (as returned by
+            the individual generate endpoints)
+        """
+        db = get_database()
+        homework = await self.solution_agent.get_homework(homework_id)
+        question = homework["extracted_text"]
+        subject = homework["subject"]
+
+        cached, cache_key, embedding = None, None, None
+        if settings.SOLUTION_CACHE_ENABLED:
+            cached, cache_key, embedding = await self.solution_agent.lookup_cached_solution(
+                db, question, output_language
+            )
+
+        if cached:
+            solution_data = cached
+            cache_key = cached["key"]
+            practice_questions, flashcards = await asyncio.gather(
+                self.practice_generator.generate_practice_questions(
+                    topic=self._topic(question, cached["concepts_covered"]),
+                    subject=subject,
+                    question_count=question_count,
+                    difficulty=difficulty,
+                    output_language=output_language
+                ),
+                self.flashcard_generator.generate_flashcards(
+                    question=question,
+                    solution_data=cached,
+                    subject=subject,
+                    output_language=output_language
+                )
+            )
+        else:
+            pack = await self.study_pack_generator.generate_study_pack(
+                question=question,
+                subject=subject,
+                output_language=output_language,
+                question_count=question_count,
+                difficulty=difficulty
+            )
+            solution_data = pack
+            practice_questions = pack["practice_questions"]
+            flashcards = pack["flashcards"]
+
+            if cache_key:
+                await solution_cache.store(db, cache_key, question, subject, output_language, pack, embedding)
+
+        audio_url = None
+        if generate_audio:
+            audio_url = await self.solution_agent._generate_audio(
+                solution_data, audio_language or output_language, tts_engine
+            )
+
+        solution_db = SolutionDB(
+            homework_id=homework_id,
+            question=question,
+            subject=subject,
+            solution_steps=solution_data["solution_steps"],
+            final_answer=solution_data["final_answer"],
+            concepts_covered=solution_data["concepts_covered"],
+            audio_url=audio_url,
+            output_language=output_language,
+            cache_key=cache_key
+        )
+        test_db = PracticeTestDB(
+            homework_id=homework_id,
+            topic=self._topic(question, solution_data["concepts_covered"]),
+            subject=subject,
+            output_language=output_language,
+            questions=practice_questions
+        )
+        flashcard_db = FlashcardSetDB(
+            homework_id=homework_id,
+            title=f"Flashcards: {question[:50]}...",
+            subject=subject,
+            output_language=output_language,
+            cards=flashcards,
+            total_cards=len(flashcards)
+        )
+
+        # Write all three collections in one pass
+        solution_id, test_result, flashcard_result = await asyncio.gather(
+            self.solution_agent.save_solution(solution_db),
+            db.practice_tests.insert_one(test_db.dict(by_alias=True, exclude={"id"})),
+            db.flashcard_sets.insert_one(flashcard_db.dict(by_alias=True, exclude={"id"}))
+        )
+
+        return {
+            "solution": {
+                "solution_id": solution_id,
+                **solution_db.dict(exclude={"id"})
+            },
+            "practice_test": {
+                "test_id": str(test_result.inserted_id),
+                **test_db.dict(exclude={"id"})
+            },
+            "flashcard_set": {
+                "set_id": str(flashcard_result.inserted_id),
+                **flashcard_db.dict(exclude={"id"})
+            }
+        }
+
+    @staticmethod
+    def _topic(question: str, concepts) -> str:
+        """Practice test topic, derived the same way as PracticeAgent"""
+        return ", ".join(concepts) if concepts else question[:100]
@@ -1,7 +1,10 @@
-from typing import List, Dict
+import asyncio
+from typing import AsyncIterator, List, Dict
 from app.database.mongodb import get_database
 from app.operations.delete_ops import DeleteOperations
 from app.agents.solution_agent import SolutionAgent
+from app.schemas.solution import SolutionDB
+from app.config import settings
 from bson import ObjectId
 
 class UtilityAgent:
@@ -41,79 +44,135 @@ class UtilityAgent:
         }
 
     async def batch_generate_content(self, homework_ids: List[str]) -> Dict:
+        """Generate solutions for many homework items and return all results in request order"""
+        results = {}
+        async for result in self.stream_batch_generate(homework_ids):
+            results[result["homework_id"]] = result
+
+        ordered = [results[homework_id] for homework_id in dict.fromkeys(homework_ids)]
+        return {
+            "results": ordered,
+            "total_processed": len(ordered),
+            "successful": sum(1 for r in ordered if r["status"] == "success"),
+            "failed": sum(1 for r in ordered if r["status"] == "failed"),
+            "skipped": sum(1 for r in ordered if r["status"] == "skipped")
+        }
+
+    async def stream_batch_generate(self, homework_ids: List[str]) -> AsyncIterator[Dict]:
+        """
+        Generate solutions for many homework items concurrently
+
+        Homework documents and existing solutions are looked up with one `$in`
+        query each; generation runs at most BATCH_CONCURRENCY items at a time,
+        each bounded by BATCH_ITEM_TIMEOUT_SECONDS.
+
+        Args:
+            homework_ids: Homework IDs (duplicates are processed once)
+
+        Yields:
+            One result dict per homework ID, in completion order
+        """
         db = get_database()
-        results = []
-        successful = 0
-        failed = 0
-        skipped = 0
+        homework_ids = list(dict.fromkeys(homework_ids))
 
+        object_ids = {}
         for homework_id in homework_ids:
             try:
                 # Convert string ID to ObjectId
-                obj_id = ObjectId(homework_id)
+                object_ids[homework_id] = ObjectId(homework_id)
             except Exception:
-                results.append({
+                yield {
                     "homework_id": homework_id,
                     "status": "failed",
                     "message": "Invalid homework ID format",
                     "solution_id": None,
                     "error": "Cannot convert to ObjectId"
-                })
-                failed += 1
-                continue
+                }
+
+        # Fetch all homework and existing solutions up front
+        homework_docs = await db.homework_submissions.find(
+            {"_id": {"$in": list(object_ids.values())}}
+        ).to_list(length=None)
+        homework_by_id = {str(doc["_id"]): doc for doc in homework_docs}
+
+        existing_solutions = await db.solutions.find(
+            {"homework_id": {"$in": list(homework_by_id.keys())}},
+            {"homework_id": 1}
+        ).to_list(length=None)
+        solution_by_homework = {s["homework_id"]: str(s["_id"]) for s in existing_solutions}
 
-            # Fetch homework
-            homework = await db.homework_submissions.find_one({"_id": obj_id})
+        pending = []
+        for homework_id, obj_id in object_ids.items():
+            homework = homework_by_id.get(str(obj_id))
             if not homework:
-                results.append({
+                yield {
                     "homework_id": homework_id,
                     "status": "failed",
                     "message": "Homework not found",
                     "solution_id": None,
                     "error": "Homework ID does not exist"
-                })
-                failed += 1
-                continue
-
-            # Check if solution already exists
-            existing_solution = await db.solutions.find_one({"homework_id": str(obj_id)})
-            if existing_solution:
-                results.append({
+                }
+            elif str(obj_id) in solution_by_homework:
+                yield {
                     "homework_id": homework_id,
                     "status": "skipped",
                     "message": "Solution already exists",
-                    "solution_id": str(existing_solution["_id"])
-                })
-                skipped += 1
-                continue
-
-            # Generate solution
-            solution_data = await self.solution_agent.generate_solution(
-                homework_id=homework_id,
-                generate_audio=False,
-                output_language=homework.get("output_language", "en")
-            )
-
-            from app.schemas.solution import SolutionDB
-            solution_db = SolutionDB(
-                homework_id=str(obj_id),  # store ObjectId
-                **solution_data
-            )
-            solution_dict = solution_db.dict(by_alias=True, exclude={"id"})
-            insert_result = await db.solutions.insert_one(solution_dict)
-
-            results.append({
-                "homework_id": homework_id,
-                "status": "success",
-                "message": "Solution generated successfully",
-                "solution_id": str(insert_result.inserted_id)
-            })
-            successful += 1
+                    "solution_id": solution_by_homework[str(obj_id)]
+                }
+            else:
+                pending.append((homework_id, homework))
+
+        semaphore = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+        tasks = [
+            asyncio.create_task(self._generate_batch_item(semaphore, homework_id, homework))
+            for homework_id, homework in pending
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # Client went away mid-stream: stop generating
+            for task in tasks:
+                task.cancel()
+
+    async def _generate_batch_item(self, semaphore: asyncio.Semaphore, homework_id: str, homework: Dict) -> Dict:
+        async with semaphore:
+            try:
+                solution_data = await asyncio.wait_for(
+                    self.solution_agent.generate_solution_for_homework(
+                        homework=homework,
+                        generate_audio=False,
+                        output_language=homework.get("output_language", "en")
+                    ),
+                    timeout=settings.BATCH_ITEM_TIMEOUT_SECONDS
+                )
+
+                solution_db = SolutionDB(
+                    homework_id=str(homework["_id"]),
+                    **solution_data
+                )
+                solution_id = await self.solution_agent.save_solution(solution_db)
+
+            except asyncio.TimeoutError:
+                return {
+                    "homework_id": homework_id,
+                    "status": "failed",
+                    "message": "Solution generation timed out",
+                    "solution_id": None,
+                    "error": f"No result within {settings.BATCH_ITEM_TIMEOUT_SECONDS} seconds"
+                }
+            except Exception as e:
+                return {
+                    "homework_id": homework_id,
+                    "status": "failed",
+                    "message": "Solution generation failed",
+                    "solution_id": None,
+                    "error": str(e)
+                }
 
         return {
-            "results": results,
-            "total_processed": len(homework_ids),
-            "successful": successful,
-            "failed": failed,
-            "skipped": skipped
+            "homework_id": homework_id,
+            "status": "success",
+            "message": "Solution generated successfully",
+            "solution_id": solution_id
         }
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import List, Literal, Optional
 
 class Settings(BaseSettings):
     # MongoDB
@@ -7,12 +8,139 @@ class Settings(BaseSettings):
     DATABASE_NAME: str
 
     # OpenAI
-    OPENAI_API_KEY: str
+    OPENAI_API_KEY: Optional[str] = None  # only required with LLM_BACKEND=openai
     OPENAI_MODEL: str = "gpt-4o-mini"
+    OPENAI_STRUCTURED_OUTPUTS: bool = True  # strict json_schema replies; False falls back to json_object
+
+    # LLM backend: "openai", or "stub" for deterministic offline replies (load tests, local development)
+    LLM_BACKEND: Literal["openai", "stub"] = "openai"
+    LLM_STUB_SEED: int = 0
+    LLM_STUB_LATENCY_MS: float = 800.0
+    LLM_STUB_LATENCY_JITTER_MS: float = 200.0
+    LLM_STUB_FAILURE_RATE: float = 0.0
+    LLM_STUB_FAILURE_STATUS: int = 503
+    LLM_STUB_LIST_LENGTH: int = 5
+
+    # Shared OpenAI HTTP client
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    OPENAI_MAX_CONCURRENT_REQUESTS: int = 32
+    OPENAI_TIMEOUT_SECONDS: float = 60.0
+    OPENAI_MAX_RETRIES: int = 2
 
     # Storage
     STORAGE_PATH: str = "./storage"
 
+    # OCR worker pool
+    OCR_POOL_WORKERS: int = 2
+    OCR_POOL_MAX_QUEUE: int = 16
+    OCR_JOB_TIMEOUT_SECONDS: float = 120.0
+    OCR_PRELOAD_MODELS: bool = False
+
+    # Tesseract multi-PSM
+    TESSERACT_PSM_WORKERS: int = 3  # fallback modes run together when PSM 6 is below the early-exit confidence
+    TESSERACT_EARLY_EXIT_CONFIDENCE: float = 85.0
+    TESSERACT_TIMEOUT_SECONDS: float = 30.0
+
+    # OCR input normalisation
+    OCR_NORMALIZE_RESOLUTION: bool = True
+    OCR_TARGET_TEXT_HEIGHT_PX: int = 32
+    OCR_MAX_WORKING_PIXELS: int = 4_000_000
+    OCR_MIN_WORKING_LONG_SIDE: int = 1000
+
+    # OCR result cache
+    OCR_CACHE_ENABLED: bool = True
+    OCR_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    OCR_CACHE_MAX_ENTRIES: int = 10000
+    OCR_CACHE_NEAR_DUPLICATES: bool = False  # perceptual-hash tier; candidates are verified by ink mask
+    OCR_CACHE_PHASH_MAX_DISTANCE: int = 2
+    OCR_CACHE_VERIFY_MAX_PIXELS: int = 4  # mismatched ink pixels allowed per 32x32 tile
+
+    # Adaptive OCR engine routing
+    OCR_ROUTING_ENABLED: bool = True
+    OCR_ROUTING_MIN_SAMPLES: int = 20
+    OCR_ROUTING_EXPLORATION: float = 0.05
+
+    # EasyOCR micro-batching across concurrent uploads
+    EASYOCR_BATCH_SIZE: int = 8
+
+    # Solution cache
+    SOLUTION_CACHE_ENABLED: bool = True
+    SOLUTION_CACHE_TTL_SECONDS: int = 14 * 24 * 3600
+    SOLUTION_CACHE_TRUSTED_TTL_SECONDS: int = 180 * 24 * 3600
+    SOLUTION_CACHE_MIN_RATING: float = 2.5
+    SOLUTION_CACHE_TRUSTED_RATING: float = 4.0
+    SOLUTION_CACHE_EMBEDDINGS: bool = False
+    SOLUTION_CACHE_EMBEDDING_MODEL: str = "text-embedding-3-small"
+    SOLUTION_CACHE_SIMILARITY_THRESHOLD: float = 0.95
+
+    # Batch solution generation
+    BATCH_MAX_ITEMS: int = 500
+    BATCH_CONCURRENCY: int = 8
+    BATCH_ITEM_TIMEOUT_SECONDS: float = 90.0
+
+    # Worksheet (multi-page / multi-region) uploads
+    WORKSHEET_PDF_DPI: int = 200
+    WORKSHEET_MAX_PAGES: int = 50
+    WORKSHEET_MAX_REGIONS_PER_PAGE: int = 40
+    WORKSHEET_MIN_REGION_HEIGHT: int = 12
+    WORKSHEET_REGION_GAP_FACTOR: float = 2.5
+    WORKSHEET_REGION_LINE_GAP_FACTOR: float = 1.2
+    WORKSHEET_OCR_CONCURRENCY: int = 8
+
+    # LLM call resilience (OPENAI_MAX_RETRIES is the retry count)
+    LLM_RETRY_BASE_SECONDS: float = 0.5
+    LLM_RETRY_MAX_SECONDS: float = 8.0
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 2.0
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+
+    # Token budgeting (max_tokens sizing and per-minute limits; 0 disables a limit)
+    OPENAI_MAX_OUTPUT_TOKENS: int = 8192
+    OPENAI_INPUT_COST_PER_MILLION: float = 0.15
+    OPENAI_OUTPUT_COST_PER_MILLION: float = 0.60
+    TOKEN_BUDGET_TOKENS_PER_MINUTE: int = 200000
+    TOKEN_BUDGET_REQUESTS_PER_MINUTE: int = 500
+    TOKEN_BUDGET_MIN_OUTPUT_TOKENS: int = 256
+    TOKEN_BUDGET_HEADROOM: float = 1.25
+    TOKEN_BUDGET_MIN_SAMPLES: int = 20
+    TOKEN_BUDGET_HISTORY: int = 200
+    TOKEN_USAGE_RETENTION_SECONDS: int = 30 * 24 * 3600
+
+    # Background job queue
+    JOB_WORKERS: int = 4
+    JOB_LEASE_SECONDS: int = 120
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_SECONDS: float = 5.0
+    JOB_RETENTION_SECONDS: int = 7 * 24 * 3600
+
+    # Text-to-speech (narration is synthesised per solution step, TTS_WORKERS chunks at a time)
+    TTS_WORKERS: int = 4
+    TTS_ENGINE: Literal["gtts", "openai", "espeak"] = "gtts"  # default; requests can pick another
+    TTS_PRELOAD_ENGINES: List[str] = []  # pooled engines warmed at startup besides TTS_ENGINE
+    TTS_ESPEAK_WORKERS: int = 2
+    TTS_ESPEAK_RATE: int = 150  # words per minute
+    TTS_ESPEAK_BITRATE: str = "64k"
+
+    # Audio cache (content-addressed TTS output; 0 disables the disk quota)
+    AUDIO_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    AUDIO_CACHE_EVICT_TO_RATIO: float = 0.9
+    AUDIO_X_ACCEL_PREFIX: Optional[str] = None  # nginx internal location for STORAGE_PATH/audio, e.g. /_audio
+
+    # Audio pregeneration (queued after a solution is saved when auto_generate_audio is on)
+    AUDIO_PREGEN_ENABLED: bool = True
+    AUDIO_PREGEN_PRIORITY: int = -10  # below interactive jobs (priority 0)
+    AUDIO_PREGEN_DEFER_SECONDS: float = 15.0  # wait before re-checking while the API is busy
+    AUDIO_PREGEN_BUSY_RATIO: float = 0.75  # share of OPENAI_MAX_CONCURRENT_REQUESTS in flight that counts as busy
+
+    # Event loop lag monitor
+    LOOP_LAG_INTERVAL_MS: float = 100.0
+    LOOP_LAG_WINDOW: int = 600
+
     class Config:
         env_file = ".env"
 
@@ -1,13 +1,24 @@
 from fastapi import FastAPI, Request, status
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from pathlib import Path
 import traceback
 import logging
-from app.database.mongodb import connect_to_mongo, close_mongo_connection
-from app.routers import homework, solution, practice, flashcard, dashboard, utility, feedback, search, settings_route
+from app.database.mongodb import connect_to_mongo, close_mongo_connection, get_database
+from app.operations.ocr_pool import ocr_pool
+from app.operations.ocr_cache import ocr_cache
+from app.operations.ocr_router import ocr_route_stats
+from app.operations.solution_cache import solution_cache
+from app.operations.audio_cache import audio_cache
+from app.operations.job_queue import job_queue
+from app.operations.loop_monitor import loop_monitor
+from app.agents.job_agent import JobAgent
+from app.tools.llm_client import llm_client
+from app.tools.llm_resilience import LLMUnavailableError
+from app.tools.tts_engines import start_tts_engines, shutdown_tts_engines
+from app.tools.token_budget import token_budget
+from app.routers import homework, solution, practice, flashcard, dashboard, utility, feedback, search, settings_route, metrics, jobs, study_pack
 from app.config import settings
 
 # Configure detailed logging
@@ -66,6 +77,22 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
+@app.exception_handler(LLMUnavailableError)
+async def llm_unavailable_handler(request: Request, exc: LLMUnavailableError):
+    """Circuit breaker open: tell the client to come back instead of returning a 500"""
+
+    logger.warning(f"LLM unavailable on {request.method} {request.url}: {str(exc)}")
+
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "detail": str(exc),
+            "path": str(request.url),
+            "method": request.method
+        },
+        headers={"Retry-After": str(int(settings.LLM_BREAKER_RESET_SECONDS))}
+    )
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors with detailed information"""
@@ -93,30 +120,104 @@ async def startup_db_client():
 async def shutdown_db_client():
     await close_mongo_connection()'''
 
-# Mount static files for audio
+# Audio directory (served by GET /api/solution/audio/{audio_filename})
 audio_path = Path(settings.STORAGE_PATH) / "audio"
 audio_path.mkdir(parents=True, exist_ok=True)
-app.mount("/audio", StaticFiles(directory=str(audio_path)), name="audio")
 
 # Include all routers at module level
 app.include_router(homework.router)
 app.include_router(solution.router)
 app.include_router(practice.router)
 app.include_router(flashcard.router)
+app.include_router(study_pack.router)
 app.include_router(feedback.router)
 app.include_router(search.router)
 app.include_router(settings_route.router)
 app.include_router(dashboard.router)
 app.include_router(utility.router)
+app.include_router(metrics.router)
+app.include_router(jobs.router)
+
+# Older audio URLs pointed at a StaticFiles mount on /audio; serve them through the same handler
+app.add_api_route("/audio/{audio_filename}", solution.stream_audio, methods=["GET", "HEAD"], include_in_schema=False)
 
 @app.on_event("startup")
 async def startup_db_client():
     await connect_to_mongo()
 
+@app.on_event("startup")
+async def startup_ocr_pool():
+    await ocr_pool.start()
+
+@app.on_event("startup")
+async def startup_ocr_cache():
+    await ocr_cache.ensure_indexes(get_database())
+
+@app.on_event("startup")
+async def startup_ocr_routing():
+    await ocr_route_stats.load(get_database())
+
+@app.on_event("startup")
+async def startup_solution_cache():
+    await solution_cache.ensure_indexes(get_database())
+    await solution_cache.load_index(get_database())
+
+@app.on_event("startup")
+async def startup_audio_cache():
+    await audio_cache.ensure_indexes(get_database())
+
+@app.on_event("startup")
+async def startup_token_budget():
+    await token_budget.ensure_indexes(get_database())
+    await token_budget.load_history(get_database())
+
+@app.on_event("startup")
+async def startup_worksheet_index():
+    await get_database().homework_submissions.create_index("parent_id", sparse=True)
+
+@app.on_event("startup")
+async def startup_job_queue():
+    JobAgent().register_handlers()
+    await job_queue.ensure_indexes(get_database())
+    job_queue.start()
+
+@app.on_event("startup")
+async def startup_loop_monitor():
+    loop_monitor.start()
+
+@app.on_event("startup")
+async def startup_tts_engines():
+    await start_tts_engines()
+
+@app.on_event("startup")
+async def startup_llm_backend():
+    if settings.LLM_BACKEND == "openai" and not settings.OPENAI_API_KEY:
+        logger.warning("OPENAI_API_KEY is not set: AI generation will fail (set LLM_BACKEND=stub to run offline)")
+
+@app.on_event("shutdown")
+async def shutdown_job_queue():
+    await job_queue.stop()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     await close_mongo_connection()
 
+@app.on_event("shutdown")
+async def shutdown_ocr_pool():
+    ocr_pool.shutdown()
+
+@app.on_event("shutdown")
+async def shutdown_llm_client():
+    await llm_client.close()
+
+@app.on_event("shutdown")
+async def shutdown_tts_pool():
+    shutdown_tts_engines()
+
+@app.on_event("shutdown")
+async def shutdown_loop_monitor():
+    await loop_monitor.stop()
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -128,9 +229,14 @@ async def root():
             "phase1": [
                 "POST /api/homework/upload",
                 "GET /api/homework/{homework_id}",
+                "POST /api/homework/upload-worksheet",
+                "GET /api/homework/worksheet/{parent_id}",
                 "POST /api/solution/generate",
+                "POST /api/solution/generate/stream",
                 "GET /api/solution/{solution_id}",
                 "GET /api/solution/audio/{audio_filename}",
+                "GET /api/solution/{solution_id}/audio/playlist",
+                "GET /api/solution/{solution_id}/audio/stream",
                 "POST /api/solution/{solution_id}/regenerate-audio"
             ],
             "phase2": [
@@ -145,6 +251,7 @@ async def root():
                 "POST /api/flashcards/{set_id}/review",
                 "GET /api/flashcards/{set_id}/progress",
                 "DELETE /api/flashcards/{set_id}",
+                "POST /api/study-pack/generate",
                 "GET /api/dashboard/stats",
                 "GET /api/dashboard/recent-homework",
                 "GET /api/dashboard/subjects"
@@ -152,7 +259,20 @@ async def root():
             "phase4": [
                 "DELETE /api/utility/homework/{homework_id}",
                 "DELETE /api/utility/flashcards/{set_id}",
-                "POST /api/utility/batch/generate-solutions"
+                "POST /api/utility/batch/generate-solutions",
+                "POST /api/utility/batch/generate-solutions/stream"
+            ],
+            "metrics": [
+                "GET /api/metrics/ocr",
+                "GET /api/metrics/llm",
+                "GET /api/metrics/llm/usage",
+                "GET /api/metrics/jobs",
+                "GET /api/metrics/event-loop",
+                "GET /api/metrics/audio"
+            ],
+            "jobs": [
+                "GET /api/jobs/{job_id}",
+                "GET /api/jobs/{job_id}/result"
             ]
         }
     }
@@ -0,0 +1,367 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional
+from bson import ObjectId
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Cached audio is named <sha256>.mp3; older uuid-named files are left alone
+AUDIO_KEY_PATTERN = re.compile(r"^([0-9a-f]{64})\.mp3$")
+
+# MPEG audio Layer III header tables: bitrate (kbit/s) by index, sample rate (Hz) by index
+MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+}
+MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+def mp3_frames(data: bytes) -> bytes:
+    """
+    The audio frames of an MP3 file, without its tags and VBR header frame
+
+    Drops a leading ID3v2 tag, a trailing ID3v1 tag and a first frame that
+    carries a Xing/Info or VBRI header. Those describe one file only: in the
+    middle of a joined stream a player would play the tag as noise or take
+    the header's frame count as the length of the whole stream.
+    """
+    start, end = 0, len(data)
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        start = 10 + size + (10 if data[5] & 0x10 else 0)
+    if end - start >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+
+    # First frame header (11 sync bits)
+    while start + 4 <= end and not (data[start] == 0xFF and data[start + 1] & 0xE0 == 0xE0):
+        start += 1
+    if start + 4 > end:
+        return data[start:end]
+
+    header = data[start:start + 4]
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x03
+    if layer != 1 or version == 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        # Not a Layer III frame we can size; leave the stream as it is
+        return data[start:end]
+
+    mono = header[3] >> 6 == 3
+    side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+    xing = data[start + 4 + side_info:start + 8 + side_info]
+    vbri = data[start + 36:start + 40]
+    if xing in (b"Xing", b"Info") or vbri == b"VBRI":
+        bitrate = MP3_BITRATES[1 if version == 3 else 2][bitrate_index] * 1000
+        sample_rate = MP3_SAMPLE_RATES[version][sample_rate_index]
+        padding = (header[2] >> 1) & 0x01
+        start += (144 if version == 3 else 72) * bitrate // sample_rate + padding
+    return data[start:end]
+
+
+class AudioCache:
+    """
+    Content-addressed store for synthesised narration in STORAGE_PATH/audio
+
+    Files are named by a hash of (narration, language, engine, voice), so a
+    narration is synthesised once and every later request for it, from any
+    solution, is a file lookup. The `audio_files` collection tracks each
+    file's size, hits, last use and the solutions referencing it (refs).
+
+    - Concurrent requests for the same narration share one synthesis
+    - concatenate() joins per-step chunk files into one file, cached the same
+      way and recording its parts
+    - Files being synthesised, and keys pinned with pinned() (chunks waiting
+      to be joined), are never evicted or removed
+    - Solutions add a reference when they store an audio URL and drop it when
+      the audio is replaced. Replaced audio stays cached (switching back to a
+      language is a lookup); audio left unreferenced by a homework delete is
+      removed with it.
+    - Past AUDIO_CACHE_MAX_BYTES, files are evicted least recently used
+      first, unreferenced ones before referenced ones, down to
+      AUDIO_CACHE_EVICT_TO_RATIO of the quota. Solutions whose audio is
+      evicted lose their audio_url and can regenerate it.
+    """
+
+    def __init__(self):
+        self.audio_dir = Path(settings.STORAGE_PATH) / "audio"
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._pinned: Dict[str, int] = {}
+        self._eviction: Optional[asyncio.Lock] = None
+        self._counters = {"hits": 0, "misses": 0, "shared": 0, "evictions": 0, "evicted_bytes": 0}
+
+    @staticmethod
+    def key(narration: str, language: str, engine: str, voice: str) -> str:
+        return hashlib.sha256(f"{engine}\n{voice}\n{language}\n{narration}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def key_from_url(audio_url: Optional[str]) -> Optional[str]:
+        """Cache key of an audio URL, or None for audio not stored by the cache"""
+        if not audio_url:
+            return None
+        match = AUDIO_KEY_PATTERN.match(audio_url.rsplit("/", 1)[-1])
+        return match.group(1) if match else None
+
+    @property
+    def in_flight(self) -> int:
+        """Syntheses currently running"""
+        return len(self._inflight)
+
+    @contextmanager
+    def pinned(self, keys: List[str]) -> Iterator[None]:
+        """
+        Keep files from being evicted or removed while the block runs
+
+        Keys don't need to exist yet, so callers can pin the chunks of a
+        narration before synthesising them and unpin once they are joined.
+        """
+        for key in keys:
+            self._pinned[key] = self._pinned.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            for key in keys:
+                self._pinned[key] -= 1
+                if not self._pinned[key]:
+                    del self._pinned[key]
+
+    def _in_use(self, key: str) -> bool:
+        return key in self._inflight or key in self._pinned
+
+    def read_frames(self, filename: str) -> bytes:
+        """A cached file's MP3 frames, ready to be joined with others (see mp3_frames)"""
+        return mp3_frames((self.audio_dir / filename).read_bytes())
+
+    async def ensure_indexes(self, db) -> None:
+        await db.audio_files.create_index("last_used_at")
+        await db.audio_files.create_index("refs")
+
+    async def get_or_create(
+        self,
+        db,
+        narration: str,
+        language: str,
+        engine: str,
+        voice: str,
+        synthesize: Callable[[Path], Awaitable[None]]
+    ) -> str:
+        """
+        Audio file for a narration, synthesising it only on a miss
+
+        Args:
+            db: Database instance
+            narration: Text to speak
+            language: Language code (en/ta/hi)
+            engine: TTS engine name (part of the key)
+            voice: Engine voice (part of the key)
+            synthesize: Writes the audio to the given path
+
+        Returns:
+            Audio filename in STORAGE_PATH/audio
+        """
+        key = self.key(narration, language, engine, voice)
+        filename = f"{key}.mp3"
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._counters["shared"] += 1
+            return await asyncio.shield(task)
+
+        if (self.audio_dir / filename).exists():
+            self._counters["hits"] += 1
+            await self._touch(db, key, language, engine, voice)
+            return filename
+
+        self._counters["misses"] += 1
+        task = asyncio.create_task(self._create(db, key, language, engine, voice, synthesize))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded: a cancelled request doesn't abort a synthesis others may be waiting on
+        return await asyncio.shield(task)
+
+    async def concatenate(self, db, filenames: List[str], language: str) -> str:
+        """
+        One file joining cached chunk files in order, itself cached
+
+        MP3 frame streams concatenate cleanly once each part's tags and VBR
+        header frame are stripped, so no re-encoding is needed. The parts are
+        pinned until the join is written; callers that synthesise them should
+        pin them from the start (see pinned).
+
+        Returns:
+            Audio filename in STORAGE_PATH/audio
+        """
+        parts = [self.key_from_url(name) for name in filenames]
+
+        def join(audio_path: Path) -> None:
+            with open(audio_path, "wb") as output:
+                for filename in filenames:
+                    output.write(self.read_frames(filename))
+
+        with self.pinned(parts):
+            filename = await self.get_or_create(
+                db, "\n".join(filenames), language, "concat", "", lambda audio_path: asyncio.to_thread(join, audio_path)
+            )
+        # Parts are removed with the joined file when a homework delete orphans it
+        await db.audio_files.update_one(
+            {"_id": self.key_from_url(filename)},
+            {"$set": {"parts": parts}}
+        )
+        return filename
+
+    async def _create(self, db, key: str, language: str, engine: str, voice: str, synthesize) -> str:
+        self.audio_dir.mkdir(parents=True, exist_ok=True)
+        filename = f"{key}.mp3"
+        temp_path = self.audio_dir / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            await synthesize(temp_path)
+            # Readers never see a partly written file
+            os.replace(temp_path, self.audio_dir / filename)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+        await self._touch(db, key, language, engine, voice)
+        await self.enforce_quota(db)
+        return filename
+
+    async def _touch(self, db, key: str, language: str, engine: str, voice: str) -> None:
+        path = self.audio_dir / f"{key}.mp3"
+        try:
+            await db.audio_files.update_one(
+                {"_id": key},
+                {
+                    "$set": {"last_used_at": datetime.utcnow(), "size_bytes": path.stat().st_size},
+                    "$inc": {"hits": 1},
+                    "$setOnInsert": {
+                        "filename": path.name,
+                        "language": language,
+                        "engine": engine,
+                        "voice": voice,
+                        "refs": [],
+                        "created_at": datetime.utcnow()
+                    }
+                },
+                upsert=True
+            )
+        except Exception as e:
+            # Bookkeeping must never fail audio generation
+            logger.warning(f"Could not record audio file {key[:12]}: {str(e)}")
+
+    async def add_ref(self, db, audio_url: Optional[str], solution_id: str) -> None:
+        """Record that a solution uses this audio"""
+        key = self.key_from_url(audio_url)
+        if key:
+            await db.audio_files.update_one({"_id": key}, {"$addToSet": {"refs": solution_id}})
+
+    async def release(self, db, audio_url: Optional[str], solution_id: str) -> None:
+        """A solution no longer uses this audio; the file stays cached"""
+        key = self.key_from_url(audio_url)
+        if key:
+            await db.audio_files.update_one({"_id": key}, {"$pull": {"refs": solution_id}})
+
+    async def release_solutions(self, db, solution_ids: List[str]) -> int:
+        """
+        Drop deleted solutions' references and remove audio nothing uses any more
+
+        Returns:
+            Number of audio files deleted
+        """
+        if not solution_ids:
+            return 0
+        keys = [entry["_id"] async for entry in db.audio_files.find({"refs": {"$in": solution_ids}}, {"_id": 1})]
+        if not keys:
+            return 0
+        await db.audio_files.update_many({"_id": {"$in": keys}}, {"$pull": {"refs": {"$in": solution_ids}}})
+
+        # Files in use right now are kept; as unreferenced entries they are evicted first later
+        removed = [
+            entry
+            for entry in await db.audio_files.find({"_id": {"$in": keys}, "refs": {"$size": 0}}).to_list(length=None)
+            if await self._remove(db, entry)
+        ]
+
+        # Chunks of the removed files, unless another joined file still uses them
+        parts = {part for entry in removed for part in entry.get("parts", [])}
+        if parts:
+            shared = await db.audio_files.find({"parts": {"$in": list(parts)}}, {"parts": 1}).to_list(length=None)
+            parts -= {part for entry in shared for part in entry["parts"]}
+            for entry in await db.audio_files.find({"_id": {"$in": list(parts)}, "refs": {"$size": 0}}).to_list(length=None):
+                if await self._remove(db, entry):
+                    removed.append(entry)
+        return len(removed)
+
+    async def _remove(self, db, entry: Dict) -> bool:
+        """Delete an entry's file and record; returns False if it is in use and was kept"""
+        if self._in_use(entry["_id"]):
+            return False
+        (self.audio_dir / entry["filename"]).unlink(missing_ok=True)
+        await db.audio_files.delete_one({"_id": entry["_id"]})
+        return True
+
+    async def enforce_quota(self, db) -> None:
+        """Evict least recently used audio while the cache is over AUDIO_CACHE_MAX_BYTES"""
+        if not settings.AUDIO_CACHE_MAX_BYTES:
+            return
+        if self._eviction is None:
+            self._eviction = asyncio.Lock()
+
+        async with self._eviction:
+            totals = await db.audio_files.aggregate([
+                {"$group": {"_id": None, "bytes": {"$sum": "$size_bytes"}}}
+            ]).to_list(length=1)
+            total = totals[0]["bytes"] if totals else 0
+            if total <= settings.AUDIO_CACHE_MAX_BYTES:
+                return
+
+            target = settings.AUDIO_CACHE_MAX_BYTES * settings.AUDIO_CACHE_EVICT_TO_RATIO
+            cursor = db.audio_files.aggregate([
+                {"$addFields": {"referenced": {"$gt": [{"$size": "$refs"}, 0]}}},
+                {"$sort": {"referenced": 1, "last_used_at": 1}}
+            ])
+            async for entry in cursor:
+                if total <= target:
+                    break
+                if not await self._remove(db, entry):
+                    continue
+                if entry["refs"]:
+                    await db.solutions.update_many(
+                        {"_id": {"$in": [ObjectId(ref) for ref in entry["refs"]]}},
+                        {"$set": {"audio_url": None}}
+                    )
+                total -= entry.get("size_bytes", 0)
+                self._counters["evictions"] += 1
+                self._counters["evicted_bytes"] += entry.get("size_bytes", 0)
+            logger.info(f"Audio cache evicted down to {total / 1024 / 1024:.1f} MB")
+
+    async def usage(self, db) -> Dict:
+        """Files and bytes on disk, split by whether any solution references them"""
+        rows = await db.audio_files.aggregate([
+            {"$group": {
+                "_id": {"$gt": [{"$size": "$refs"}, 0]},
+                "files": {"$sum": 1},
+                "bytes": {"$sum": "$size_bytes"}
+            }}
+        ]).to_list(length=None)
+        by_state = {row["_id"]: row for row in rows}
+        referenced = by_state.get(True, {})
+        unreferenced = by_state.get(False, {})
+        return {
+            "max_bytes": settings.AUDIO_CACHE_MAX_BYTES,
+            "files": referenced.get("files", 0) + unreferenced.get("files", 0),
+            "bytes": referenced.get("bytes", 0) + unreferenced.get("bytes", 0),
+            "unreferenced_files": unreferenced.get("files", 0),
+            "unreferenced_bytes": unreferenced.get("bytes", 0),
+            "in_flight": self.in_flight,
+            **self._counters
+        }
+
+
+audio_cache = AudioCache()
@@ -1,4 +1,5 @@
 from typing import Dict
+from app.operations.audio_cache import audio_cache
 
 class DeleteOperations:
     @staticmethod
@@ -8,12 +9,18 @@ class DeleteOperations:
         hw_result = await db.homework_submissions.delete_one({"_id": homework_id})
         counts["homework"] = hw_result.deleted_count
 
+        # Generated documents store the homework ID as a string
+        homework_id = str(homework_id)
+
         # Delete solutions
         solutions = await db.solutions.find({"homework_id": homework_id}).to_list(length=None)
         solution_ids = [str(s["_id"]) for s in solutions]
         sol_result = await db.solutions.delete_many({"homework_id": homework_id})
         counts["solutions"] = sol_result.deleted_count
 
+        # Release their audio; files no other solution uses are deleted
+        counts["audio_files"] = await audio_cache.release_solutions(db, solution_ids)
+
         # Delete feedback for solutions
         if solution_ids:
             feedback_result = await db.feedback.delete_many({"solution_id": {"$in": solution_ids}})
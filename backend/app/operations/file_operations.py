@@ -2,8 +2,9 @@ import os
 import uuid
 import shutil
 from pathlib import Path
+from typing import List
 from fastapi import UploadFile, HTTPException
-from app.utils.constants import MAX_FILE_SIZE, ALLOWED_EXTENSIONS
+from app.utils.constants import MAX_FILE_SIZE, ALLOWED_EXTENSIONS, WORKSHEET_EXTENSIONS
 
 class FileOperations:
     """Non-AI file handling operations"""
@@ -19,6 +20,16 @@ class FileOperations:
                 detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
             )
 
+    @staticmethod
+    def validate_worksheet_file(file: UploadFile) -> None:
+        """Validate uploaded worksheet (image, multi-page TIFF or PDF)"""
+        file_ext = Path(file.filename).suffix.lower()
+        if file_ext not in WORKSHEET_EXTENSIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File type not allowed. Allowed types: {', '.join(sorted(WORKSHEET_EXTENSIONS))}"
+            )
+
     @staticmethod
     async def save_upload_file(file: UploadFile, storage_path: str) -> str:
         """
@@ -52,3 +63,9 @@ class FileOperations:
         audio_dir = Path(storage_path) / "audio"
         audio_dir.mkdir(parents=True, exist_ok=True)
         return audio_dir
+
+    @staticmethod
+    def delete_files(paths: List[str]) -> None:
+        """Delete files, ignoring ones that are already gone"""
+        for path in paths:
+            Path(path).unlink(missing_ok=True)
@@ -0,0 +1,74 @@
+import cv2
+import numpy as np
+from typing import Callable, Dict, Optional
+
+
+class ImageContext:
+    """
+    Decoded image shared by every OCR engine during one request
+
+    The file is decoded once. Grayscale, thresholded and denoised variants are
+    computed on first access and memoized, and every accessor returns the
+    cached numpy buffer itself rather than a copy, so callers must treat the
+    arrays as read-only.
+    """
+
+    def __init__(self, image_path: str, image: Optional[np.ndarray] = None, scale: float = 1.0):
+        """
+        Args:
+            image_path: Path to image file (used for decoding and logging)
+            image: Already decoded BGR image, if the caller has one
+            scale: Factor applied to the original file to obtain `image`
+        """
+        self.image_path = image_path
+        self.scale = scale
+        self._bgr = image
+        self._variants: Dict[str, np.ndarray] = {}
+
+    def _memoize(self, name: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        if name not in self._variants:
+            self._variants[name] = compute()
+        return self._variants[name]
+
+    @property
+    def bgr(self) -> np.ndarray:
+        """Decoded image in OpenCV's BGR layout"""
+        if self._bgr is None:
+            self._bgr = cv2.imread(self.image_path)
+            if self._bgr is None:
+                raise ValueError(f"Could not decode image: {self.image_path}")
+        return self._bgr
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """RGB image (Pix2Text and other PIL-based engines)"""
+        return self._memoize("rgb", lambda: cv2.cvtColor(self.bgr, cv2.COLOR_BGR2RGB))
+
+    @property
+    def gray(self) -> np.ndarray:
+        """Grayscale image (raw input for the alternative Tesseract modes)"""
+        return self._memoize("gray", lambda: cv2.cvtColor(self.bgr, cv2.COLOR_BGR2GRAY))
+
+    @property
+    def thresholded(self) -> np.ndarray:
+        """Gaussian-blurred, adaptively thresholded image"""
+        def compute():
+            # Apply Gaussian blur to reduce noise
+            blurred = cv2.GaussianBlur(self.gray, (5, 5), 0)
+
+            # Apply adaptive thresholding
+            return cv2.adaptiveThreshold(
+                blurred, 255,
+                cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                cv2.THRESH_BINARY,
+                11, 2
+            )
+        return self._memoize("thresholded", compute)
+
+    @property
+    def denoised(self) -> np.ndarray:
+        """Thresholded image after non-local means denoising (Tesseract PSM 6 input)"""
+        return self._memoize(
+            "denoised",
+            lambda: cv2.fastNlMeansDenoising(self.thresholded, None, 10, 7, 21)
+        )
@@ -4,62 +4,160 @@ from PIL import Image
 import pytesseract
 from pathlib import Path
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+from app.operations.model_registry import model_registry
+from app.operations.image_context import ImageContext
+from app.operations.ocr_router import OCRRouter
 
 logger = logging.getLogger(__name__)
 
+# Bounded pool shared by all multi-PSM runs in this process
+_psm_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_psm_executor() -> ThreadPoolExecutor:
+    global _psm_executor
+    if _psm_executor is None:
+        _psm_executor = ThreadPoolExecutor(
+            max_workers=settings.TESSERACT_PSM_WORKERS,
+            thread_name_prefix="tesseract-psm"
+        )
+    return _psm_executor
+
+
 class ImageProcessor:
     """Image processing operations with OCR fallback support"""
 
     def __init__(self):
-        """Initialize ImageProcessor with lazy-loaded EasyOCR reader"""
+        """Initialize ImageProcessor; models come from the shared model registry"""
         self._easyocr_reader = None
 
     @staticmethod
-    def preprocess_image(image_path: str) -> np.ndarray:
+    def estimate_text_height(gray: np.ndarray) -> Optional[float]:
         """
-        Preprocess image for better OCR accuracy
-        - Convert to grayscale
-        - Apply denoising
-        - Apply adaptive thresholding
-        - Deskew if needed
+        Estimate the median glyph height of an image in pixels
+
+        Connected components are measured on an Otsu-binarised proxy of at most
+        1024px on the long side; specks, rules and page borders are ignored.
+
+        Args:
+            gray: Grayscale image
+
+        Returns:
+            Median text height in original-image pixels, or None if too few glyphs were found
         """
-        # Read image
-        img = cv2.imread(image_path)
+        height, width = gray.shape[:2]
+        proxy_scale = min(1.0, 1024 / max(height, width))
+        proxy = gray
+        if proxy_scale < 1.0:
+            proxy = cv2.resize(gray, None, fx=proxy_scale, fy=proxy_scale, interpolation=cv2.INTER_AREA)
+
+        _, binary = cv2.threshold(proxy, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+
+        heights = stats[1:count, cv2.CC_STAT_HEIGHT]
+        widths = stats[1:count, cv2.CC_STAT_WIDTH]
+        areas = stats[1:count, cv2.CC_STAT_AREA]
+        glyphs = (
+            (heights >= 3) & (areas >= 6)
+            & (heights <= proxy.shape[0] * 0.2) & (widths <= proxy.shape[1] * 0.2)
+        )
+
+        if glyphs.sum() < 10:
+            return None
+        return float(np.median(heights[glyphs])) / proxy_scale
+
+    @staticmethod
+    def normalize_resolution(image: np.ndarray) -> Tuple[np.ndarray, float]:
+        """
+        Downscale an image to the OCR working resolution
+
+        Phone and webcam photos are often 12+ MP, while denoising and the neural
+        engines scale super-linearly with pixel count. The image is shrunk so
+        that its text is about OCR_TARGET_TEXT_HEIGHT_PX tall and its area is at
+        most OCR_MAX_WORKING_PIXELS, never below OCR_MIN_WORKING_LONG_SIDE on the
+        long side. Images are never upscaled.
+
+        Args:
+            image: Decoded BGR image
+
+        Returns:
+            Tuple of (working image, scale factor applied)
+        """
+        height, width = image.shape[:2]
+        long_side = max(height, width)
+        if long_side <= settings.OCR_MIN_WORKING_LONG_SIDE:
+            return image, 1.0
+
+        scale = min(1.0, (settings.OCR_MAX_WORKING_PIXELS / (height * width)) ** 0.5)
 
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        text_height = ImageProcessor.estimate_text_height(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+        if text_height:
+            scale = min(scale, settings.OCR_TARGET_TEXT_HEIGHT_PX / text_height)
 
-        # Apply Gaussian blur to reduce noise
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+        scale = max(scale, settings.OCR_MIN_WORKING_LONG_SIDE / long_side)
 
-        # Apply adaptive thresholding
-        thresh = cv2.adaptiveThreshold(
-            blurred, 255,
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY,
-            11, 2
+        # Not worth resampling for a marginal reduction
+        if scale > 0.9:
+            return image, 1.0
+
+        resized = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        logger.info(
+            f"Normalised {width}x{height} to {resized.shape[1]}x{resized.shape[0]} "
+            f"(text height {text_height or 0:.0f}px, scale {scale:.2f})"
         )
+        return resized, scale
+
+    @staticmethod
+    def prepare_context(image_path: str, context: Optional[ImageContext] = None) -> ImageContext:
+        """
+        Get the ImageContext an engine should work on
+
+        Reuses the caller's context when given; otherwise decodes the file and
+        runs the resolution normalisation stage (OCR_NORMALIZE_RESOLUTION).
+        """
+        if context is not None:
+            return context
+
+        image = cv2.imread(image_path)
+        if image is None or not settings.OCR_NORMALIZE_RESOLUTION:
+            return ImageContext(image_path, image)
 
-        # Denoise
-        denoised = cv2.fastNlMeansDenoising(thresh, None, 10, 7, 21)
+        image, scale = ImageProcessor.normalize_resolution(image)
+        return ImageContext(image_path, image, scale)
+
+    @staticmethod
+    def preprocess_image(image_path: str, context: Optional[ImageContext] = None) -> np.ndarray:
+        """
+        Preprocess image for better OCR accuracy
+        - Convert to grayscale
+        - Apply denoising
+        - Apply adaptive thresholding
+        - Deskew if needed
 
-        return denoised
+        The variants are memoized on the ImageContext, so repeated calls with
+        the same context do not redo the work.
+        """
+        context = ImageProcessor.prepare_context(image_path, context)
+        return context.denoised
 
     def _get_easyocr_reader(self):
-        """Lazy-load EasyOCR reader to avoid startup overhead"""
+        """Get the process-wide EasyOCR reader (loaded on first use)"""
         if self._easyocr_reader is None:
             try:
-                # Import easyocr only when needed (lazy import)
-                import easyocr
-                logger.info("Initializing EasyOCR reader (first use only)...")
-                self._easyocr_reader = easyocr.Reader(['en'], gpu=False, verbose=False)
-                logger.info("EasyOCR reader initialized successfully")
+                self._easyocr_reader = model_registry.get("easyocr")
             except Exception as e:
                 logger.error(f"Failed to initialize EasyOCR: {str(e)}")
                 raise
         return self._easyocr_reader
 
-    def extract_text_with_pix2text(self, image_path: str) -> str:
+    def preload_models(self) -> None:
+        """Load OCR models ahead of the first request"""
+        model_registry.preload()
+
+    def extract_text_with_pix2text(self, image_path: str, context: Optional[ImageContext] = None) -> str:
         """
         Extract text and mathematical equations using Pix2Text
 
@@ -70,21 +168,19 @@ class ImageProcessor:
 
         Args:
             image_path: Path to image file
+            context: Shared decoded image for this request (created if omitted)
 
         Returns:
             Extracted text with LaTeX for math equations
         """
         try:
-            # Lazy import to avoid loading models at startup
-            from pix2text import Pix2Text
+            context = ImageProcessor.prepare_context(image_path, context)
 
-            logger.info("Initializing Pix2Text...")
-            # Initialize with English language
-            # First run will download models (~100MB one-time)
-            p2t = Pix2Text(languages='en')
+            # Shared instance, only the first call in a process pays model loading
+            p2t = model_registry.get("pix2text")
 
             logger.info(f"Extracting text with Pix2Text from {image_path}...")
-            result = p2t(image_path)
+            result = p2t(Image.fromarray(context.rgb))
 
             # Pix2Text returns text directly or dict with 'text' key
             if isinstance(result, dict):
@@ -99,25 +195,25 @@ class ImageProcessor:
             logger.error(f"Pix2Text extraction failed: {str(e)}")
             return ""
 
-    def extract_text_with_easyocr(self, image_path: str) -> str:
+    def extract_text_with_easyocr(self, image_path: str, context: Optional[ImageContext] = None) -> str:
         """
         Extract text from image using EasyOCR (better for handwritten text)
 
         Args:
             image_path: Path to image file
+            context: Shared decoded image for this request (created if omitted)
 
         Returns:
             Extracted text
         """
         try:
+            context = ImageProcessor.prepare_context(image_path, context)
+
             # Get EasyOCR reader
             reader = self._get_easyocr_reader()
 
-            # Read image
-            img = cv2.imread(image_path)
-
-            # Extract text with EasyOCR
-            results = reader.readtext(img, detail=0, paragraph=True)
+            # Extract text with EasyOCR (reads the decoded buffer directly)
+            results = reader.readtext(context.bgr, detail=0, paragraph=True)
 
             # Combine results
             text = "\n".join(results)
@@ -129,21 +225,79 @@ class ImageProcessor:
             logger.error(f"EasyOCR extraction failed: {str(e)}")
             return ""
 
+    def extract_text_with_easyocr_batch(
+        self,
+        image_paths: List[str],
+        contexts: Optional[List[Optional[ImageContext]]] = None
+    ) -> List[str]:
+        """
+        Extract text from several images with one batched EasyOCR pass
+
+        EasyOCR stacks a batch into one array, so smaller images are padded
+        with white to the largest height/width in the batch (text geometry is
+        unchanged). Text detection then runs as a single batch.
+
+        Args:
+            image_paths: Paths to image files
+            contexts: Shared decoded images, one per path (created if omitted)
+
+        Returns:
+            Extracted text per image, in input order
+        """
+        contexts = [
+            ImageProcessor.prepare_context(path, context)
+            for path, context in zip(image_paths, contexts or [None] * len(image_paths))
+        ]
+
+        try:
+            reader = self._get_easyocr_reader()
+            images = [context.bgr for context in contexts]
+
+            max_height = max(img.shape[0] for img in images)
+            max_width = max(img.shape[1] for img in images)
+            batch = []
+            for img in images:
+                if img.shape[:2] == (max_height, max_width):
+                    batch.append(img)
+                    continue
+                canvas = np.full((max_height, max_width, 3), 255, dtype=np.uint8)
+                canvas[:img.shape[0], :img.shape[1]] = img
+                batch.append(canvas)
+
+            results = reader.readtext_batched(batch, detail=0, paragraph=True)
+            texts = ["\n".join(lines).strip() for lines in results]
+
+            logger.info(f"EasyOCR batch of {len(texts)} images extracted {[len(t) for t in texts]} characters")
+            return texts
+
+        except Exception as e:
+            # One undecodable image must not fail the whole batch
+            logger.error(f"EasyOCR batch extraction failed, retrying per image: {str(e)}")
+            return [
+                self.extract_text_with_easyocr(path, context)
+                for path, context in zip(image_paths, contexts)
+            ]
+
     @staticmethod
-    def extract_text_with_tesseract(image_path: str, language_code: str) -> str:
+    def extract_text_with_tesseract(
+        image_path: str,
+        language_code: str,
+        context: Optional[ImageContext] = None
+    ) -> str:
         """
         Extract text from image using Tesseract OCR
 
         Args:
             image_path: Path to image file
             language_code: Tesseract language code (eng, tam, hin)
+            context: Shared decoded image for this request (created if omitted)
 
         Returns:
             Extracted text
         """
         try:
             # Preprocess image
-            processed_img = ImageProcessor.preprocess_image(image_path)
+            processed_img = ImageProcessor.preprocess_image(image_path, context)
 
             # Convert back to PIL Image for tesseract
             pil_img = Image.fromarray(processed_img)
@@ -161,7 +315,46 @@ class ImageProcessor:
             logger.error(f"Tesseract extraction failed: {str(e)}")
             return ""
 
-    def extract_text_with_multiple_psm_modes(self, image_path: str, language_code: str) -> str:
+    @staticmethod
+    def _run_tesseract_with_confidence(image, config: str) -> Tuple[str, float]:
+        """
+        Run Tesseract once and return its text with the mean word confidence
+
+        Args:
+            image: PIL image to recognise
+            config: Tesseract config string
+
+        Returns:
+            Tuple of (text, mean confidence 0-100 over recognised words)
+        """
+        data = pytesseract.image_to_data(
+            image,
+            config=config,
+            output_type=pytesseract.Output.DICT,
+            timeout=settings.TESSERACT_TIMEOUT_SECONDS
+        )
+
+        # Rebuild the text line by line from the word boxes
+        lines = {}
+        confidences = []
+        for i, word in enumerate(data["text"]):
+            confidence = float(data["conf"][i])
+            if confidence < 0 or not word.strip():
+                continue
+            confidences.append(confidence)
+            line_key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            lines.setdefault(line_key, []).append(word.strip())
+
+        text = "\n".join(" ".join(words) for words in lines.values())
+        mean_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+        return text.strip(), mean_confidence
+
+    def extract_text_with_multiple_psm_modes(
+        self,
+        image_path: str,
+        language_code: str,
+        context: Optional[ImageContext] = None
+    ) -> str:
         """
         Try multiple Tesseract PSM modes for better handwriting recognition
 
@@ -171,66 +364,85 @@ class ImageProcessor:
         - PSM 11: Sparse text, find as much text as possible (better for handwriting)
         - PSM 13: Raw line, treat image as single text line
 
+        PSM 6 on the preprocessed image runs first. If it reaches
+        TESSERACT_EARLY_EXIT_CONFIDENCE it is returned and no other tesseract
+        process is started. Otherwise the remaining modes run concurrently
+        on a bounded thread pool (each call is a separate tesseract process).
+        The first of them to reach the threshold is returned at once and the
+        modes still queued on the pool are cancelled; modes already running
+        finish in the background and their result is discarded.
+
         Args:
             image_path: Path to image file
             language_code: Tesseract language code (eng, tam, hin)
+            context: Shared decoded image for this request (created if omitted)
 
         Returns:
-            Longest extracted text from all PSM modes
+            Text from the PSM mode with the highest mean word confidence
         """
         try:
-            # Read original image (no preprocessing for alternative modes)
-            img = cv2.imread(image_path)
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            pil_img_raw = Image.fromarray(gray)
+            context = ImageProcessor.prepare_context(image_path, context)
 
-            # Preprocess image for PSM 6
-            processed_img = ImageProcessor.preprocess_image(image_path)
-            pil_img_processed = Image.fromarray(processed_img)
+            # Original grayscale (no preprocessing for alternative modes);
+            # single-channel arrays are wrapped by PIL without copying
+            pil_img_raw = Image.fromarray(context.gray)
 
-            results = {}
+            # Preprocessed image for PSM 6
+            pil_img_processed = Image.fromarray(ImageProcessor.preprocess_image(image_path, context))
 
-            # Try PSM 6 with preprocessing (default, good for printed text)
-            try:
-                config = f'--oem 3 --psm 6 -l {language_code}'
-                text = pytesseract.image_to_string(pil_img_processed, config=config)
-                results['PSM 6 (processed)'] = text.strip()
-                logger.info(f"PSM 6 (processed): {len(results['PSM 6 (processed)'])} characters")
-            except Exception as e:
-                logger.warning(f"PSM 6 (processed) failed: {e}")
-
-            # Try PSM 3 with raw image (auto page segmentation)
-            try:
-                config = f'--oem 3 --psm 3 -l {language_code}'
-                text = pytesseract.image_to_string(pil_img_raw, config=config)
-                results['PSM 3 (raw)'] = text.strip()
-                logger.info(f"PSM 3 (raw): {len(results['PSM 3 (raw)'])} characters")
-            except Exception as e:
-                logger.warning(f"PSM 3 (raw) failed: {e}")
+            best = None
 
-            # Try PSM 11 with raw image (sparse text, best for handwriting)
+            # PSM 6 alone first: it is the usual winner on printed worksheets
             try:
-                config = f'--oem 3 --psm 11 -l {language_code}'
-                text = pytesseract.image_to_string(pil_img_raw, config=config)
-                results['PSM 11 (raw)'] = text.strip()
-                logger.info(f"PSM 11 (raw): {len(results['PSM 11 (raw)'])} characters")
+                text, confidence = self._run_tesseract_with_confidence(
+                    pil_img_processed, f'--oem 3 --psm 6 -l {language_code}'
+                )
+                logger.info(f"PSM 6 (processed): {len(text)} characters, confidence {confidence:.1f}")
+                if text:
+                    best = ("PSM 6 (processed)", text, confidence)
             except Exception as e:
-                logger.warning(f"PSM 11 (raw) failed: {e}")
-
-            # Try PSM 13 with raw image (single line)
-            try:
-                config = f'--oem 3 --psm 13 -l {language_code}'
-                text = pytesseract.image_to_string(pil_img_raw, config=config)
-                results['PSM 13 (raw)'] = text.strip()
-                logger.info(f"PSM 13 (raw): {len(results['PSM 13 (raw)'])} characters")
-            except Exception as e:
-                logger.warning(f"PSM 13 (raw) failed: {e}")
+                logger.warning(f"PSM 6 (processed) failed: {e}")
 
-            # Return the longest non-empty result
-            if results:
-                best_mode = max(results, key=lambda k: len(results[k]))
-                best_text = results[best_mode]
-                logger.info(f"✅ Best result from {best_mode}: {len(best_text)} characters")
+            if best and best[2] >= settings.TESSERACT_EARLY_EXIT_CONFIDENCE:
+                logger.info(f"PSM 6 reached confidence {best[2]:.1f}, skipping the other modes")
+                return best[1]
+
+            modes = [
+                ("PSM 3 (raw)", 3, pil_img_raw),
+                ("PSM 11 (raw)", 11, pil_img_raw),
+                ("PSM 13 (raw)", 13, pil_img_raw)
+            ]
+
+            executor = _get_psm_executor()
+            futures = {
+                executor.submit(
+                    self._run_tesseract_with_confidence,
+                    image,
+                    f'--oem 3 --psm {psm} -l {language_code}'
+                ): label
+                for label, psm, image in modes
+            }
+
+            for future in as_completed(futures):
+                label = futures[future]
+                try:
+                    text, confidence = future.result()
+                except Exception as e:
+                    logger.warning(f"{label} failed: {e}")
+                    continue
+
+                logger.info(f"{label}: {len(text)} characters, confidence {confidence:.1f}")
+                if text and (best is None or confidence > best[2]):
+                    best = (label, text, confidence)
+
+                if best and best[2] >= settings.TESSERACT_EARLY_EXIT_CONFIDENCE:
+                    cancelled = sum(other.cancel() for other in futures if not other.done())
+                    logger.info(f"{best[0]} reached confidence {best[2]:.1f}, cancelled {cancelled} queued modes")
+                    break
+
+            if best:
+                best_mode, best_text, best_confidence = best
+                logger.info(f"✅ Best result from {best_mode}: {len(best_text)} characters, confidence {best_confidence:.1f}")
                 return best_text
             else:
                 logger.error("❌ All PSM modes failed")
@@ -240,7 +452,12 @@ class ImageProcessor:
             logger.error(f"Error in multi-PSM extraction: {str(e)}")
             return ""
 
-    def extract_text_with_ocr_fallback(self, image_path: str, language_code: str) -> str:
+    def extract_text_with_ocr_fallback(
+        self,
+        image_path: str,
+        language_code: str,
+        context: Optional[ImageContext] = None
+    ) -> str:
         """
         Extract text from image with automatic fallback strategy
 
@@ -253,6 +470,7 @@ class ImageProcessor:
         Args:
             image_path: Path to image file
             language_code: Tesseract language code (eng, tam, hin)
+            context: Shared decoded image for this request (created if omitted)
 
         Returns:
             Extracted text (with LaTeX for math equations if present)
@@ -260,11 +478,14 @@ class ImageProcessor:
         MIN_CHARS_THRESHOLD = 10
         logger.info(f"Attempting OCR extraction for {image_path}")
 
+        # Decode once and share the buffers (and preprocessed variants) across engines
+        context = ImageProcessor.prepare_context(image_path, context)
+
         # PRIMARY: Try Pix2Text first (best for math equations)
         pix2text_result = ""
         try:
             logger.info("Trying Pix2Text (primary method - best for math)...")
-            pix2text_result = self.extract_text_with_pix2text(image_path)
+            pix2text_result = self.extract_text_with_pix2text(image_path, context)
 
             # If Pix2Text extracted enough text, return it immediately
             if len(pix2text_result) >= MIN_CHARS_THRESHOLD:
@@ -281,7 +502,7 @@ class ImageProcessor:
         easyocr_text = ""
         try:
             logger.info("Trying EasyOCR (fallback 1 - better for handwriting)...")
-            easyocr_text = self.extract_text_with_easyocr(image_path)
+            easyocr_text = self.extract_text_with_easyocr(image_path, context)
 
             # If EasyOCR extracted enough text, return it
             if len(easyocr_text) >= MIN_CHARS_THRESHOLD:
@@ -296,7 +517,7 @@ class ImageProcessor:
 
         # FALLBACK 2: Try Tesseract multi-PSM modes (final attempt)
         logger.info("Trying Tesseract multi-PSM modes (fallback 2 - final attempt)...")
-        tesseract_text = self.extract_text_with_multiple_psm_modes(image_path, language_code)
+        tesseract_text = self.extract_text_with_multiple_psm_modes(image_path, language_code, context)
 
         # Return the longest extraction from all attempts
         all_results = [
@@ -316,6 +537,150 @@ class ImageProcessor:
             logger.error(f"❌ All OCR methods (Pix2Text, EasyOCR, Tesseract) failed to extract text from {image_path}")
             return ""
 
+    def extract_text_routed(
+        self,
+        image_path: str,
+        language_code: str,
+        route_stats: Optional[Dict] = None,
+        context: Optional[ImageContext] = None
+    ) -> Dict:
+        """
+        Extract text using the engine order chosen by the OCR router
+
+        The image is classified (script, math density, handwriting vs print) and
+        the engines for its route are tried in order until one returns enough
+        text. If none does, the longest extraction is returned. On comparison
+        runs every engine runs and the best-agreeing text is returned.
+
+        Args:
+            image_path: Path to image file
+            language_code: Tesseract language code (eng, tam, hin)
+            route_stats: Recorded win rates per route (OCRRouteStats.snapshot())
+            context: Shared decoded image for this request (created if omitted)
+
+        Returns:
+            Dict with text, engine (whose text was returned, or None), route,
+            tried (engines run in order), compared (whether every engine ran)
+            and winners (engines to credit for a comparison run)
+        """
+        return self.extract_text_routed_batch(
+            [(image_path, language_code)],
+            route_stats,
+            [context]
+        )[0]
+
+    def extract_text_routed_batch(
+        self,
+        jobs: List[Tuple[str, str]],
+        route_stats: Optional[Dict] = None,
+        contexts: Optional[List[Optional[ImageContext]]] = None
+    ) -> List[Dict]:
+        """
+        Routed OCR for several images at once
+
+        Images advance through their engine orders in lock-step; at each stage
+        all images waiting on EasyOCR are recognised in one batch, the other
+        engines run per image. Images picked for a comparison run
+        (OCRRouter.should_compare) go through every engine of their route and
+        return the text of the engine that agrees most with the others.
+
+        Args:
+            jobs: List of (image_path, language_code)
+            route_stats: Recorded win rates per route (OCRRouteStats.snapshot())
+            contexts: Optional pre-built ImageContext per job
+
+        Returns:
+            One result dict per job, as returned by extract_text_routed
+        """
+        MIN_CHARS_THRESHOLD = 10
+        contexts = contexts or [None] * len(jobs)
+
+        states = []
+        for (image_path, language_code), context in zip(jobs, contexts):
+            context = ImageProcessor.prepare_context(image_path, context)
+            try:
+                features = OCRRouter.extract_features(context)
+            except Exception as e:
+                logger.warning(f"OCR routing features failed for {image_path}: {str(e)}")
+                features = {"math_bar_ratio": 0.0, "height_cv": 0.0, "glyph_count": 0}
+
+            route = OCRRouter.route_key(language_code, features)
+            order = OCRRouter.engine_order(route, (route_stats or {}).get(route))
+            logger.info(f"OCR route {route} {features} -> {order} for {image_path}")
+            states.append({
+                "image_path": image_path,
+                "language_code": language_code,
+                "context": context,
+                "route": route,
+                "order": order,
+                "compare": OCRRouter.should_compare(route, (route_stats or {}).get(route)),
+                "tried": [],
+                "results": {},
+                "engine": None
+            })
+
+        while True:
+            stage = {}
+            for state in states:
+                if state["engine"] is None and len(state["tried"]) < len(state["order"]):
+                    stage.setdefault(state["order"][len(state["tried"])], []).append(state)
+            if not stage:
+                break
+
+            for engine, group in stage.items():
+                if engine == "easyocr" and len(group) > 1:
+                    texts = self.extract_text_with_easyocr_batch(
+                        [s["image_path"] for s in group],
+                        [s["context"] for s in group]
+                    )
+                else:
+                    texts = [self._run_engine(engine, s["image_path"], s["language_code"], s["context"]) for s in group]
+
+                for state, text in zip(group, texts):
+                    state["tried"].append(engine)
+                    state["results"][engine] = text
+                    if state["compare"]:
+                        logger.info(f"{engine} extracted {len(text)} characters on comparison route {state['route']}")
+                    elif len(text) >= MIN_CHARS_THRESHOLD:
+                        state["engine"] = engine
+                        logger.info(f"✅ {engine} successful on route {state['route']}: {len(text)} characters")
+                    else:
+                        logger.warning(f"⚠️ {engine} extracted only {len(text)} characters on route {state['route']}")
+
+        outputs = []
+        for state in states:
+            winners = []
+            if state["compare"]:
+                winners = OCRRouter.pick_winners(state["results"], MIN_CHARS_THRESHOLD)
+                # Without a clear winner fall back to the first engine in order with enough text
+                accepted = winners or [e for e in state["tried"] if len(state["results"][e]) >= MIN_CHARS_THRESHOLD]
+                state["engine"] = next((e for e in state["tried"] if e in accepted), None)
+                logger.info(f"OCR comparison on route {state['route']}: winners {winners}, using {state['engine']}")
+
+            if state["engine"]:
+                text = state["results"][state["engine"]]
+            else:
+                # Nothing cleared the threshold: keep the longest extraction, without crediting a win
+                text = max(state["results"].values(), key=len, default="")
+                if not text:
+                    logger.error(f"❌ All OCR engines {state['tried']} failed to extract text from {state['image_path']}")
+            outputs.append({
+                "text": text,
+                "engine": state["engine"],
+                "route": state["route"],
+                "tried": state["tried"],
+                "compared": state["compare"],
+                "winners": winners
+            })
+        return outputs
+
+    def _run_engine(self, engine: str, image_path: str, language_code: str, context: ImageContext) -> str:
+        if engine == "pix2text":
+            return self.extract_text_with_pix2text(image_path, context)
+        if engine == "easyocr":
+            return self.extract_text_with_easyocr(image_path, context)
+        return self.extract_text_with_multiple_psm_modes(image_path, language_code, context)
+
     @staticmethod
     def classify_subject(text: str) -> str:
         """
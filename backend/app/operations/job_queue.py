@@ -0,0 +1,308 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.config import settings
+from app.database.mongodb import get_database
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict], Awaitable[Dict]]
+
+# Job lifecycle
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobDeferred(Exception):
+    """Raised by a handler to run the job again later without using up an attempt"""
+
+    def __init__(self, delay: float, reason: str = ""):
+        super().__init__(reason)
+        self.delay = delay
+
+
+class JobQueue:
+    """
+    Durable background job queue backed by the `jobs` collection
+
+    - Worker coroutines claim the highest-priority due job with an atomic
+      find_one_and_update and hold a lease that is renewed while the job runs
+    - A job whose lease expires (worker crashed or restarted) is claimed again
+    - Failures are retried with exponential backoff and jitter up to
+      max_attempts; ValueError (bad input, missing document) fails at once.
+      A result that cannot be saved counts as a failed attempt, and a job
+      claimed more than max_attempts times is failed without running again
+    - An idempotency key returns the existing job instead of enqueueing a duplicate
+    - A handler raising JobDeferred is queued again after its delay without
+      counting the attempt (background work yielding to busy periods)
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, JobHandler] = {}
+        self._workers: List[asyncio.Task] = []
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._counters = {"enqueued": 0, "succeeded": 0, "failed": 0, "retried": 0, "deferred": 0, "lease_recoveries": 0}
+
+    def register(self, job_type: str, handler: JobHandler) -> None:
+        """Register the coroutine that runs jobs of a type; it receives the payload and returns the result"""
+        self._handlers[job_type] = handler
+
+    async def ensure_indexes(self, db) -> None:
+        await db.jobs.create_index([("status", 1), ("priority", -1), ("run_after", 1)])
+        await db.jobs.create_index(
+            "idempotency_key",
+            unique=True,
+            partialFilterExpression={"idempotency_key": {"$type": "string"}}
+        )
+        await db.jobs.create_index("finished_at", expireAfterSeconds=settings.JOB_RETENTION_SECONDS)
+
+    async def enqueue(
+        self,
+        db,
+        job_type: str,
+        payload: Dict,
+        idempotency_key: Optional[str] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None
+    ) -> Dict:
+        """
+        Add a job to the queue
+
+        Args:
+            db: Database instance
+            job_type: Registered job type
+            payload: Handler arguments (must be BSON-serialisable)
+            idempotency_key: Client-supplied key; repeating it returns the original job
+            priority: Higher runs first
+            max_attempts: Attempts before the job is marked failed (default JOB_MAX_ATTEMPTS)
+
+        Returns:
+            The job document
+        """
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        now = datetime.utcnow()
+        job = {
+            "type": job_type,
+            "payload": payload,
+            "status": QUEUED,
+            "priority": priority,
+            "attempts": 0,
+            "max_attempts": max_attempts or settings.JOB_MAX_ATTEMPTS,
+            "run_after": now,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "started_at": None,
+            "finished_at": None
+        }
+        if idempotency_key:
+            job["idempotency_key"] = f"{job_type}:{idempotency_key}"
+
+        try:
+            result = await db.jobs.insert_one(job)
+        except DuplicateKeyError:
+            return await db.jobs.find_one({"idempotency_key": job["idempotency_key"]})
+
+        job["_id"] = result.inserted_id
+        self._counters["enqueued"] += 1
+        return job
+
+    async def get(self, db, job_id: str) -> Optional[Dict]:
+        try:
+            object_id = ObjectId(job_id)
+        except Exception:
+            raise ValueError("Invalid job ID format")
+        return await db.jobs.find_one({"_id": object_id})
+
+    async def _claim(self, db) -> Optional[Dict]:
+        now = datetime.utcnow()
+        return await db.jobs.find_one_and_update(
+            {
+                "type": {"$in": list(self._handlers.keys())},
+                "$or": [
+                    {"status": QUEUED, "run_after": {"$lte": now}},
+                    {"status": RUNNING, "lease_expires_at": {"$lt": now}}
+                ]
+            },
+            {
+                "$set": {
+                    "status": RUNNING,
+                    "lease_owner": self._owner,
+                    "lease_expires_at": now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                    "started_at": now,
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("priority", -1), ("run_after", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _renew_lease(self, db, job_id: ObjectId) -> None:
+        """
+        Extend the lease while the handler runs so other workers don't take the job over
+
+        Renews every third of JOB_LEASE_SECONDS, so two failed renewals in a
+        row (database hiccups) still leave the lease valid; errors are logged
+        and the next renewal is tried as usual.
+        """
+        interval = settings.JOB_LEASE_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await db.jobs.update_one(
+                    {"_id": job_id, "lease_owner": self._owner},
+                    {"$set": {"lease_expires_at": datetime.utcnow() + timedelta(seconds=settings.JOB_LEASE_SECONDS)}}
+                )
+            except Exception as e:
+                logger.warning(f"Could not renew lease of job {job_id}: {str(e)}")
+
+    async def _finish(self, db, job: Dict, update: Dict) -> None:
+        now = datetime.utcnow()
+        await db.jobs.update_one(
+            {"_id": job["_id"], "lease_owner": self._owner},
+            {"$set": {**update, "lease_owner": None, "lease_expires_at": None, "updated_at": now}}
+        )
+
+    async def _fail(self, db, job: Dict, error: Exception) -> None:
+        """Record a failed attempt: retry with backoff, or fail for good on ValueError or the last attempt"""
+        permanent = isinstance(error, ValueError) or job["attempts"] >= job["max_attempts"]
+        if permanent:
+            self._counters["failed"] += 1
+            logger.error(f"Job {job['_id']} ({job['type']}) failed: {str(error)}")
+            await self._finish(db, job, {"status": FAILED, "error": str(error), "finished_at": datetime.utcnow()})
+        else:
+            self._counters["retried"] += 1
+            backoff = settings.JOB_RETRY_BASE_SECONDS * (2 ** (job["attempts"] - 1))
+            backoff *= random.uniform(0.5, 1.5)
+            logger.warning(f"Job {job['_id']} ({job['type']}) attempt {job['attempts']} failed, retrying in {backoff:.1f}s: {str(error)}")
+            await self._finish(db, job, {
+                "status": QUEUED,
+                "error": str(error),
+                "run_after": datetime.utcnow() + timedelta(seconds=backoff)
+            })
+
+    async def _run(self, db, job: Dict) -> None:
+        if job["attempts"] > 1 and job.get("error") is None:
+            # Claimed again without a recorded failure: the previous worker lost its lease
+            self._counters["lease_recoveries"] += 1
+
+        if job["attempts"] > job["max_attempts"]:
+            # Every attempt ended without its outcome being saved (worker crash, database error)
+            self._counters["failed"] += 1
+            logger.error(f"Job {job['_id']} ({job['type']}) failed: no outcome recorded after {job['max_attempts']} attempts")
+            await self._finish(db, job, {
+                "status": FAILED,
+                "error": job.get("error") or f"No outcome recorded after {job['max_attempts']} attempts",
+                "finished_at": datetime.utcnow()
+            })
+            return
+
+        heartbeat = asyncio.create_task(self._renew_lease(db, job["_id"]))
+        try:
+            result = await self._handlers[job["type"]](job["payload"])
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back without counting the attempt
+            now = datetime.utcnow()
+            await db.jobs.update_one(
+                {"_id": job["_id"], "lease_owner": self._owner},
+                {
+                    "$set": {"status": QUEUED, "run_after": now, "lease_owner": None, "lease_expires_at": None, "updated_at": now},
+                    "$inc": {"attempts": -1}
+                }
+            )
+            raise
+        except JobDeferred as e:
+            self._counters["deferred"] += 1
+            logger.debug(f"Job {job['_id']} ({job['type']}) deferred for {e.delay:.0f}s: {str(e)}")
+            await db.jobs.update_one(
+                {"_id": job["_id"], "lease_owner": self._owner},
+                {
+                    "$set": {
+                        "status": QUEUED,
+                        "run_after": datetime.utcnow() + timedelta(seconds=e.delay),
+                        "lease_owner": None,
+                        "lease_expires_at": None,
+                        "updated_at": datetime.utcnow()
+                    },
+                    "$inc": {"attempts": -1}
+                }
+            )
+        except Exception as e:
+            await self._fail(db, job, e)
+        else:
+            try:
+                await self._finish(db, job, {
+                    "status": SUCCEEDED,
+                    "result": result,
+                    "error": None,
+                    "finished_at": datetime.utcnow()
+                })
+            except Exception as e:
+                # The result could not be saved (e.g. not BSON-encodable or too large): a failed attempt
+                await self._fail(db, job, e)
+            else:
+                self._counters["succeeded"] += 1
+        finally:
+            heartbeat.cancel()
+
+    async def _worker_loop(self, index: int) -> None:
+        db = get_database()
+        while True:
+            try:
+                job = await self._claim(db)
+                if job is None:
+                    await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+                    continue
+                await self._run(db, job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Database hiccup: back off and keep the worker alive
+                logger.error(f"Job worker {index} error: {str(e)}")
+                await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+
+    def start(self, workers: Optional[int] = None) -> None:
+        """Start the worker coroutines (called at startup)"""
+        workers = workers or settings.JOB_WORKERS
+        self._workers = [asyncio.create_task(self._worker_loop(i)) for i in range(workers)]
+        logger.info(f"Job queue started with {workers} workers")
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Job queue stopped")
+
+    async def stats(self, db) -> Dict:
+        by_status = await db.jobs.aggregate([
+            {"$group": {"_id": {"type": "$type", "status": "$status"}, "count": {"$sum": 1}}}
+        ]).to_list(length=None)
+
+        jobs = {}
+        for row in by_status:
+            jobs.setdefault(row["_id"]["type"], {})[row["_id"]["status"]] = row["count"]
+
+        return {
+            "workers": len(self._workers),
+            "jobs": jobs,
+            **self._counters
+        }
+
+
+job_queue = JobQueue()
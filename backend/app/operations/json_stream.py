@@ -0,0 +1,133 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+# (top-level key, array index or None, decoded value)
+JSONStreamEvent = Tuple[str, Optional[int], Any]
+
+
+class StreamingJSONObjectParser:
+    """
+    Incremental parser for a JSON object that arrives in chunks
+
+    Emits each top-level value as soon as it is complete. For top-level
+    arrays, every element is emitted as it closes, followed by the whole
+    array. For example, with {"solution_steps": [{...}, {...}], "final_answer": "..."}
+    the events are:
+
+        ("solution_steps", 0, {...})
+        ("solution_steps", 1, {...})
+        ("solution_steps", None, [{...}, {...}])
+        ("final_answer", None, "...")
+
+    Only the characters added since the last feed() are scanned.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._key: Optional[str] = None
+        self._expecting_value = False
+        self._value_start: Optional[int] = None
+        self._value_is_array = False
+        self._element_start: Optional[int] = None
+        self._element_index = 0
+
+    def feed(self, chunk: str) -> List[JSONStreamEvent]:
+        """
+        Add a chunk of model output
+
+        Returns:
+            Events completed by this chunk, in document order
+        """
+        self._buffer += chunk
+        events: List[JSONStreamEvent] = []
+
+        while self._pos < len(self._buffer):
+            i = self._pos
+            c = self._buffer[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._string_closed(i, events)
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                self._value_begins(i)
+            elif c in "{[":
+                if self._depth == 0:
+                    self._depth = 1
+                    continue
+                if self._depth == 1 and self._expecting_value:
+                    self._value_is_array = c == "["
+                    self._element_index = 0
+                self._value_begins(i)
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 2 and self._element_start is not None:
+                    self._emit_element(i + 1, events)
+                elif self._depth == 1 and self._value_is_array and self._element_start is not None:
+                    # Scalar as the last array element
+                    self._emit_element(i, events)
+                if self._depth == 1 and self._value_start is not None:
+                    self._emit_value(i + 1, events)
+                elif self._depth == 0 and self._value_start is not None:
+                    # Scalar as the last object member
+                    self._emit_value(i, events)
+            elif c == ":" and self._depth == 1:
+                self._expecting_value = True
+            elif c == ",":
+                if self._depth == 1 and self._value_start is not None:
+                    self._emit_value(i, events)
+                elif self._depth == 2 and self._value_is_array and self._element_start is not None:
+                    self._emit_element(i, events)
+            elif not c.isspace():
+                # Start of a number, true, false or null
+                self._value_begins(i)
+
+        return events
+
+    def _value_begins(self, i: int) -> None:
+        if self._depth == 1 and self._expecting_value and self._value_start is None:
+            self._value_start = i
+        elif self._depth == 2 and self._value_is_array and self._element_start is None:
+            self._element_start = i
+
+    def _string_closed(self, i: int, events: List[JSONStreamEvent]) -> None:
+        if self._depth == 1 and not self._expecting_value:
+            self._key = json.loads(self._buffer[self._string_start:i + 1])
+        elif self._depth == 1 and self._value_start == self._string_start:
+            self._emit_value(i + 1, events)
+        elif self._depth == 2 and self._value_is_array and self._element_start == self._string_start:
+            self._emit_element(i + 1, events)
+
+    def _emit_element(self, end: int, events: List[JSONStreamEvent]) -> None:
+        raw = self._buffer[self._element_start:end].strip()
+        events.append((self._key, self._element_index, json.loads(raw)))
+        self._element_index += 1
+        self._element_start = None
+
+    def _emit_value(self, end: int, events: List[JSONStreamEvent]) -> None:
+        raw = self._buffer[self._value_start:end].strip()
+        events.append((self._key, None, json.loads(raw)))
+        self._key = None
+        self._expecting_value = False
+        self._value_start = None
+        self._value_is_array = False
+        self._element_start = None
+
+    def result(self) -> Any:
+        """The complete document, once the stream has ended"""
+        return json.loads(self._buffer)
@@ -0,0 +1,182 @@
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import cv2
+import numpy as np
+from PIL import Image, ImageSequence
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bounding box as (x, y, width, height) in page pixels
+BBox = Tuple[int, int, int, int]
+
+
+class LayoutSegmenter:
+    """
+    Splits worksheet pages into question regions
+
+    Pages are read one at a time (PDF pages rendered with pypdfium2, TIFF
+    frames through PIL) so a long document is never fully held in memory.
+    Each page is cut into regions at vertical whitespace gaps that are clearly
+    larger than the normal spacing between text lines, or at least a blank
+    line tall.
+    """
+
+    @staticmethod
+    def iter_pages(file_path: str) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Yield the pages of an upload as BGR images
+
+        Args:
+            file_path: Path to a PDF, (multi-page) TIFF or single image
+
+        Yields:
+            Tuple of (1-based page number, BGR image)
+        """
+        ext = Path(file_path).suffix.lower()
+
+        if ext == ".pdf":
+            import pypdfium2 as pdfium
+
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                for index in range(len(pdf)):
+                    page = pdf[index]
+                    try:
+                        bitmap = page.render(scale=settings.WORKSHEET_PDF_DPI / 72)
+                        rgb = bitmap.to_numpy()[:, :, :3].copy()
+                        bitmap.close()
+                    finally:
+                        page.close()
+                    yield index + 1, cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+            finally:
+                pdf.close()
+
+        elif ext in (".tif", ".tiff"):
+            with Image.open(file_path) as tiff:
+                for index, frame in enumerate(ImageSequence.Iterator(tiff)):
+                    rgb = np.array(frame.convert("RGB"))
+                    yield index + 1, cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+
+        else:
+            image = cv2.imread(file_path)
+            if image is None:
+                raise ValueError(f"Could not decode image: {file_path}")
+            yield 1, image
+
+    @staticmethod
+    def segment(image: np.ndarray) -> List[BBox]:
+        """
+        Find question regions on a page
+
+        Text lines are located with a horizontal projection profile. Lines are
+        grouped into one region until a gap of more than WORKSHEET_REGION_GAP_FACTOR
+        times the median line gap is found, or a gap of more than
+        WORKSHEET_REGION_LINE_GAP_FACTOR times the median line height. The
+        absolute limit splits evenly spaced questions, where every gap is the
+        median and the relative rule never fires.
+
+        Args:
+            image: BGR page image
+
+        Returns:
+            Region bounding boxes, top to bottom (the whole page if no split is found)
+        """
+        height, width = image.shape[:2]
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+
+        # Rows with ink; ignore specks below 0.5% of the page width
+        ink_rows = (binary > 0).sum(axis=1) > max(2, width * 0.005)
+
+        lines = []
+        start = None
+        for y, has_ink in enumerate(ink_rows):
+            if has_ink and start is None:
+                start = y
+            elif not has_ink and start is not None:
+                lines.append((start, y))
+                start = None
+        if start is not None:
+            lines.append((start, height))
+
+        if len(lines) < 2:
+            return [(0, 0, width, height)]
+
+        gaps = [lines[i + 1][0] - lines[i][1] for i in range(len(lines) - 1)]
+        line_heights = [end - begin for begin, end in lines]
+        median_line_height = float(np.median(line_heights))
+        split_gap = min(
+            max(float(np.median(gaps)) * settings.WORKSHEET_REGION_GAP_FACTOR, median_line_height * 0.6),
+            median_line_height * settings.WORKSHEET_REGION_LINE_GAP_FACTOR
+        )
+
+        groups = [[lines[0]]]
+        for gap, line in zip(gaps, lines[1:]):
+            if gap > split_gap:
+                groups.append([line])
+            else:
+                groups[-1].append(line)
+
+        regions = []
+        for group in groups:
+            top, bottom = group[0][0], group[-1][1]
+            columns = np.where(binary[top:bottom].any(axis=0))[0]
+            if bottom - top < settings.WORKSHEET_MIN_REGION_HEIGHT or len(columns) == 0:
+                continue
+            pad = max(4, (bottom - top) // 20)
+            x0, x1 = max(0, int(columns[0]) - pad), min(width, int(columns[-1]) + 1 + pad)
+            y0, y1 = max(0, top - pad), min(height, bottom + pad)
+            regions.append((x0, y0, x1 - x0, y1 - y0))
+
+        if not regions or len(regions) > settings.WORKSHEET_MAX_REGIONS_PER_PAGE:
+            # Over-segmented (e.g. widely spaced single question); keep the page whole
+            return [(0, 0, width, height)]
+        return regions
+
+    def split_to_files(
+        self,
+        file_path: str,
+        output_dir: str,
+        written: Optional[List[str]] = None
+    ) -> Iterator[Dict]:
+        """
+        Segment every page and write each region crop as its own image
+
+        Pages are processed lazily; consume with next() to stream page by page.
+
+        Args:
+            file_path: Path to the uploaded worksheet
+            output_dir: Directory for the region images
+            written: Receives each crop path before the file is written, so a
+                caller can clean up crops of a page that was never yielded
+
+        Yields:
+            Per page: {"page_number", "regions": [{"region_index", "bbox", "image_path"}]}
+        """
+        os.makedirs(output_dir, exist_ok=True)
+
+        for page_number, page in self.iter_pages(file_path):
+            regions = []
+            try:
+                for region_index, (x, y, w, h) in enumerate(self.segment(page)):
+                    region_path = str(Path(output_dir) / f"{uuid.uuid4()}.png")
+                    regions.append({
+                        "region_index": region_index,
+                        "bbox": [x, y, w, h],
+                        "image_path": region_path
+                    })
+                    if written is not None:
+                        written.append(region_path)
+                    cv2.imwrite(region_path, page[y:y + h, x:x + w])
+            except Exception:
+                # The caller only learns about crops of pages that were yielded
+                for region in regions:
+                    Path(region["image_path"]).unlink(missing_ok=True)
+                raise
+
+            logger.info(f"Page {page_number} of {file_path}: {len(regions)} regions")
+            yield {"page_number": page_number, "regions": regions}
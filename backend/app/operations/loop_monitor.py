@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop runs a periodic timer
+
+    A task sleeps LOOP_LAG_INTERVAL_MS at a time; anything beyond that is
+    time the loop spent on other work before it could resume the task.
+    Sustained lag means blocking code on the loop (CPU-bound parsing,
+    synchronous I/O) and delays every request in the process. The last
+    LOOP_LAG_WINDOW samples are kept.
+    """
+
+    def __init__(self):
+        self._samples: Deque[float] = deque(maxlen=settings.LOOP_LAG_WINDOW)
+        self._task: Optional[asyncio.Task] = None
+        self._max_ms = 0.0
+
+    async def _run(self) -> None:
+        interval = settings.LOOP_LAG_INTERVAL_MS / 1000
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag_ms = max(0.0, (time.perf_counter() - start - interval) * 1000)
+            self._samples.append(lag_ms)
+            self._max_ms = max(self._max_ms, lag_ms)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Event loop lag monitor started ({settings.LOOP_LAG_INTERVAL_MS:.0f}ms interval)")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict:
+        ordered = sorted(self._samples)
+
+        def pct(p: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 2)
+
+        return {
+            "running": self._task is not None,
+            "interval_ms": settings.LOOP_LAG_INTERVAL_MS,
+            "samples": len(ordered),
+            "current_ms": round(self._samples[-1], 2) if self._samples else None,
+            "p50_ms": pct(0.5),
+            "p99_ms": pct(0.99),
+            "window_max_ms": round(ordered[-1], 2) if ordered else None,
+            "max_ms": round(self._max_ms, 2)
+        }
+
+
+loop_monitor = EventLoopLagMonitor()
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+def _load_pix2text():
+    # Lazy import to avoid loading models at startup
+    # First run will download models (~100MB one-time)
+    from pix2text import Pix2Text
+    return Pix2Text(languages='en')
+
+
+def _load_easyocr():
+    import easyocr
+    return easyocr.Reader(['en'], gpu=False, verbose=False)
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of heavyweight OCR models
+
+    Each model is constructed once per process on first use (or at preload)
+    and shared by every ImageProcessor afterwards. Load time and the RSS
+    growth observed while loading are recorded per model.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """Register a zero-argument loader for a model name"""
+        self._loaders[name] = loader
+
+    def get(self, name: str) -> Any:
+        """
+        Return the shared model instance, loading it on first access
+
+        Args:
+            name: Registered model name (pix2text, easyocr)
+
+        Returns:
+            Loaded model instance
+        """
+        model = self._models.get(name)
+        if model is not None:
+            self._stats[name]["uses"] += 1
+            return model
+
+        with self._lock:
+            if name not in self._models:
+                self._load(name)
+            self._stats[name]["uses"] += 1
+            return self._models[name]
+
+    def _load(self, name: str) -> None:
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+
+        process = psutil.Process(os.getpid())
+        rss_before = process.memory_info().rss
+        started = time.perf_counter()
+
+        logger.info(f"Loading {name} model (first use in process {os.getpid()})...")
+        model = self._loaders[name]()
+
+        load_seconds = time.perf_counter() - started
+        rss_delta = max(0, process.memory_info().rss - rss_before)
+
+        self._models[name] = model
+        self._stats[name] = {
+            "loaded_at": datetime.utcnow(),
+            "load_seconds": round(load_seconds, 3),
+            "memory_mb": round(rss_delta / (1024 * 1024), 1),
+            "uses": 0
+        }
+        logger.info(f"{name} model loaded in {load_seconds:.2f}s (+{rss_delta / (1024 * 1024):.1f} MB RSS)")
+
+    def preload(self, names: Optional[Iterable[str]] = None) -> None:
+        """Load the given models (all registered models by default), logging failures"""
+        for name in names or list(self._loaders):
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.warning(f"Preloading {name} failed: {str(e)}")
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def stats(self) -> Dict:
+        """Per-model load statistics for this process"""
+        return {
+            "pid": os.getpid(),
+            "rss_mb": round(psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024), 1),
+            "models": {
+                name: {"loaded": name in self._models, **self._stats.get(name, {})}
+                for name in self._loaders
+            }
+        }
+
+
+model_registry = ModelRegistry()
+model_registry.register("pix2text", _load_pix2text)
+model_registry.register("easyocr", _load_easyocr)
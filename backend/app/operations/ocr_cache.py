@@ -0,0 +1,254 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# dHash grid: 16x16 horizontal gradients -> 256-bit hash, split into 16 bands of 16 bits.
+# Two hashes within distance < PHASH_BANDS share at least one band (pigeonhole),
+# so candidates can be found with an indexed equality query.
+PHASH_GRID = 16
+PHASH_BANDS = 16
+PHASH_BAND_BITS = (PHASH_GRID * PHASH_GRID) // PHASH_BANDS
+
+# Near-duplicate verification: binarised ink mask at this long side, compared in tiles
+INK_MASK_LONG_SIDE = 768
+INK_MASK_TILE = 32
+
+
+class OCRCache:
+    """
+    Content-addressed cache of OCR results in the `ocr_cache` collection
+
+    Lookups go by SHA-256 of the uploaded bytes first. With
+    OCR_CACHE_NEAR_DUPLICATES (off by default), a perceptual hash (dHash)
+    then finds near-duplicates such as a re-encoded upload. The dHash can't
+    tell "3x+2=11" from "4x+2=14", so a candidate is only served after its
+    stored ink mask matches the upload pixel by pixel (see verify_ink_masks).
+    Entries
+    expire OCR_CACHE_TTL_SECONDS after their last use (Mongo TTL index) and
+    the least recently used entries are evicted beyond OCR_CACHE_MAX_ENTRIES.
+    """
+
+    def __init__(self):
+        self._counters = {"exact_hits": 0, "near_hits": 0, "near_rejected": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """SHA-256 of the file contents"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def perceptual_hash(image_path: str) -> Optional[str]:
+        """
+        256-bit difference hash of the image as a hex string
+
+        Robust to re-encoding, small exposure changes and mild resizing.
+        Returns None if the image cannot be decoded.
+        """
+        # Reduced decode: the hash only needs a tiny thumbnail
+        gray = cv2.imread(image_path, cv2.IMREAD_REDUCED_GRAYSCALE_4)
+        if gray is None:
+            return None
+
+        small = cv2.resize(gray, (PHASH_GRID + 1, PHASH_GRID), interpolation=cv2.INTER_AREA)
+        bits = (small[:, 1:] > small[:, :-1]).flatten()
+        value = int("".join("1" if b else "0" for b in bits), 2)
+        return f"{value:0{PHASH_GRID * PHASH_GRID // 4}x}"
+
+    @staticmethod
+    def ink_mask(image_path: str) -> Optional[bytes]:
+        """
+        Binarised (Otsu) image at INK_MASK_LONG_SIDE as a bilevel PNG, a few KB
+
+        Returns None if the image cannot be decoded.
+        """
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            return None
+        height, width = gray.shape
+        scale = INK_MASK_LONG_SIDE / max(height, width)
+        gray = cv2.resize(gray, (max(1, round(width * scale)), max(1, round(height * scale))), interpolation=cv2.INTER_AREA)
+        _, mask = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        ok, png = cv2.imencode(".png", mask, [cv2.IMWRITE_PNG_BILEVEL, 1])
+        return png.tobytes() if ok else None
+
+    @staticmethod
+    def verify_ink_masks(a: bytes, b: bytes) -> bool:
+        """
+        Whether two ink masks show the same content
+
+        The second mask is aligned to the first (phase correlation, so a
+        shifted re-capture still matches). Ink with no ink within a pixel
+        in the other mask counts as a mismatch. Any INK_MASK_TILE tile with
+        more than OCR_CACHE_VERIFY_MAX_PIXELS mismatches (a changed digit)
+        rejects the pair.
+        """
+        mask_a = cv2.imdecode(np.frombuffer(a, np.uint8), cv2.IMREAD_GRAYSCALE)
+        mask_b = cv2.imdecode(np.frombuffer(b, np.uint8), cv2.IMREAD_GRAYSCALE)
+        if mask_a is None or mask_b is None or abs(mask_a.shape[0] - mask_b.shape[0]) > 2 or abs(mask_a.shape[1] - mask_b.shape[1]) > 2:
+            return False
+        mask_b = cv2.resize(mask_b, (mask_a.shape[1], mask_a.shape[0]), interpolation=cv2.INTER_NEAREST)
+
+        (dx, dy), _ = cv2.phaseCorrelate(mask_a.astype(np.float32), mask_b.astype(np.float32))
+        shift = np.float32([[1, 0, -dx], [0, 1, -dy]])
+        mask_b = cv2.warpAffine(mask_b, shift, (mask_b.shape[1], mask_b.shape[0]), flags=cv2.INTER_NEAREST)
+
+        kernel = np.ones((3, 3), np.uint8)
+        mismatch = ((mask_a > 0) & (cv2.dilate(mask_b, kernel) == 0)) | ((mask_b > 0) & (cv2.dilate(mask_a, kernel) == 0))
+        height, width = mismatch.shape
+        return all(
+            mismatch[y:y + INK_MASK_TILE, x:x + INK_MASK_TILE].sum() <= settings.OCR_CACHE_VERIFY_MAX_PIXELS
+            for y in range(0, height, INK_MASK_TILE)
+            for x in range(0, width, INK_MASK_TILE)
+        )
+
+    def fingerprint(self, image_path: str) -> Dict:
+        """Perceptual hash and ink mask of an upload (blocking: run in a thread)"""
+        return {"phash": self.perceptual_hash(image_path), "ink_mask": self.ink_mask(image_path)}
+
+    @staticmethod
+    def _bands(phash: str) -> List[str]:
+        chars_per_band = PHASH_BAND_BITS // 4
+        return [
+            f"{i}:{phash[i * chars_per_band:(i + 1) * chars_per_band]}"
+            for i in range(PHASH_BANDS)
+        ]
+
+    @staticmethod
+    def _distance(a: str, b: str) -> int:
+        return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+    async def ensure_indexes(self, db) -> None:
+        await db.ocr_cache.create_index([("sha256", 1), ("language_code", 1)], unique=True)
+        await db.ocr_cache.create_index([("phash_bands", 1), ("language_code", 1)])
+        await db.ocr_cache.create_index("last_used_at", expireAfterSeconds=settings.OCR_CACHE_TTL_SECONDS)
+
+    async def lookup(
+        self,
+        db,
+        sha256: str,
+        language_code: str,
+        image_path: str,
+        near_duplicates: bool = True
+    ) -> Tuple[Optional[Dict], Dict]:
+        """
+        Find a cached OCR result
+
+        The fingerprint (perceptual hash and ink mask) is only computed (off
+        the event loop) when the exact lookup misses and near-duplicates are
+        enabled.
+
+        Args:
+            db: Database instance
+            sha256: SHA-256 of the uploaded bytes
+            language_code: Tesseract language code the OCR ran with
+            image_path: Path to the uploaded image, used for the fingerprint
+            near_duplicates: Allow the near-duplicate tier (off for worksheet regions)
+
+        Returns:
+            Tuple of (cache entry with extracted_text and subject or None,
+            fingerprint to pass to store(); empty when not computed)
+        """
+        now = datetime.utcnow()
+        entry = await db.ocr_cache.find_one_and_update(
+            {"sha256": sha256, "language_code": language_code},
+            {"$set": {"last_used_at": now}, "$inc": {"hits": 1}}
+        )
+        if entry:
+            self._counters["exact_hits"] += 1
+            return entry, {"phash": entry.get("phash"), "ink_mask": entry.get("ink_mask")}
+
+        if not (near_duplicates and settings.OCR_CACHE_NEAR_DUPLICATES):
+            self._counters["misses"] += 1
+            return None, {}
+
+        fingerprint = await asyncio.to_thread(self.fingerprint, image_path)
+        phash, ink_mask = fingerprint["phash"], fingerprint["ink_mask"]
+
+        if phash and ink_mask:
+            candidates = await db.ocr_cache.find(
+                {"phash_bands": {"$in": self._bands(phash)}, "language_code": language_code},
+                {"phash": 1, "ink_mask": 1, "extracted_text": 1, "subject": 1}
+            ).limit(50).to_list(length=50)
+
+            close = sorted(
+                (c for c in candidates if c.get("ink_mask") and self._distance(phash, c["phash"]) <= settings.OCR_CACHE_PHASH_MAX_DISTANCE),
+                key=lambda c: self._distance(phash, c["phash"])
+            )
+            for candidate in close[:3]:
+                if not await asyncio.to_thread(self.verify_ink_masks, ink_mask, candidate["ink_mask"]):
+                    self._counters["near_rejected"] += 1
+                    continue
+                await db.ocr_cache.update_one(
+                    {"_id": candidate["_id"]},
+                    {"$set": {"last_used_at": now}, "$inc": {"hits": 1}}
+                )
+                self._counters["near_hits"] += 1
+                return candidate, fingerprint
+
+        self._counters["misses"] += 1
+        return None, fingerprint
+
+    async def store(
+        self,
+        db,
+        sha256: str,
+        language_code: str,
+        fingerprint: Dict,
+        extracted_text: str,
+        subject: str
+    ) -> None:
+        """
+        Cache an OCR result and evict the least recently used entries if over capacity
+
+        Entries stored without a fingerprint (worksheet regions) are only
+        reachable by exact match.
+        """
+        now = datetime.utcnow()
+        phash = fingerprint.get("phash")
+        await db.ocr_cache.update_one(
+            {"sha256": sha256, "language_code": language_code},
+            {
+                "$set": {
+                    "phash": phash,
+                    "phash_bands": self._bands(phash) if phash else [],
+                    "ink_mask": fingerprint.get("ink_mask"),
+                    "extracted_text": extracted_text,
+                    "subject": subject,
+                    "last_used_at": now
+                },
+                "$setOnInsert": {"created_at": now, "hits": 0}
+            },
+            upsert=True
+        )
+        self._counters["stores"] += 1
+
+        excess = await db.ocr_cache.estimated_document_count() - settings.OCR_CACHE_MAX_ENTRIES
+        if excess > 0:
+            oldest = await db.ocr_cache.find({}, {"_id": 1}) \
+                .sort("last_used_at", 1) \
+                .limit(excess) \
+                .to_list(length=excess)
+            result = await db.ocr_cache.delete_many({"_id": {"$in": [e["_id"] for e in oldest]}})
+            self._counters["evictions"] += result.deleted_count
+
+    def stats(self) -> Dict:
+        lookups = self._counters["exact_hits"] + self._counters["near_hits"] + self._counters["misses"]
+        hits = self._counters["exact_hits"] + self._counters["near_hits"]
+        return {
+            **self._counters,
+            "hit_rate": round(hits / lookups, 3) if lookups else None
+        }
+
+
+ocr_cache = OCRCache()
@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+from app.operations.ocr_router import ocr_route_stats
+
+logger = logging.getLogger(__name__)
+
+# Per-process ImageProcessor, created once by the pool initializer so that
+# OCR models stay loaded between jobs handled by the same worker
+_worker_processor = None
+
+
+def _init_worker(preload_models: bool) -> None:
+    """Pool initializer: build the worker's ImageProcessor (and optionally warm its models)"""
+    global _worker_processor
+    from app.operations.image_processor import ImageProcessor
+
+    _worker_processor = ImageProcessor()
+    if preload_models:
+        try:
+            _worker_processor.preload_models()
+        except Exception as e:
+            logger.warning(f"OCR worker model preload failed: {str(e)}")
+
+
+def _run_ocr_job(image_path: str, language_code: str, route_stats: Optional[Dict]) -> Dict:
+    """Executed inside a worker process"""
+    if route_stats is None:
+        text = _worker_processor.extract_text_with_ocr_fallback(image_path, language_code)
+        return {"text": text, "engine": None, "route": None, "tried": [], "compared": False, "winners": []}
+    return _worker_processor.extract_text_routed(image_path, language_code, route_stats)
+
+
+def _run_ocr_batch(jobs: List[Tuple[str, str]], route_stats: Optional[Dict]) -> List[Dict]:
+    """Executed inside a worker process: OCR several images, batching EasyOCR inference"""
+    if route_stats is None or len(jobs) == 1:
+        return [_run_ocr_job(image_path, language_code, route_stats) for image_path, language_code in jobs]
+    return _worker_processor.extract_text_routed_batch(jobs, route_stats)
+
+
+def _ping() -> bool:
+    """No-op job used to spawn and warm the worker processes"""
+    return True
+
+
+def _worker_model_stats() -> Dict:
+    """Executed inside a worker process"""
+    from app.operations.model_registry import model_registry
+    return model_registry.stats()
+
+
+class OCRQueueFullError(Exception):
+    """Raised when the OCR queue is at capacity"""
+
+
+class OCRTimeoutError(Exception):
+    """Raised when an OCR job exceeds its time budget"""
+
+
+class OCRPoolShutdownError(Exception):
+    """Raised for jobs still queued or running when the pool shuts down"""
+
+
+class OCRWorkerPool:
+    """
+    Runs the OCR cascade in a dedicated process pool so that Pix2Text, EasyOCR
+    and Tesseract never block the FastAPI event loop.
+
+    - Worker processes keep a warm ImageProcessor between jobs
+    - At most `max_workers + max_queue` jobs are admitted; further uploads are rejected
+    - Each job is awaited with a timeout
+    - A job goes to an idle worker at once, so concurrent uploads run in
+      parallel. Jobs only queue while every worker is busy; when a worker
+      frees up, the queue is split across the idle workers, up to
+      EASYOCR_BATCH_SIZE jobs each, so EasyOCR can run each share as a batch
+    """
+
+    def __init__(
+        self,
+        max_workers: int = settings.OCR_POOL_WORKERS,
+        max_queue: int = settings.OCR_POOL_MAX_QUEUE,
+        job_timeout: float = settings.OCR_JOB_TIMEOUT_SECONDS,
+        preload_models: bool = settings.OCR_PRELOAD_MODELS,
+        batch_size: int = settings.EASYOCR_BATCH_SIZE
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.job_timeout = job_timeout
+        self.preload_models = preload_models
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.batch_size = max(1, batch_size)
+        self._pending = 0
+        self._busy_workers = 0
+        self._queue: List[Tuple[Tuple[str, str], asyncio.Future]] = []
+        self._dispatch_scheduled = False
+        self._counters = {"completed": 0, "failed": 0, "timed_out": 0, "rejected": 0, "batches": 0, "batched_jobs": 0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn keeps workers independent of the event loop and Mongo client threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.preload_models,)
+            )
+        return self._executor
+
+    async def start(self) -> None:
+        """Spawn all worker processes up front so the first uploads don't pay start-up cost"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*[
+            loop.run_in_executor(executor, _ping) for _ in range(self.max_workers)
+        ])
+        logger.info(f"OCR worker pool started with {self.max_workers} workers")
+
+    def shutdown(self) -> None:
+        queued, self._queue = self._queue, []
+        self._pending -= len(queued)
+        for _, waiter in queued:
+            if not waiter.done():
+                waiter.set_exception(OCRPoolShutdownError("OCR worker pool shut down"))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("OCR worker pool shut down")
+
+    def _dispatch(self) -> None:
+        """Split the queued jobs across the idle workers, one batch each"""
+        self._dispatch_scheduled = False
+        # Shares are sized for all workers, busy ones included: one big batch on
+        # the first free worker would leave the others idle at the tail
+        share = min(self.batch_size, math.ceil(len(self._queue) / self.max_workers))
+        while self._queue and self._busy_workers < self.max_workers:
+            batch, self._queue = self._queue[:share], self._queue[share:]
+            self._submit(batch)
+
+    def _submit(self, batch: List[Tuple[Tuple[str, str], asyncio.Future]]) -> None:
+        """Send jobs to one worker"""
+        jobs = [job for job, _ in batch]
+        waiters = [waiter for _, waiter in batch]
+        route_stats = ocr_route_stats.snapshot() if settings.OCR_ROUTING_ENABLED else None
+
+        try:
+            future = self._get_executor().submit(_run_ocr_batch, jobs, route_stats)
+        except BrokenProcessPool:
+            logger.error("OCR worker pool is broken, recreating it")
+            self._executor = None
+            future = self._get_executor().submit(_run_ocr_batch, jobs, route_stats)
+
+        self._busy_workers += 1
+        self._counters["batches"] += 1
+        self._counters["batched_jobs"] += len(jobs)
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda f: loop.call_soon_threadsafe(self._resolve, f, waiters))
+
+    def _resolve(self, future, waiters: List[asyncio.Future]) -> None:
+        """Hand each caller its result; slots are held until the worker actually finishes"""
+        self._pending -= len(waiters)
+        self._busy_workers -= 1
+        if future.cancelled():
+            # shutdown(cancel_futures=True) dropped the batch before it ran
+            error = OCRPoolShutdownError("OCR worker pool shut down")
+        else:
+            error = future.exception()
+        if isinstance(error, BrokenProcessPool):
+            self._executor = None
+        results = None if error else future.result()
+        for i, waiter in enumerate(waiters):
+            if waiter.done():
+                continue
+            if error:
+                waiter.set_exception(error)
+            else:
+                waiter.set_result(results[i])
+
+        # The worker is free: give it what queued up meanwhile
+        self._dispatch()
+
+    async def run_ocr(self, image_path: str, language_code: str) -> Dict:
+        """
+        Run OCR for an image in the worker pool
+
+        Uses adaptive engine routing (OCR_ROUTING_ENABLED) or the fixed
+        Pix2Text -> EasyOCR -> Tesseract fallback chain.
+
+        Args:
+            image_path: Path to image file
+            language_code: Tesseract language code (eng, tam, hin)
+
+        Returns:
+            Dict with text, engine, route, tried, compared and winners (see ImageProcessor.extract_text_routed)
+
+        Raises:
+            OCRQueueFullError: If the queue is already at capacity
+            OCRTimeoutError: If the job did not finish within job_timeout
+        """
+        if self._pending >= self.max_workers + self.max_queue:
+            self._counters["rejected"] += 1
+            raise OCRQueueFullError("OCR queue is full, please retry shortly")
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._queue.append(((image_path, language_code), waiter))
+        self._pending += 1
+        if not self._dispatch_scheduled:
+            # Next loop iteration: uploads arriving together are split across workers together
+            self._dispatch_scheduled = True
+            loop.call_soon(self._dispatch)
+
+        try:
+            # shield: a timed-out caller must not cancel the result for the rest of its batch
+            result = await asyncio.wait_for(asyncio.shield(waiter), timeout=self.job_timeout)
+        except asyncio.TimeoutError:
+            self._counters["timed_out"] += 1
+            logger.error(f"OCR job timed out after {self.job_timeout}s for {image_path}")
+            raise OCRTimeoutError(f"OCR timed out after {self.job_timeout} seconds")
+        except Exception:
+            self._counters["failed"] += 1
+            raise
+
+        self._counters["completed"] += 1
+        return result
+
+    async def model_stats(self) -> List[Dict]:
+        """
+        Model load statistics reported by the worker processes
+
+        Jobs are not pinned to workers, so this samples one job per worker and
+        de-duplicates by pid; a busy worker may be missing from the result.
+        """
+        if self._executor is None:
+            return []
+        loop = asyncio.get_running_loop()
+        reports = await asyncio.gather(*[
+            loop.run_in_executor(self._executor, _worker_model_stats)
+            for _ in range(self.max_workers)
+        ], return_exceptions=True)
+        by_pid = {r["pid"]: r for r in reports if isinstance(r, dict)}
+        return list(by_pid.values())
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "job_timeout_seconds": self.job_timeout,
+            "batch_size": self.batch_size,
+            "in_flight": self._pending,
+            "busy_workers": self._busy_workers,
+            "queued": len(self._queue),
+            **self._counters,
+            "avg_batch_size": round(
+                self._counters["batched_jobs"] / self._counters["batches"], 2
+            ) if self._counters["batches"] else None
+        }
+
+
+ocr_pool = OCRWorkerPool()
@@ -0,0 +1,245 @@
+import difflib
+import logging
+import random
+from typing import Dict, List, Optional
+import cv2
+import numpy as np
+from app.config import settings
+from app.operations.image_context import ImageContext
+
+logger = logging.getLogger(__name__)
+
+# Feature thresholds for the route buckets
+MATH_BAR_RATIO_THRESHOLD = 0.05
+HANDWRITING_HEIGHT_CV_THRESHOLD = 0.5
+
+# Comparison runs: agreement scores closer than this are a tie, and tied
+# engines share the win only if their texts are at least this similar
+AGREEMENT_TIE_MARGIN = 0.02
+AGREEMENT_MIN_SIMILARITY = 0.9
+
+# Rule-based engine order per bucket, used until a route has enough history
+DEFAULT_ORDERS = {
+    "math": ["pix2text", "easyocr", "tesseract"],
+    "hand": ["easyocr", "pix2text", "tesseract"],
+    "print": ["tesseract", "pix2text", "easyocr"]
+}
+
+
+class OCRRouter:
+    """
+    Cheap pre-classifier that picks the OCR engine order for an image
+
+    Images are bucketed by script (Tesseract language code), math density and
+    handwriting versus print. Each bucket ("route") starts from a rule-based
+    engine order and switches to the order given by recorded win rates once
+    it has OCR_ROUTING_MIN_SAMPLES results.
+
+    Win rates come only from comparison runs, where every engine of the route
+    reads the same image and the ones agreeing most with the others win.
+    Ordinary runs stop at the first engine with enough text, so crediting
+    them would only reinforce whichever engine already leads.
+    """
+
+    @staticmethod
+    def extract_features(context: ImageContext) -> Dict:
+        """
+        Measure glyph statistics on a small proxy of the image
+
+        Returns:
+            Dict with math_bar_ratio (share of glyphs that are short horizontal
+            bars such as '=', '-' or fraction lines), height_cv (variation of
+            glyph heights, high for handwriting) and glyph_count
+        """
+        gray = context.gray
+        proxy_scale = min(1.0, 800 / max(gray.shape[:2]))
+        if proxy_scale < 1.0:
+            gray = cv2.resize(gray, None, fx=proxy_scale, fy=proxy_scale, interpolation=cv2.INTER_AREA)
+
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+
+        heights = stats[1:count, cv2.CC_STAT_HEIGHT].astype(float)
+        widths = stats[1:count, cv2.CC_STAT_WIDTH].astype(float)
+        glyphs = (heights >= 2) & (heights <= gray.shape[0] * 0.2) & (widths <= gray.shape[1] * 0.2)
+        heights, widths = heights[glyphs], widths[glyphs]
+
+        if len(heights) < 10:
+            return {"math_bar_ratio": 0.0, "height_cv": 0.0, "glyph_count": int(len(heights))}
+
+        median_height = float(np.median(heights))
+        tall = heights >= median_height * 0.5
+        bars = (widths >= heights * 2.5) & (heights <= median_height * 0.4)
+
+        return {
+            "math_bar_ratio": round(float(bars.sum()) / len(heights), 3),
+            "height_cv": round(float(np.std(heights[tall]) / np.mean(heights[tall])), 3) if tall.any() else 0.0,
+            "glyph_count": int(len(heights))
+        }
+
+    @staticmethod
+    def route_key(language_code: str, features: Dict) -> str:
+        """Bucket name such as 'eng|math', 'eng|hand', 'tam|print'"""
+        if language_code != "eng":
+            # Pix2Text and the EasyOCR reader are English-only, style doesn't matter
+            return f"{language_code}|print"
+        if features["math_bar_ratio"] >= MATH_BAR_RATIO_THRESHOLD:
+            return f"{language_code}|math"
+        if features["height_cv"] >= HANDWRITING_HEIGHT_CV_THRESHOLD:
+            return f"{language_code}|hand"
+        return f"{language_code}|print"
+
+    @staticmethod
+    def engine_order(route_key: str, route_stats: Optional[Dict] = None) -> List[str]:
+        """
+        Engine order for a route
+
+        Args:
+            route_key: Bucket from route_key()
+            route_stats: {engine: {"attempts": n, "wins": n}} recorded for this route
+
+        Returns:
+            Engines to try, most promising first
+        """
+        language_code, bucket = route_key.split("|")
+        if language_code != "eng":
+            return ["tesseract"]
+
+        default = DEFAULT_ORDERS[bucket]
+        route_stats = route_stats or {}
+        attempts = sum(s.get("attempts", 0) for s in route_stats.values())
+        if attempts < settings.OCR_ROUTING_MIN_SAMPLES:
+            return list(default)
+
+        # Laplace-smoothed win rate; the rule order breaks ties
+        def win_rate(engine: str) -> float:
+            s = route_stats.get(engine, {})
+            return (s.get("wins", 0) + 1) / (s.get("attempts", 0) + 2)
+
+        return sorted(default, key=lambda e: (-win_rate(e), default.index(e)))
+
+    @staticmethod
+    def should_compare(route_key: str, route_stats: Optional[Dict] = None) -> bool:
+        """
+        Whether to run every engine of the route on this image
+
+        Always true until the route has OCR_ROUTING_MIN_SAMPLES comparison
+        runs, then true for an OCR_ROUTING_EXPLORATION share of images so the
+        win rates keep being measured. Single-engine routes never compare.
+        """
+        if len(OCRRouter.engine_order(route_key, route_stats)) < 2:
+            return False
+        attempts = sum(s.get("attempts", 0) for s in (route_stats or {}).values())
+        if attempts < settings.OCR_ROUTING_MIN_SAMPLES:
+            return True
+        return random.random() < settings.OCR_ROUTING_EXPLORATION
+
+    @staticmethod
+    def pick_winners(results: Dict[str, str], min_chars: int) -> List[str]:
+        """
+        Best engines of a comparison run by agreement with the other engines
+
+        Each engine with at least min_chars characters is scored by its mean
+        similarity to the other engines' texts; an engine misreading the image
+        disagrees with the rest. Engines tied for the best score all win if
+        their texts agree with each other, and none wins if they don't. If
+        only one engine produced enough text it wins outright.
+
+        Args:
+            results: {engine: extracted text} for every engine that ran
+            min_chars: Minimum length for an extraction to be a candidate
+
+        Returns:
+            Winning engines (empty if nothing qualified or there is no clear winner)
+        """
+        if len(results) < 2:
+            return []
+        normalized = {engine: " ".join(text.lower().split()) for engine, text in results.items()}
+        candidates = [engine for engine, text in normalized.items() if len(text) >= min_chars]
+        if len(candidates) < 2:
+            return candidates
+
+        def similarity(a: str, b: str) -> float:
+            # SequenceMatcher is order-sensitive; compare each pair the same way round
+            first, second = sorted((normalized[a], normalized[b]))
+            return difflib.SequenceMatcher(None, first, second, autojunk=False).ratio()
+
+        scores = {
+            engine: sum(similarity(engine, other) for other in normalized if other != engine) / (len(normalized) - 1)
+            for engine in candidates
+        }
+        best = max(scores.values())
+        top = [engine for engine in candidates if best - scores[engine] < AGREEMENT_TIE_MARGIN]
+        if any(similarity(a, b) < AGREEMENT_MIN_SIMILARITY for a in top for b in top if a < b):
+            return []
+        return top
+
+
+class OCRRouteStats:
+    """
+    Per-route engine win rates, persisted in the `ocr_route_stats` collection
+
+    Lives in the API process; a snapshot is sent with every OCR job so the
+    worker processes can route without database access.
+    """
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+    async def load(self, db) -> None:
+        """Load recorded win rates (called at startup)"""
+        docs = await db.ocr_route_stats.find().to_list(length=None)
+        self._routes = {
+            doc["_id"]: {
+                engine: {"attempts": s.get("attempts", 0), "wins": s.get("wins", 0)}
+                for engine, s in doc.get("engines", {}).items()
+            }
+            for doc in docs
+        }
+        logger.info(f"Loaded OCR routing history for {len(self._routes)} routes")
+
+    def snapshot(self) -> Dict:
+        return {route: {e: dict(s) for e, s in engines.items()} for route, engines in self._routes.items()}
+
+    async def record(self, db, route_key: str, tried: List[str], winners: List[str]) -> None:
+        """
+        Record the outcome of one comparison run (see OCRRouter.should_compare)
+
+        Args:
+            db: Database instance
+            route_key: Route the image was assigned to
+            tried: Engines that were run on the image
+            winners: Engines from OCRRouter.pick_winners
+        """
+        if len(tried) < 2:
+            # One engine alone says nothing about which engine is better
+            return
+
+        increments = {}
+        engines = self._routes.setdefault(route_key, {})
+        for engine in tried:
+            stats = engines.setdefault(engine, {"attempts": 0, "wins": 0})
+            stats["attempts"] += 1
+            increments[f"engines.{engine}.attempts"] = 1
+            if engine in winners:
+                stats["wins"] += 1
+                increments[f"engines.{engine}.wins"] = 1
+
+        if increments:
+            await db.ocr_route_stats.update_one({"_id": route_key}, {"$inc": increments}, upsert=True)
+
+    def stats(self) -> Dict:
+        """Win rates per route and engine"""
+        return {
+            route: {
+                engine: {
+                    **s,
+                    "win_rate": round(s["wins"] / s["attempts"], 3) if s["attempts"] else None
+                }
+                for engine, s in engines.items()
+            }
+            for route, engines in self._routes.items()
+        }
+
+
+ocr_route_stats = OCRRouteStats()
@@ -0,0 +1,279 @@
+import hashlib
+import logging
+import re
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from pymongo import ReturnDocument
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Feedback issues that mean the cached solution must not be served again
+INVALIDATING_ISSUES = {"incorrect_answer", "language_error"}
+
+# Numbers and operators of a normalised question; a similar question must repeat them exactly
+MATH_TOKEN_PATTERN = re.compile(r"\d+(?:[.,]\d+)*|[+\-×÷*/=<>^%√]")
+
+
+class SolutionVectorIndex:
+    """
+    In-memory cosine-similarity index of question embeddings, one per output language
+
+    Rebuilt from the `solution_cache` collection at startup; small enough
+    (one float32 vector per cached question) to search with a single matrix product.
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, List[str]] = {}
+        self._vectors: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def _unit(vector: List[float]) -> np.ndarray:
+        v = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        return v / norm if norm else v
+
+    def add(self, output_language: str, key: str, vector: List[float]) -> None:
+        self.remove(output_language, key)
+        keys = self._keys.setdefault(output_language, [])
+        row = self._unit(vector)[np.newaxis, :]
+        matrix = self._vectors.get(output_language)
+        self._vectors[output_language] = row if matrix is None else np.vstack([matrix, row])
+        keys.append(key)
+
+    def remove(self, output_language: str, key: str) -> None:
+        keys = self._keys.get(output_language, [])
+        if key in keys:
+            index = keys.index(key)
+            keys.pop(index)
+            self._vectors[output_language] = np.delete(self._vectors[output_language], index, axis=0)
+
+    def search(self, output_language: str, vector: List[float]) -> Tuple[Optional[str], float]:
+        """Most similar cached question: (key, cosine similarity)"""
+        matrix = self._vectors.get(output_language)
+        if matrix is None or len(matrix) == 0:
+            return None, 0.0
+        scores = matrix @ self._unit(vector)
+        best = int(np.argmax(scores))
+        return self._keys[output_language][best], float(scores[best])
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._keys.values())
+
+
+class SolutionCache:
+    """
+    Cache of generated solutions in the `solution_cache` collection
+
+    Keyed on the normalised question text and output language, so repeated
+    textbook questions skip the LLM. With SOLUTION_CACHE_EMBEDDINGS enabled,
+    questions that miss the exact key are matched by embedding similarity,
+    but only if they have the same numbers and operators: "area of a 4 by 5
+    rectangle" and "area of a 4 by 6 rectangle" embed almost identically.
+
+    Entries expire SOLUTION_CACHE_TTL_SECONDS after admission (Mongo TTL index
+    on expires_at). Good feedback extends the lifetime to
+    SOLUTION_CACHE_TRUSTED_TTL_SECONDS. Poor ratings or an incorrect-answer
+    report invalidate the entry, so the next request regenerates it.
+    """
+
+    def __init__(self):
+        self.index = SolutionVectorIndex()
+        self._counters = {
+            "exact_hits": 0, "semantic_hits": 0, "semantic_rejected": 0, "misses": 0, "stores": 0, "invalidations": 0
+        }
+
+    @staticmethod
+    def normalize_question(text: str) -> str:
+        """Case-fold, unify Unicode forms and collapse whitespace and trailing punctuation"""
+        text = unicodedata.normalize("NFKC", text or "").casefold()
+        text = re.sub(r"\s+", " ", text).strip()
+        # Spacing around operators and a trailing '?' or '.' don't change the question
+        text = re.sub(r"\s*([+\-×÷*/=<>()])\s*", r"\1", text)
+        return text.rstrip(" ?.!।")
+
+    def math_tokens(self, question: str) -> List[str]:
+        """Numbers and operators of a question, in order"""
+        return MATH_TOKEN_PATTERN.findall(self.normalize_question(question))
+
+    def question_key(self, question: str, output_language: str) -> str:
+        normalized = self.normalize_question(question)
+        return hashlib.sha256(f"{output_language}\n{normalized}".encode("utf-8")).hexdigest()
+
+    async def ensure_indexes(self, db) -> None:
+        await db.solution_cache.create_index("key", unique=True)
+        await db.solution_cache.create_index("expires_at", expireAfterSeconds=0)
+
+    async def load_index(self, db) -> None:
+        """Rebuild the embedding index from cached entries (called at startup)"""
+        if not settings.SOLUTION_CACHE_EMBEDDINGS:
+            return
+        cursor = db.solution_cache.find(
+            {"embedding": {"$ne": None}},
+            {"key": 1, "output_language": 1, "embedding": 1}
+        )
+        async for entry in cursor:
+            self.index.add(entry["output_language"], entry["key"], entry["embedding"])
+        logger.info(f"Loaded {len(self.index)} solution embeddings")
+
+    @staticmethod
+    def _hit_update() -> Dict:
+        return {"$set": {"last_used_at": datetime.utcnow()}, "$inc": {"hits": 1}}
+
+    async def lookup_exact(self, db, key: str) -> Optional[Dict]:
+        """
+        Find a cached solution by question key
+
+        Args:
+            db: Database instance
+            key: question_key() of the question
+
+        Returns:
+            Cache entry with solution_steps, final_answer and concepts_covered, or None
+        """
+        entry = await db.solution_cache.find_one_and_update({"key": key}, self._hit_update())
+        if entry:
+            self._counters["exact_hits"] += 1
+        return entry
+
+    async def lookup_similar(
+        self,
+        db,
+        question: str,
+        output_language: str,
+        embedding: Optional[List[float]]
+    ) -> Optional[Dict]:
+        """
+        Find a cached solution for a similar question (call after lookup_exact missed)
+
+        The most similar cached question is served only if it reaches
+        SOLUTION_CACHE_SIMILARITY_THRESHOLD and has the same numbers and
+        operators as the question.
+
+        Args:
+            db: Database instance
+            question: Question text
+            output_language: Language of the solution
+            embedding: Question embedding (None counts as a miss)
+
+        Returns:
+            Cache entry, or None
+        """
+        if embedding is not None:
+            similar_key, similarity = self.index.search(output_language, embedding)
+            if similar_key and similarity >= settings.SOLUTION_CACHE_SIMILARITY_THRESHOLD:
+                entry = await db.solution_cache.find_one({"key": similar_key}, {"question": 1})
+                if entry is None:
+                    # Expired by the TTL index since startup
+                    self.index.remove(output_language, similar_key)
+                elif self.math_tokens(entry["question"]) != self.math_tokens(question):
+                    self._counters["semantic_rejected"] += 1
+                else:
+                    entry = await db.solution_cache.find_one_and_update({"key": similar_key}, self._hit_update())
+                    if entry:
+                        self._counters["semantic_hits"] += 1
+                        return entry
+
+        self._counters["misses"] += 1
+        return None
+
+    async def store(
+        self,
+        db,
+        key: str,
+        question: str,
+        subject: str,
+        output_language: str,
+        solution_data: Dict,
+        embedding: Optional[List[float]] = None
+    ) -> None:
+        """
+        Admit a freshly generated solution on a probationary TTL
+
+        Storing over an existing entry refreshes its content but keeps its
+        ratings and current expiry, so a trusted entry is not put back on
+        probation.
+        """
+        if not solution_data.get("solution_steps") or not solution_data.get("final_answer"):
+            return
+
+        now = datetime.utcnow()
+        await db.solution_cache.update_one(
+            {"key": key},
+            {
+                "$set": {
+                    "question": question,
+                    "subject": subject,
+                    "output_language": output_language,
+                    "solution_steps": solution_data["solution_steps"],
+                    "final_answer": solution_data["final_answer"],
+                    "concepts_covered": solution_data.get("concepts_covered", []),
+                    "embedding": embedding,
+                    "last_used_at": now
+                },
+                "$setOnInsert": {
+                    "created_at": now,
+                    "hits": 0,
+                    "rating_sum": 0,
+                    "rating_count": 0,
+                    "expires_at": now + timedelta(seconds=settings.SOLUTION_CACHE_TTL_SECONDS)
+                }
+            },
+            upsert=True
+        )
+        if embedding is not None:
+            self.index.add(output_language, key, embedding)
+        self._counters["stores"] += 1
+
+    async def record_feedback(
+        self,
+        db,
+        key: str,
+        rating: int,
+        was_helpful: bool,
+        issues: Optional[List[str]]
+    ) -> None:
+        """
+        Apply a feedback rating to the cache entry a solution was served from
+
+        Invalidates on an incorrect-answer/language report or a low average
+        rating; extends the TTL once the average rating is high enough.
+        """
+        entry = await db.solution_cache.find_one_and_update(
+            {"key": key},
+            {"$inc": {"rating_sum": rating, "rating_count": 1}},
+            return_document=ReturnDocument.AFTER
+        )
+        if not entry:
+            return
+
+        average = entry["rating_sum"] / entry["rating_count"]
+        reported = bool(set(issues or []) & INVALIDATING_ISSUES)
+
+        if reported or (not was_helpful and rating <= settings.SOLUTION_CACHE_MIN_RATING) \
+                or average < settings.SOLUTION_CACHE_MIN_RATING:
+            await db.solution_cache.delete_one({"_id": entry["_id"]})
+            self.index.remove(entry["output_language"], key)
+            self._counters["invalidations"] += 1
+            logger.info(f"Invalidated cached solution {key[:12]} (rating {rating}, issues {issues})")
+        elif average >= settings.SOLUTION_CACHE_TRUSTED_RATING:
+            await db.solution_cache.update_one(
+                {"_id": entry["_id"]},
+                {"$set": {
+                    "expires_at": datetime.utcnow() + timedelta(seconds=settings.SOLUTION_CACHE_TRUSTED_TTL_SECONDS)
+                }}
+            )
+
+    def stats(self) -> Dict:
+        lookups = self._counters["exact_hits"] + self._counters["semantic_hits"] + self._counters["misses"]
+        hits = self._counters["exact_hits"] + self._counters["semantic_hits"]
+        return {
+            **self._counters,
+            "indexed_embeddings": len(self.index),
+            "hit_rate": round(hits / lookups, 3) if lookups else None
+        }
+
+
+solution_cache = SolutionCache()
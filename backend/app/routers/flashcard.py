@@ -2,45 +2,47 @@ from fastapi import APIRouter, HTTPException
 from bson import ObjectId
 from app.agents.flashcard_agent import FlashcardAgent
 from app.agents.dashboard_agent import DashboardAgent
+from app.agents.job_agent import JobAgent
 from app.schemas.flashcard import (
     FlashcardGenerateRequest,
     FlashcardSetResponse,
     ReviewProgressRequest,
-    FlashcardSetDB,
     ReviewProgressDB
 )
+from app.schemas.jobs import JobAcceptedResponse
+from app.utils.job_response import job_accepted_response
 from app.database.mongodb import get_database
+from app.tools.llm_resilience import LLMUnavailableError
 
 router = APIRouter(prefix="/api/flashcards", tags=["flashcards"])
 flashcard_agent = FlashcardAgent()
 dashboard_agent = DashboardAgent()
+job_agent = JobAgent()
 
-@router.post("/generate", response_model=FlashcardSetResponse)
+@router.post(
+    "/generate",
+    response_model=FlashcardSetResponse,
+    responses={202: {"model": JobAcceptedResponse}}
+)
 async def generate_flashcards(request: FlashcardGenerateRequest):
-    """Generate flashcards from homework solution"""
+    """Generate flashcards from homework solution (queued as a background job with async_mode)"""
 
     try:
-        # Generate flashcards
-        flashcard_data = await flashcard_agent.generate_flashcards(
+        if request.async_mode:
+            return await job_accepted_response(job_agent, "flashcards", request)
+
+        # Generate flashcards and save to database
+        flashcard_set = await flashcard_agent.create_flashcard_set(
             homework_id=request.homework_id,
             output_language=request.output_language
         )
 
-        # Save to database
-        flashcard_db = FlashcardSetDB(**flashcard_data)
-
-        db = get_database()
-        flashcard_dict = flashcard_db.dict(by_alias=True, exclude={"id"})
-        insert_result = await db.flashcard_sets.insert_one(flashcard_dict)
-
-        return FlashcardSetResponse(
-            set_id=str(insert_result.inserted_id),
-            created_at=flashcard_db.created_at,
-            **flashcard_data
-        )
+        return FlashcardSetResponse(**flashcard_set)
 
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -2,8 +2,12 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from typing import Optional
 from bson import ObjectId
 from app.agents.homework_agent import HomeworkAgent
-from app.schemas.homework import HomeworkUploadRequest, HomeworkResponse, HomeworkDB
+from app.schemas.homework import (
+    HomeworkUploadRequest, HomeworkResponse, HomeworkDB,
+    WorksheetUploadResponse, WorksheetRegionResponse
+)
 from app.database.mongodb import get_database
+from app.operations.ocr_pool import OCRQueueFullError, OCRTimeoutError
 from datetime import datetime
 
 router = APIRouter(prefix="/api/homework", tags=["homework"])
@@ -93,11 +97,113 @@ async def upload_homework(
             created_at=datetime.utcnow()
         )
 
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except OCRQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except OCRTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/upload-worksheet", response_model=WorksheetUploadResponse)
+async def upload_worksheet(
+    input_language: str = Form("en", description="Language of input: en, ta, hi"),
+    output_language: str = Form("en", description="Language for solution: en, ta, hi"),
+    file: UploadFile = File(..., description="Worksheet image, multi-page TIFF or PDF")
+):
+    """
+    Worksheet submission endpoint
+
+    The worksheet is split into question regions (page by page for PDF/TIFF),
+    the regions are OCR'd in parallel and one homework submission is stored per
+    region. All regions share a parent_id; each region's homework_id can be
+    used for solution generation like a single upload.
+    """
+
+    try:
+        result = await homework_agent.process_worksheet_submission(
+            file=file,
+            input_language=input_language,
+            output_language=output_language
+        )
+
+        parent_id = str(ObjectId())
+        created_at = datetime.utcnow()
+        documents = [
+            HomeworkDB(
+                input_type="worksheet",
+                image_path=region["image_path"],
+                extracted_text=region["extracted_text"],
+                subject=region["subject"],
+                input_language=result["input_language"],
+                output_language=result["output_language"],
+                parent_id=parent_id,
+                source_path=result["source_path"],
+                page_number=region["page_number"],
+                region_index=region["region_index"],
+                bbox=region["bbox"],
+                status="completed",
+                created_at=created_at
+            ).dict(by_alias=True, exclude={"id"})
+            for region in result["regions"]
+        ]
+
+        inserted_ids = []
+        if documents:
+            db = get_database()
+            insert_result = await db.homework_submissions.insert_many(documents)
+            inserted_ids = insert_result.inserted_ids
+
+        return WorksheetUploadResponse(
+            parent_id=parent_id,
+            page_count=result["page_count"],
+            input_language=result["input_language"],
+            output_language=result["output_language"],
+            regions=[
+                WorksheetRegionResponse(
+                    homework_id=str(inserted_id),
+                    page_number=doc["page_number"],
+                    region_index=doc["region_index"],
+                    bbox=doc["bbox"],
+                    extracted_text=doc["extracted_text"],
+                    subject=doc["subject"]
+                )
+                for inserted_id, doc in zip(inserted_ids, documents)
+            ],
+            status="completed",
+            created_at=created_at
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OCRQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except OCRTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/worksheet/{parent_id}")
+async def get_worksheet(parent_id: str):
+    """Get all question regions of a worksheet, in page and region order"""
+
+    db = get_database()
+    regions = await db.homework_submissions.find({"parent_id": parent_id}) \
+        .sort([("page_number", 1), ("region_index", 1)]) \
+        .to_list(length=None)
+
+    if not regions:
+        raise HTTPException(status_code=404, detail="Worksheet not found")
+
+    for region in regions:
+        region["_id"] = str(region["_id"])
+    return {"parent_id": parent_id, "regions": regions}
+
 @router.get("/{homework_id}")
 async def get_homework(homework_id: str):
     """Get homework details by ID"""
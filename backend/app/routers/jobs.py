@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from app.agents.job_agent import JobAgent
+from app.schemas.jobs import JobResponse
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+job_agent = JobAgent()
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job_status(job_id: str):
+    """Get background job status, attempts and error"""
+
+    try:
+        job = await job_agent.get_job(job_id)
+        return JobResponse(**job)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    """
+    Get the result of a background job
+
+    Returns 200 with the same body as the synchronous endpoint once the job
+    has succeeded, 202 while it is queued or running, and 500 with the job
+    error if it failed permanently.
+    """
+
+    try:
+        result = await job_agent.get_result(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if not result["ready"]:
+        return JSONResponse(status_code=202, content=jsonable_encoder(result))
+    return result["result"]
@@ -0,0 +1,41 @@
+from fastapi import APIRouter
+from app.agents.metrics_agent import MetricsAgent
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+metrics_agent = MetricsAgent()
+
+@router.get("/ocr")
+async def get_ocr_metrics():
+    """Get OCR worker pool and model registry statistics"""
+
+    return await metrics_agent.get_ocr_metrics()
+
+@router.get("/llm")
+async def get_llm_metrics():
+    """Get shared LLM client statistics"""
+
+    return await metrics_agent.get_llm_metrics()
+
+@router.get("/llm/usage")
+async def get_llm_usage(minutes: int = 60):
+    """Get LLM token usage, cost and latency per tool and language"""
+
+    return await metrics_agent.get_llm_usage(minutes)
+
+@router.get("/jobs")
+async def get_job_metrics():
+    """Get background job queue statistics"""
+
+    return await metrics_agent.get_job_metrics()
+
+@router.get("/event-loop")
+async def get_event_loop_metrics():
+    """Get event loop lag statistics"""
+
+    return await metrics_agent.get_event_loop_metrics()
+
+@router.get("/audio")
+async def get_audio_metrics():
+    """Get audio cache statistics"""
+
+    return await metrics_agent.get_audio_metrics()
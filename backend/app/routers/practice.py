@@ -1,48 +1,50 @@
 from fastapi import APIRouter, HTTPException
 from bson import ObjectId
 from app.agents.practice_agent import PracticeAgent
+from app.agents.job_agent import JobAgent
 from app.schemas.practice import (
     PracticeGenerateRequest,
     PracticeTestResponse,
     PracticeSubmitRequest,
     PracticeSubmitResponse,
-    PracticeTestDB,
     PracticeSubmissionDB,
     Question
 )
+from app.schemas.jobs import JobAcceptedResponse
+from app.utils.job_response import job_accepted_response
 from app.database.mongodb import get_database
+from app.tools.llm_resilience import LLMUnavailableError
 
 router = APIRouter(prefix="/api/practice", tags=["practice"])
 practice_agent = PracticeAgent()
+job_agent = JobAgent()
 
-@router.post("/generate", response_model=PracticeTestResponse)
+@router.post(
+    "/generate",
+    response_model=PracticeTestResponse,
+    responses={202: {"model": JobAcceptedResponse}}
+)
 async def generate_practice_test(request: PracticeGenerateRequest):
-    """Generate practice test from homework"""
+    """Generate practice test from homework (queued as a background job with async_mode)"""
 
     try:
-        # Generate practice test
-        test_data = await practice_agent.generate_practice_test(
+        if request.async_mode:
+            return await job_accepted_response(job_agent, "practice", request)
+
+        # Generate practice test and save to database
+        test = await practice_agent.create_practice_test(
             homework_id=request.homework_id,
             question_count=request.question_count,
             difficulty=request.difficulty,
             output_language=request.output_language
         )
 
-        # Save to database
-        test_db = PracticeTestDB(**test_data)
-
-        db = get_database()
-        test_dict = test_db.dict(by_alias=True, exclude={"id"})
-        insert_result = await db.practice_tests.insert_one(test_dict)
-
-        return PracticeTestResponse(
-            test_id=str(insert_result.inserted_id),
-            created_at=test_db.created_at,
-            **test_data
-        )
+        return PracticeTestResponse(**test)
 
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
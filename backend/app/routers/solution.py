@@ -1,55 +1,115 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pathlib import Path
+from typing import Literal, Optional
 from bson import ObjectId
 from app.agents.solution_agent import SolutionAgent
+from app.agents.job_agent import JobAgent
 from app.schemas.solution import (
     SolutionGenerateRequest,
     SolutionResponse,
     RegenerateAudioRequest,
+    TTSEngineName,
     SolutionDB
 )
+from app.schemas.jobs import JobAcceptedResponse
+from app.utils.job_response import job_accepted_response
 from app.database.mongodb import get_database
+from app.utils.sse import format_sse
+from app.utils.audio_response import audio_file_response
+from app.tools.llm_resilience import LLMUnavailableError
 from app.config import settings
 
 router = APIRouter(prefix="/api/solution", tags=["solution"])
 solution_agent = SolutionAgent()
+job_agent = JobAgent()
 
-@router.post("/generate", response_model=SolutionResponse)
+@router.post(
+    "/generate",
+    response_model=SolutionResponse,
+    responses={202: {"model": JobAcceptedResponse}}
+)
 async def generate_solution(request: SolutionGenerateRequest):
-    """Generate step-by-step solution for homework"""
+    """
+    Generate step-by-step solution for homework
+
+    With async_mode the request is queued as a background job and a 202 with
+    the job_id is returned; poll /api/jobs/{job_id}/result for the solution.
+    """
 
     try:
-        # Generate solution
-        solution_data = await solution_agent.generate_solution(
+        if request.async_mode:
+            return await job_accepted_response(job_agent, "solution", request)
+
+        # Generate solution and save to database
+        solution = await solution_agent.create_solution(
             homework_id=request.homework_id,
             generate_audio=request.generate_audio,
             output_language=request.output_language,
-            audio_language=request.audio_language
-        )
-
-        # Save to database
-        solution_db = SolutionDB(
-            homework_id=request.homework_id,
-            **solution_data
+            audio_language=request.audio_language,
+            tts_engine=request.tts_engine
         )
 
-        db = get_database()
-        solution_dict = solution_db.dict(by_alias=True, exclude={"id"})
-        insert_result = await db.solutions.insert_one(solution_dict)
-
-        return SolutionResponse(
-            solution_id=str(insert_result.inserted_id),
-            homework_id=request.homework_id,
-            created_at=solution_db.created_at,
-            **solution_data
-        )
+        return SolutionResponse(**solution)
 
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/generate/stream")
+async def generate_solution_stream(request: SolutionGenerateRequest):
+    """
+    Generate a solution as a Server-Sent Events stream
+
+    Events: meta (question, subject), step (one per solution step, as soon as
+    it is generated), final_answer, concepts, then done with the solution_id
+    once the complete solution has been saved. Failures after the stream has
+    started are sent as an error event.
+    """
+
+    try:
+        homework = await solution_agent.get_homework(request.homework_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    async def event_stream():
+        try:
+            async for event, data in solution_agent.stream_solution(
+                homework=homework,
+                generate_audio=request.generate_audio,
+                output_language=request.output_language,
+                audio_language=request.audio_language,
+                tts_engine=request.tts_engine
+            ):
+                if event != "solution":
+                    yield format_sse(event, data)
+                    continue
+
+                # Save to database once the solution is complete
+                solution_db = SolutionDB(
+                    homework_id=request.homework_id,
+                    **data
+                )
+
+                yield format_sse("done", {
+                    "solution_id": await solution_agent.save_solution(solution_db),
+                    "homework_id": request.homework_id,
+                    "audio_url": data["audio_url"],
+                    "created_at": solution_db.created_at
+                })
+
+        except Exception as e:
+            yield format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/{solution_id}", response_model=SolutionResponse)
 async def get_solution(solution_id: str):
     """Get solution details by ID"""
@@ -69,29 +129,65 @@ async def get_solution(solution_id: str):
     solution["solution_id"] = str(solution.pop("_id"))
     return SolutionResponse(**solution)
 
-@router.get("/audio/{audio_filename}")
-async def stream_audio(audio_filename: str):
-    """Stream audio file"""
+@router.api_route("/audio/{audio_filename}", methods=["GET", "HEAD"])
+async def stream_audio(audio_filename: str, request: Request):
+    """Stream audio file (byte ranges, ETag/304, immutable caching for content-addressed files)"""
 
     audio_path = Path(settings.STORAGE_PATH) / "audio" / audio_filename
 
-    if not audio_path.exists():
+    # Only plain files in the audio directory (no hidden temp files or path tricks)
+    if audio_filename.startswith(".") or Path(audio_filename).name != audio_filename or not audio_path.is_file():
         raise HTTPException(status_code=404, detail="Audio file not found")
 
-    return FileResponse(
-        path=str(audio_path),
-        media_type="audio/mpeg",
-        filename=audio_filename
-    )
+    return audio_file_response(request, audio_path)
+
+@router.get("/{solution_id}/audio/playlist")
+async def get_audio_playlist(
+    solution_id: str,
+    language: Optional[Literal["en", "ta", "hi"]] = None,
+    engine: Optional[TTSEngineName] = None
+):
+    """Per-step audio URLs; returns once step 1 is ready while the rest are synthesised"""
+
+    try:
+        return await solution_agent.get_audio_playlist(solution_id, language, engine)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{solution_id}/audio/stream")
+async def stream_solution_audio(
+    solution_id: str,
+    language: Optional[Literal["en", "ta", "hi"]] = None,
+    engine: Optional[TTSEngineName] = None
+):
+    """Narration as one MP3 stream, starting as soon as step 1 is synthesised"""
+
+    try:
+        audio_stream = await solution_agent.open_audio_stream(solution_id, language, engine)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-@router.post("/{solution_id}/regenerate-audio")
+    return StreamingResponse(audio_stream, media_type="audio/mpeg", headers={"Cache-Control": "no-cache"})
+
+@router.post("/{solution_id}/regenerate-audio", responses={202: {"model": JobAcceptedResponse}})
 async def regenerate_audio(solution_id: str, request: RegenerateAudioRequest):
-    """Regenerate audio for existing solution in different language"""
+    """Regenerate audio for existing solution in different language (queued as a job with async_mode)"""
 
     try:
+        if request.async_mode:
+            return await job_accepted_response(
+                job_agent,
+                "audio",
+                request,
+                {"solution_id": solution_id, "language": request.language, "tts_engine": request.tts_engine}
+            )
+
         audio_url = await solution_agent.regenerate_audio(
             solution_id=solution_id,
-            language=request.language
+            language=request.language,
+            tts_engine=request.tts_engine
         )
 
         return {
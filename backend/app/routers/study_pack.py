@@ -0,0 +1,47 @@
+from fastapi import APIRouter, HTTPException
+from app.agents.study_pack_agent import StudyPackAgent
+from app.agents.job_agent import JobAgent
+from app.schemas.study_pack import StudyPackGenerateRequest, StudyPackResponse
+from app.schemas.jobs import JobAcceptedResponse
+from app.utils.job_response import job_accepted_response
+from app.tools.llm_resilience import LLMUnavailableError
+
+router = APIRouter(prefix="/api/study-pack", tags=["study-pack"])
+study_pack_agent = StudyPackAgent()
+job_agent = JobAgent()
+
+@router.post(
+    "/generate",
+    response_model=StudyPackResponse,
+    responses={202: {"model": JobAcceptedResponse}}
+)
+async def generate_study_pack(request: StudyPackGenerateRequest):
+    """
+    Generate solution, practice test and flashcards for homework in one go
+
+    Uses a single combined LLM call instead of the three sequential
+    generate endpoints (queued as a background job with async_mode).
+    """
+
+    try:
+        if request.async_mode:
+            return await job_accepted_response(job_agent, "study_pack", request)
+
+        study_pack = await study_pack_agent.create_study_pack(
+            homework_id=request.homework_id,
+            question_count=request.question_count,
+            difficulty=request.difficulty,
+            output_language=request.output_language,
+            generate_audio=request.generate_audio,
+            audio_language=request.audio_language,
+            tts_engine=request.tts_engine
+        )
+
+        return StudyPackResponse(**study_pack)
+
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from app.agents.utility_agent import UtilityAgent
+from app.utils.sse import format_sse
 from app.schemas.utility import BatchGenerateRequest, BatchGenerateResponse, DeleteResponse
 
 router = APIRouter(prefix="/api/utility", tags=["utility"])
@@ -38,3 +40,40 @@ async def batch_generate_solutions(request: BatchGenerateRequest):
         return BatchGenerateResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/batch/generate-solutions/stream")
+async def batch_generate_solutions_stream(request: BatchGenerateRequest):
+    """
+    Batch solution generation as a Server-Sent Events stream
+
+    Sends a progress event per homework item as soon as it finishes (with the
+    running counts) and a done event with the final summary.
+    """
+
+    async def event_stream():
+        counts = {"successful": 0, "failed": 0, "skipped": 0}
+        status_counter = {"success": "successful", "failed": "failed", "skipped": "skipped"}
+        total = len(dict.fromkeys(request.homework_ids))
+        completed = 0
+
+        try:
+            async for result in utility_agent.stream_batch_generate(request.homework_ids):
+                completed += 1
+                counts[status_counter[result["status"]]] += 1
+                yield format_sse("progress", {
+                    "result": result,
+                    "completed": completed,
+                    "total": total,
+                    **counts
+                })
+
+            yield format_sse("done", {"total_processed": completed, **counts})
+
+        except Exception as e:
+            yield format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
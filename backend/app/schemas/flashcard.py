@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Literal
 from datetime import datetime
 from bson import ObjectId
+from app.schemas.jobs import AsyncJobRequest
 
 class Flashcard(BaseModel):
     card_id: str
@@ -9,7 +10,7 @@ class Flashcard(BaseModel):
     back: str
     difficulty: Literal["easy", "medium", "hard"] = "medium"
 
-class FlashcardGenerateRequest(BaseModel):
+class FlashcardGenerateRequest(AsyncJobRequest):
     homework_id: str
     output_language: Literal["en", "ta", "hi"] = "en"
 
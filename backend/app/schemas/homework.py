@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 from datetime import datetime
 from bson import ObjectId
 
@@ -33,11 +33,34 @@ class HomeworkResponse(BaseModel):
     status: str
     created_at: datetime
 
+class WorksheetRegionResponse(BaseModel):
+    homework_id: str
+    page_number: int
+    region_index: int
+    bbox: List[int]  # x, y, width, height in page pixels
+    extracted_text: str
+    subject: str
+
+class WorksheetUploadResponse(BaseModel):
+    parent_id: str
+    page_count: int
+    input_language: str
+    output_language: str
+    regions: List[WorksheetRegionResponse]
+    status: str
+    created_at: datetime
+
 class HomeworkDB(BaseModel):
     id: Optional[PyObjectId] = Field(alias="_id", default=None)
-    input_type: str  # image, text, audio, webcam
-    image_path: Optional[str] = None  # Only for image/webcam inputs
+    input_type: str  # image, text, audio, webcam, worksheet
+    image_path: Optional[str] = None  # Only for image/webcam inputs (region crop for worksheets)
     audio_path: Optional[str] = None  # Only for audio inputs
+    # Worksheet regions: one document per question region, sharing parent_id
+    parent_id: Optional[str] = None
+    source_path: Optional[str] = None
+    page_number: Optional[int] = None
+    region_index: Optional[int] = None
+    bbox: Optional[List[int]] = None
     extracted_text: str
     subject: str
     input_language: str
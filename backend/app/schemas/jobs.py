@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Literal, Optional
+from datetime import datetime
+
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+class AsyncJobRequest(BaseModel):
+    """Queueing options shared by the generate requests"""
+    async_mode: bool = False  # Queue as a background job and return its job_id
+    idempotency_key: Optional[str] = None  # Repeating a key returns the original job
+
+class JobAcceptedResponse(BaseModel):
+    job_id: str
+    type: str
+    status: JobStatus
+    status_url: str
+    result_url: str
+
+class JobResponse(BaseModel):
+    job_id: str
+    type: str
+    status: JobStatus
+    priority: int
+    attempts: int
+    max_attempts: int
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field, validator
 from typing import List, Optional, Literal
 from datetime import datetime
 from bson import ObjectId
+from app.schemas.jobs import AsyncJobRequest
 
 class Question(BaseModel):
     question_id: str
@@ -12,7 +13,7 @@ class Question(BaseModel):
     explanation: str
     difficulty: Literal["easy", "medium", "hard"] = "medium"
 
-class PracticeGenerateRequest(BaseModel):
+class PracticeGenerateRequest(AsyncJobRequest):
     homework_id: str
     question_count: int = 5
     difficulty: Literal["easy", "medium", "hard"] = "medium"
@@ -2,20 +2,25 @@ from pydantic import BaseModel, Field, validator
 from typing import List, Optional, Literal
 from datetime import datetime
 from bson import ObjectId
+from app.schemas.jobs import AsyncJobRequest
+
+TTSEngineName = Literal["gtts", "openai", "espeak"]
 
 class SolutionStep(BaseModel):
     step_number: int
     explanation: str
     formula_used: Optional[str] = None
 
-class SolutionGenerateRequest(BaseModel):
+class SolutionGenerateRequest(AsyncJobRequest):
     homework_id: str
     generate_audio: bool = False
     output_language: Literal["en", "ta", "hi"] = "en"
     audio_language: Optional[Literal["en", "ta", "hi"]] = None
+    tts_engine: Optional[TTSEngineName] = None  # Default: TTS_ENGINE
 
-class RegenerateAudioRequest(BaseModel):
+class RegenerateAudioRequest(AsyncJobRequest):
     language: Literal["en", "ta", "hi"]
+    tts_engine: Optional[TTSEngineName] = None  # Default: TTS_ENGINE
 
 class SolutionResponse(BaseModel):
     solution_id: str
@@ -39,6 +44,7 @@ class SolutionDB(BaseModel):
     concepts_covered: List[str]
     audio_url: Optional[str] = None
     output_language: str
+    cache_key: Optional[str] = None  # solution_cache entry this solution was generated for / served from
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Config:
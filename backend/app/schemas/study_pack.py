@@ -0,0 +1,26 @@
+from pydantic import BaseModel, validator
+from typing import Optional, Literal
+from app.schemas.solution import SolutionResponse, TTSEngineName
+from app.schemas.practice import PracticeTestResponse
+from app.schemas.flashcard import FlashcardSetResponse
+from app.schemas.jobs import AsyncJobRequest
+
+class StudyPackGenerateRequest(AsyncJobRequest):
+    homework_id: str
+    question_count: int = 5
+    difficulty: Literal["easy", "medium", "hard"] = "medium"
+    output_language: Literal["en", "ta", "hi"] = "en"
+    generate_audio: bool = False
+    audio_language: Optional[Literal["en", "ta", "hi"]] = None
+    tts_engine: Optional[TTSEngineName] = None  # Default: TTS_ENGINE
+
+    @validator('question_count')
+    def validate_question_count(cls, v):
+        if v < 1 or v > 20:
+            raise ValueError('question_count must be between 1 and 20')
+        return v
+
+class StudyPackResponse(BaseModel):
+    solution: SolutionResponse
+    practice_test: PracticeTestResponse
+    flashcard_set: FlashcardSetResponse
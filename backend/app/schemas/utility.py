@@ -1,15 +1,16 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
+from app.config import settings
 
 class BatchGenerateRequest(BaseModel):
-    homework_ids: List[str] = Field(..., min_items=1, max_items=10)
+    homework_ids: List[str] = Field(..., min_items=1, max_items=settings.BATCH_MAX_ITEMS)
 
 class BatchResultItem(BaseModel):
     homework_id: str
     status: str  # "success", "skipped", "failed"
     message: str
-    solution_id: str = None
-    error: str = None
+    solution_id: Optional[str] = None
+    error: Optional[str] = None
 
 class BatchGenerateResponse(BaseModel):
     results: List[BatchResultItem]
@@ -1,17 +1,19 @@
-from openai import OpenAI
-import json
 import uuid
 from typing import Dict, List
 from app.config import settings
+from app.tools.llm_client import llm_client
+from app.tools.llm_resilience import LLMUnavailableError
+from app.tools.token_budget import token_budget
+from app.tools.prompt_templates import FLASHCARD_PROMPT
+from app.schemas.flashcard import Flashcard
 
 class AIFlashcardGenerator:
     """AI-powered flashcard generation using GPT-4o-mini"""
 
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
         self.model = settings.OPENAI_MODEL
 
-    def generate_flashcards(
+    async def generate_flashcards(
         self,
         question: str,
         solution_data: Dict,
@@ -31,66 +33,35 @@ class AIFlashcardGenerator:
             List of flashcard dictionaries
         """
 
-        language_names = {
-            "en": "English",
-            "ta": "Tamil",
-            "hi": "Hindi"
-        }
-
         concepts = solution_data.get("concepts_covered", [])
         concepts_str = ", ".join(concepts) if concepts else "the topic"
 
-        prompt = f"""Based on this homework solution, create 5-10 educational flashcards for studying.
-
-Question: {question}
-Subject: {subject}
-Concepts covered: {concepts_str}
-
-Create flashcards that cover:
-- Key concepts and definitions
-- Important formulas (if applicable)
-- Key terms and their meanings
-- Important facts to remember
-
-IMPORTANT: Generate ALL content in {language_names[output_language]} language.
-
-Return JSON with this EXACT structure:
-{{
-    "cards": [
-        {{
-            "front": "Question or term in {language_names[output_language]}",
-            "back": "Answer or definition in {language_names[output_language]}",
-            "difficulty": "easy|medium|hard"
-        }}
-    ]
-}}
-
-Create 5-10 flashcards. Make ALL text in {language_names[output_language]}.
-"""
+        plan = token_budget.plan("flashcards", output_language)
 
         try:
-            response = self.client.chat.completions.create(
+            response = await llm_client.chat_completion(
+                plan=plan,
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"You create educational flashcards. Always respond in {language_names[output_language]}."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
+                messages=FLASHCARD_PROMPT.messages(
+                    output_language,
+                    question=question,
+                    subject=subject,
+                    concepts=concepts_str
+                ),
+                response_format=FLASHCARD_PROMPT.response_format,
                 temperature=0.7,
-                max_tokens=2000
+                max_tokens=plan["max_tokens"]
             )
 
-            data = json.loads(response.choices[0].message.content)
-            cards = data.get("cards", [])
+            reply = FLASHCARD_PROMPT.parse(response.choices[0].message)
 
             # Add unique IDs
-            for card in cards:
-                card["card_id"] = str(uuid.uuid4())
-
-            return cards
+            return [
+                Flashcard(card_id=str(uuid.uuid4()), **card.model_dump()).dict()
+                for card in reply.cards
+            ]
 
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             raise Exception(f"Error generating flashcards: {str(e)}")
@@ -1,16 +1,18 @@
-from openai import OpenAI
-import json
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List
 from app.config import settings
+from app.tools.llm_client import llm_client
+from app.tools.llm_resilience import LLMUnavailableError
+from app.tools.token_budget import token_budget
+from app.tools.prompt_templates import SOLUTION_PROMPT
+from app.operations.json_stream import StreamingJSONObjectParser, JSONStreamEvent
 
 class AISolver:
     """AI-powered solution generation using GPT-4o-mini"""
 
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
         self.model = settings.OPENAI_MODEL
 
-    def generate_solution(
+    async def generate_solution(
         self,
         question: str,
         subject: str,
@@ -30,52 +32,82 @@ class AISolver:
             Dict with solution_steps, final_answer, concepts_covered
         """
 
-        # Language names for prompt
-        language_names = {
-            "en": "English",
-            "ta": "Tamil",
-            "hi": "Hindi"
-        }
+        plan = self._token_plan(question, output_language)
 
-        prompt = f"""You are a friendly homework tutor helping a grade {grade_level} student.
+        try:
+            response = await llm_client.chat_completion(
+                plan=plan,
+                model=self.model,
+                messages=self._build_messages(question, subject, output_language, grade_level),
+                response_format=SOLUTION_PROMPT.response_format,
+                temperature=0.7,
+                max_tokens=plan["max_tokens"]
+            )
 
-Subject: {subject}
-Question: {question}
+            return SOLUTION_PROMPT.parse(response.choices[0].message).model_dump()
 
-Provide a detailed, step-by-step solution suitable for a child. Use simple, easy-to-understand language.
+        except LLMUnavailableError:
+            raise
+        except Exception as e:
+            raise Exception(f"Error generating solution: {str(e)}")
 
-IMPORTANT: Generate the ENTIRE explanation in {language_names[output_language]} language.
+    async def stream_solution(
+        self,
+        question: str,
+        subject: str,
+        output_language: str,
+        grade_level: int = 5
+    ) -> AsyncIterator[JSONStreamEvent]:
+        """
+        Generate a solution, yielding each part as soon as it is decoded from the model stream
 
-Return your response as JSON with this EXACT structure:
-{{
-    "solution_steps": [
-        {{
-            "step_number": 1,
-            "explanation": "Clear explanation in {language_names[output_language]}",
-            "formula_used": "formula if applicable or null"
-        }}
-    ],
-    "final_answer": "The final answer in {language_names[output_language]}",
-    "concepts_covered": ["concept1 in {language_names[output_language]}", "concept2 in {language_names[output_language]}"]
-}}
+        Args:
+            question: The homework question
+            subject: Subject (math/science/language)
+            output_language: Language for explanation (en/ta/hi)
+            grade_level: Student grade level
 
-Make sure ALL text content is in {language_names[output_language]}.
-"""
+        Yields:
+            (key, index, value) events, e.g. ("solution_steps", 0, {...}) for each
+            step, ("solution_steps", None, [...]) once the list is complete, then
+            final_answer and concepts_covered
+        """
+        parser = StreamingJSONObjectParser()
+        plan = self._token_plan(question, output_language)
 
         try:
-            response = self.client.chat.completions.create(
+            async for delta in llm_client.stream_chat_completion(
+                plan=plan,
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": f"You are a patient homework tutor. Always respond in {language_names[output_language]}."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
+                messages=self._build_messages(question, subject, output_language, grade_level),
+                response_format=SOLUTION_PROMPT.response_format,
                 temperature=0.7,
-                max_tokens=2000
-            )
-
-            solution_data = json.loads(response.choices[0].message.content)
-            return solution_data
+                max_tokens=plan["max_tokens"]
+            ):
+                for event in parser.feed(delta):
+                    yield event
 
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             raise Exception(f"Error generating solution: {str(e)}")
+
+    @staticmethod
+    def _token_plan(question: str, output_language: str) -> Dict:
+        """Longer (multi-part) questions get a larger max_tokens"""
+        return token_budget.plan("solver", output_language, units=1 + len(question) // 300)
+
+    def _build_messages(
+        self,
+        question: str,
+        subject: str,
+        output_language: str,
+        grade_level: int
+    ) -> List[Dict]:
+        """Chat messages for the solution prompt"""
+        return SOLUTION_PROMPT.messages(
+            output_language,
+            grade_level=grade_level,
+            subject=subject,
+            question=question
+        )
@@ -0,0 +1,85 @@
+import uuid
+from typing import Dict
+from app.config import settings
+from app.tools.llm_client import llm_client
+from app.tools.llm_resilience import LLMUnavailableError
+from app.tools.token_budget import token_budget
+from app.tools.prompt_templates import STUDY_PACK_PROMPT
+from app.schemas.practice import Question
+from app.schemas.flashcard import Flashcard
+
+class AIStudyPackGenerator:
+    """Solution, practice questions and flashcards from a single GPT-4o-mini call"""
+
+    def __init__(self):
+        self.model = settings.OPENAI_MODEL
+
+    async def generate_study_pack(
+        self,
+        question: str,
+        subject: str,
+        output_language: str,
+        question_count: int,
+        difficulty: str,
+        grade_level: int = 5
+    ) -> Dict:
+        """
+        Generate a complete study pack in one structured call
+
+        The question is sent once and the practice questions and flashcards are
+        written with the model's own solution in context, instead of three
+        sequential calls that each resend the question and concepts.
+
+        Args:
+            question: The homework question
+            subject: Subject (math/science/language)
+            output_language: Language for all content (en/ta/hi)
+            question_count: Number of practice questions
+            difficulty: Practice question difficulty (easy/medium/hard)
+            grade_level: Student grade level
+
+        Returns:
+            Dict with solution_steps, final_answer, concepts_covered,
+            practice_questions and flashcards (with question_id/card_id assigned)
+        """
+
+        plan = token_budget.plan("study_pack", output_language, units=question_count)
+
+        try:
+            response = await llm_client.chat_completion(
+                plan=plan,
+                model=self.model,
+                messages=STUDY_PACK_PROMPT.messages(
+                    output_language,
+                    grade_level=grade_level,
+                    subject=subject,
+                    question=question,
+                    question_count=question_count,
+                    difficulty=difficulty
+                ),
+                response_format=STUDY_PACK_PROMPT.response_format,
+                temperature=0.7,
+                max_tokens=plan["max_tokens"]
+            )
+
+            reply = STUDY_PACK_PROMPT.parse(response.choices[0].message)
+
+            return {
+                "solution_steps": [step.model_dump() for step in reply.solution_steps],
+                "final_answer": reply.final_answer,
+                "concepts_covered": reply.concepts_covered,
+                # Ensure we don't exceed requested count (fail-safe)
+                "practice_questions": [
+                    Question(question_id=str(uuid.uuid4()), **practice_question.model_dump()).dict()
+                    for practice_question in reply.practice_questions[:question_count]
+                ],
+                "flashcards": [
+                    Flashcard(card_id=str(uuid.uuid4()), **card.model_dump()).dict()
+                    for card in reply.flashcards
+                ]
+            }
+
+        except LLMUnavailableError:
+            raise
+        except Exception as e:
+            raise Exception(f"Error generating study pack: {str(e)}")
@@ -0,0 +1,197 @@
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional
+from app.tools.tts_engine import TTSEngine
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# espeak-ng voice per output language
+ESPEAK_VOICES = {
+    "en": "en-us",
+    "ta": "ta",
+    "hi": "hi"
+}
+
+# speak_lib.h constants
+AUDIO_OUTPUT_SYNCHRONOUS = 2
+POS_CHARACTER = 1
+ESPEAK_CHARS_UTF8 = 1
+ESPEAK_RATE = 1
+EE_OK = 0
+
+SYNTH_CALLBACK = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.c_void_p)
+
+
+class EspeakLibrary:
+    """
+    libespeak-ng loaded in-process with its voice data initialised
+
+    Synthesis is synchronous and collects 16-bit mono PCM through the synth
+    callback. The library keeps global state, so use one instance per process.
+    """
+
+    def __init__(self):
+        path = ctypes.util.find_library("espeak-ng") or "libespeak-ng.so.1"
+        self.lib = ctypes.CDLL(path)
+        self.lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+        self.lib.espeak_SetVoiceByName.argtypes = [ctypes.c_char_p]
+        self.lib.espeak_SetParameter.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        self.lib.espeak_Synth.argtypes = [
+            ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint, ctypes.c_int,
+            ctypes.c_uint, ctypes.c_uint, ctypes.POINTER(ctypes.c_uint), ctypes.c_void_p
+        ]
+
+        self.sample_rate = self.lib.espeak_Initialize(AUDIO_OUTPUT_SYNCHRONOUS, 0, None, 0)
+        if self.sample_rate <= 0:
+            raise RuntimeError("espeak-ng could not be initialised (voice data missing?)")
+
+        self._chunks = []
+        # Keep a reference: ctypes callbacks are freed with their Python object
+        self._callback = SYNTH_CALLBACK(self._collect)
+        self.lib.espeak_SetSynthCallback(self._callback)
+
+    def _collect(self, wav, sample_count, events) -> int:
+        if wav and sample_count > 0:
+            self._chunks.append(ctypes.string_at(wav, sample_count * 2))
+        return 0
+
+    def synthesize(self, text: str, voice: str, rate: int) -> bytes:
+        """Speak text with a voice at `rate` words per minute; returns PCM samples"""
+        if self.lib.espeak_SetVoiceByName(voice.encode("ascii")) != EE_OK:
+            raise ValueError(f"espeak-ng voice not available: {voice}")
+        self.lib.espeak_SetParameter(ESPEAK_RATE, rate, 0)
+
+        self._chunks = []
+        data = text.encode("utf-8") + b"\0"
+        buffer = ctypes.create_string_buffer(data, len(data))
+        result = self.lib.espeak_Synth(buffer, len(data), 0, POS_CHARACTER, 0, ESPEAK_CHARS_UTF8, None, None)
+        if result != EE_OK:
+            raise RuntimeError(f"espeak-ng synthesis failed (error {result})")
+        self.lib.espeak_Synchronize()
+        return b"".join(self._chunks)
+
+
+# Per-process library, loaded once by the pool initializer so voices stay warm between jobs
+_worker_library: Optional[EspeakLibrary] = None
+_worker_error: Optional[str] = None
+
+
+def _init_worker() -> None:
+    """Pool initializer: load libespeak-ng and warm it with a short phrase"""
+    global _worker_library, _worker_error
+    try:
+        _worker_library = EspeakLibrary()
+        _worker_library.synthesize("ready", ESPEAK_VOICES["en"], settings.TTS_ESPEAK_RATE)
+    except Exception as e:
+        # Reported per job instead of breaking the pool
+        _worker_error = str(e)
+
+
+def _ping() -> Optional[str]:
+    """No-op job used to spawn and warm the workers; returns the load error, if any"""
+    return _worker_error
+
+
+def _synthesize_in_worker(narration: str, voice: str, rate: int, audio_path: str) -> None:
+    """Executed inside a worker process"""
+    if _worker_library is None:
+        raise RuntimeError(f"espeak-ng is not available: {_worker_error}")
+    from pydub import AudioSegment
+
+    pcm = _worker_library.synthesize(narration, voice, rate)
+    AudioSegment(data=pcm, sample_width=2, frame_rate=_worker_library.sample_rate, channels=1).export(
+        audio_path, format="mp3", bitrate=settings.TTS_ESPEAK_BITRATE
+    )
+
+
+class EspeakTTS(TTSEngine):
+    """
+    Offline Text-to-Speech using espeak-ng
+
+    Needs no network, so it works air-gapped and gives stable numbers in
+    benchmarks; the voice is robotic next to gTTS or OpenAI. Runs in
+    TTS_ESPEAK_WORKERS spawned processes that keep libespeak-ng loaded;
+    PCM is encoded to MP3 with pydub (ffmpeg).
+    """
+
+    engine = "espeak"
+    offline = True
+
+    @property
+    def voice(self) -> str:
+        """Speaking rate and MP3 bitrate change the audio, so both are part of the cache key"""
+        return f"espeak-ng:{settings.TTS_ESPEAK_RATE}wpm:{settings.TTS_ESPEAK_BITRATE}"
+
+    _executor: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def _get_executor(cls) -> ProcessPoolExecutor:
+        if cls._executor is None:
+            cls._executor = ProcessPoolExecutor(
+                max_workers=settings.TTS_ESPEAK_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return cls._executor
+
+    @classmethod
+    async def start(cls) -> None:
+        """Spawn and warm all workers up front so the first narration doesn't pay start-up cost"""
+        loop = asyncio.get_running_loop()
+        executor = cls._get_executor()
+        try:
+            errors = await asyncio.gather(*[
+                loop.run_in_executor(executor, _ping) for _ in range(settings.TTS_ESPEAK_WORKERS)
+            ])
+        except BrokenProcessPool as e:
+            # Startup must not fail because the offline engine can't run here
+            logger.warning(f"espeak-ng worker pool could not be started: {str(e)}")
+            cls.shutdown()
+            return
+        if any(errors):
+            logger.warning(f"espeak-ng workers could not load the library: {next(e for e in errors if e)}")
+        else:
+            logger.info(f"espeak-ng TTS pool started with {settings.TTS_ESPEAK_WORKERS} workers")
+
+    @classmethod
+    def shutdown(cls) -> None:
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+            logger.info("espeak-ng TTS pool shut down")
+
+    async def synthesize_async(
+        self,
+        narration: str,
+        language: str,
+        audio_path: Path
+    ) -> None:
+        """
+        Convert narration to an MP3 file in the espeak-ng worker pool
+
+        Args:
+            narration: Text to speak (see narration_chunks)
+            language: Language code (en/ta/hi)
+            audio_path: Destination file
+        """
+        voice = ESPEAK_VOICES.get(language, ESPEAK_VOICES["en"])
+        loop = asyncio.get_running_loop()
+        args = (_synthesize_in_worker, narration, voice, settings.TTS_ESPEAK_RATE, str(audio_path))
+
+        try:
+            try:
+                await loop.run_in_executor(self._get_executor(), *args)
+            except BrokenProcessPool:
+                logger.error("espeak-ng worker pool is broken, recreating it")
+                EspeakTTS._executor = None
+                await loop.run_in_executor(self._get_executor(), *args)
+
+        except Exception as e:
+            raise Exception(f"Error generating audio with espeak-ng: {str(e)}")
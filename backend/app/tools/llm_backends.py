@@ -0,0 +1,291 @@
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+import httpx
+import numpy as np
+import openai
+from openai import AsyncOpenAI
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletion, ChatCompletionChunk, ChatCompletionMessage
+from openai.types.chat.chat_completion import Choice
+from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice, ChoiceDelta
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Dimensions of text-embedding-3-small, so stub vectors fit the solution cache index
+STUB_EMBEDDING_DIMENSIONS = 1536
+
+# Characters per streamed chunk in the stub backend
+STUB_STREAM_CHUNK_CHARS = 40
+
+
+class LLMBackend(ABC):
+    """
+    Provider interface used by the shared LLMClient
+
+    Implementations take the same keyword arguments as the OpenAI SDK and
+    return OpenAI response types, so tools, token accounting and the
+    resilience policy work the same against every backend.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def chat_completion(self, **kwargs):
+        """
+        Create a chat completion
+
+        With stream=True, returns an async context manager that iterates
+        ChatCompletionChunk objects; otherwise a ChatCompletion.
+        """
+
+    @abstractmethod
+    async def embedding(self, model: str, text: str) -> List[float]:
+        """Embedding vector of a text"""
+
+    @abstractmethod
+    async def speech_to_file(self, file_path: Path, **kwargs) -> None:
+        """Synthesize speech into an audio file"""
+
+    async def close(self) -> None:
+        pass
+
+
+class OpenAIBackend(LLMBackend):
+    """The OpenAI API over one pooled keep-alive httpx client"""
+
+    name = "openai"
+
+    def __init__(self):
+        if not settings.OPENAI_API_KEY:
+            raise RuntimeError("OPENAI_API_KEY is not set (set LLM_BACKEND=stub to run without OpenAI)")
+
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS
+            ),
+            timeout=httpx.Timeout(settings.OPENAI_TIMEOUT_SECONDS, connect=10.0)
+        )
+        # Retries are handled by llm_resilience
+        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=http_client, max_retries=0)
+
+    async def chat_completion(self, **kwargs):
+        return await self.client.chat.completions.create(**kwargs)
+
+    async def embedding(self, model: str, text: str) -> List[float]:
+        response = await self.client.embeddings.create(model=model, input=text)
+        return response.data[0].embedding
+
+    async def speech_to_file(self, file_path: Path, **kwargs) -> None:
+        async with self.client.audio.speech.with_streaming_response.create(**kwargs) as response:
+            await response.stream_to_file(file_path)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class _StubStream:
+    """Async context manager / iterator over pre-built chunks, paced like a real stream"""
+
+    def __init__(self, chunks: List[ChatCompletionChunk], interval: float):
+        self._chunks = chunks
+        self._interval = interval
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def _iterate(self):
+        for chunk in self._chunks:
+            await asyncio.sleep(self._interval)
+            yield chunk
+
+    def __aiter__(self):
+        return self._iterate()
+
+
+class StubBackend(LLMBackend):
+    """
+    Deterministic offline stand-in for load tests and local development
+
+    - Chat replies are generated from the requested JSON schema (the
+      response_format json_schema, or the schema spelled out in the system
+      prompt in json_object mode), so they pass the tools' reply validation.
+      The same messages always produce the same reply.
+    - Each call sleeps LLM_STUB_LATENCY_MS +/- LLM_STUB_LATENCY_JITTER_MS;
+      streams spend about a third of that before the first chunk
+    - A share LLM_STUB_FAILURE_RATE of calls raises an APIStatusError with
+      LLM_STUB_FAILURE_STATUS, exercising retries and the circuit breaker
+    - Latency and failures come from a generator seeded with LLM_STUB_SEED,
+      so a run is reproducible for a fixed request order
+    """
+
+    name = "stub"
+
+    def __init__(self):
+        self._random = random.Random(settings.LLM_STUB_SEED)
+
+    def _latency(self) -> float:
+        ms = self._random.gauss(settings.LLM_STUB_LATENCY_MS, settings.LLM_STUB_LATENCY_JITTER_MS)
+        return max(0.0, ms) / 1000
+
+    def _maybe_fail(self) -> None:
+        if settings.LLM_STUB_FAILURE_RATE and self._random.random() < settings.LLM_STUB_FAILURE_RATE:
+            request = httpx.Request("POST", "http://llm-stub/v1/chat/completions")
+            response = httpx.Response(settings.LLM_STUB_FAILURE_STATUS, request=request)
+            raise openai.APIStatusError("Injected stub failure", response=response, body=None)
+
+    @staticmethod
+    def _seed(*parts) -> int:
+        digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big")
+
+    @staticmethod
+    def _reply_schema(kwargs: Dict) -> Optional[Dict]:
+        response_format = kwargs.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            return response_format["json_schema"]["schema"]
+        if response_format.get("type") == "json_object":
+            for message in kwargs["messages"]:
+                content = message.get("content") or ""
+                marker = content.find("schema:\n")
+                if message["role"] == "system" and marker != -1:
+                    return json.loads(content[marker + len("schema:\n"):])
+        return None
+
+    def _sample(self, schema: Dict, defs: Dict, rng: random.Random, name: str, index: int = 0):
+        """Schema-conforming value; strings name their field so replies are readable"""
+        if "$ref" in schema:
+            return self._sample(defs[schema["$ref"].split("/")[-1]], defs, rng, name, index)
+        if "anyOf" in schema:
+            variants = [v for v in schema["anyOf"] if v.get("type") != "null"]
+            return self._sample(variants[0], defs, rng, name, index) if variants else None
+        if "enum" in schema:
+            return rng.choice(schema["enum"])
+
+        kind = schema.get("type")
+        if kind == "object":
+            return {
+                key: self._sample(value, defs, rng, key, index)
+                for key, value in schema.get("properties", {}).items()
+            }
+        if kind == "array":
+            return [
+                self._sample(schema.get("items", {}), defs, rng, name, i)
+                for i in range(settings.LLM_STUB_LIST_LENGTH)
+            ]
+        if kind == "integer":
+            return index + 1
+        if kind == "number":
+            return round(rng.random(), 3)
+        if kind == "boolean":
+            return rng.random() < 0.5
+        return f"Stub {name.replace('_', ' ')} {index + 1} ({rng.randint(1000, 9999)})"
+
+    def _content(self, kwargs: Dict) -> str:
+        rng = random.Random(self._seed(kwargs["messages"]))
+        schema = self._reply_schema(kwargs)
+        if schema is None:
+            return f"Stub reply {rng.randint(1000, 9999)}"
+        return json.dumps(self._sample(schema, schema.get("$defs", {}), rng, "reply"), ensure_ascii=False)
+
+    @staticmethod
+    def _usage(kwargs: Dict, content: str) -> CompletionUsage:
+        prompt_tokens = sum(len(m.get("content") or "") for m in kwargs["messages"]) // 4 + 1
+        completion_tokens = len(content) // 4 + 1
+        return CompletionUsage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens
+        )
+
+    async def chat_completion(self, **kwargs):
+        latency = self._latency()
+        self._maybe_fail()
+        content = self._content(kwargs)
+        usage = self._usage(kwargs, content)
+        completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        model = kwargs.get("model") or "stub"
+
+        if not kwargs.get("stream"):
+            await asyncio.sleep(latency)
+            return ChatCompletion(
+                id=completion_id,
+                object="chat.completion",
+                created=created,
+                model=model,
+                choices=[Choice(
+                    index=0,
+                    finish_reason="stop",
+                    message=ChatCompletionMessage(role="assistant", content=content)
+                )],
+                usage=usage
+            )
+
+        pieces = [content[i:i + STUB_STREAM_CHUNK_CHARS] for i in range(0, len(content), STUB_STREAM_CHUNK_CHARS)]
+        chunks = [
+            ChatCompletionChunk(
+                id=completion_id,
+                object="chat.completion.chunk",
+                created=created,
+                model=model,
+                choices=[ChunkChoice(
+                    index=0,
+                    delta=ChoiceDelta(content=piece),
+                    finish_reason="stop" if i == len(pieces) - 1 else None
+                )]
+            )
+            for i, piece in enumerate(pieces)
+        ]
+        if (kwargs.get("stream_options") or {}).get("include_usage"):
+            chunks.append(ChatCompletionChunk(
+                id=completion_id,
+                object="chat.completion.chunk",
+                created=created,
+                model=model,
+                choices=[],
+                usage=usage
+            ))
+
+        # Time to first token, then the rest of the latency spread over the chunks
+        await asyncio.sleep(latency / 3)
+        return _StubStream(chunks, (latency * 2 / 3) / max(1, len(chunks)))
+
+    async def embedding(self, model: str, text: str) -> List[float]:
+        await asyncio.sleep(self._latency() / 10)
+        self._maybe_fail()
+        vector = np.random.default_rng(self._seed(model, text)).standard_normal(STUB_EMBEDDING_DIMENSIONS)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    async def speech_to_file(self, file_path: Path, **kwargs) -> None:
+        await asyncio.sleep(self._latency())
+        self._maybe_fail()
+        # Not playable audio; enough for the storage and serving paths
+        Path(file_path).write_bytes(b"STUB-AUDIO " + json.dumps(kwargs, ensure_ascii=False).encode("utf-8"))
+
+
+LLM_BACKENDS = {
+    OpenAIBackend.name: OpenAIBackend,
+    StubBackend.name: StubBackend
+}
+
+
+def create_backend(name: str) -> LLMBackend:
+    """Instantiate the backend selected by LLM_BACKEND"""
+    if name not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM backend: {name}")
+    logger.info(f"Using LLM backend: {name}")
+    return LLM_BACKENDS[name]()
@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+from app.tools.llm_backends import LLMBackend, create_backend
+from app.tools.token_budget import token_budget
+from app.tools.llm_resilience import llm_resilience
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMClient:
+    """
+    Process-wide async LLM client shared by all AI tools
+
+    - Calls go to the LLM_BACKEND backend (see llm_backends): the OpenAI API,
+      or the deterministic offline stub used for load tests
+    - One httpx connection pool with keep-alive, so TLS connections are reused
+      across tools and requests
+    - At most OPENAI_MAX_CONCURRENT_REQUESTS calls in flight; further calls wait
+      for a slot instead of opening more connections
+    - Chat completions are admitted by the per-minute token budget and their
+      usage is recorded (see token_budget)
+    - Every call goes through the retry/hedging/circuit-breaker policy
+      (see llm_resilience); the SDK's own retries are disabled
+    - Created lazily on first use and closed at application shutdown
+    """
+
+    def __init__(self):
+        self._backend: Optional[LLMBackend] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._waiting = 0
+        self._counters = {"completed": 0, "failed": 0}
+
+    @property
+    def backend(self) -> LLMBackend:
+        if self._backend is None:
+            self._backend = create_backend(settings.LLM_BACKEND)
+        return self._backend
+
+    def _slot(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENT_REQUESTS)
+        return self._semaphore
+
+    @asynccontextmanager
+    async def _request_slot(self):
+        """Hold one of the OPENAI_MAX_CONCURRENT_REQUESTS slots for the duration of a call"""
+        semaphore = self._slot()
+        self._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        try:
+            yield
+        except Exception:
+            self._counters["failed"] += 1
+            raise
+        else:
+            self._counters["completed"] += 1
+        finally:
+            self._in_flight -= 1
+            semaphore.release()
+
+    async def _run(self, call, hedge_key: Optional[str] = None):
+        """Run an API call in a request slot; retries and hedges each take their own slot"""
+        async def attempt():
+            async with self._request_slot():
+                return await call()
+
+        return await llm_resilience.call(attempt, hedge_key)
+
+    async def _reserve_tokens(self, kwargs: Dict) -> Dict:
+        tokens = token_budget.estimate_prompt_tokens(kwargs["messages"]) \
+            + (kwargs.get("max_tokens") or settings.OPENAI_MAX_OUTPUT_TOKENS)
+        return await token_budget.reserve(tokens)
+
+    async def chat_completion(self, plan: Optional[Dict] = None, **kwargs):
+        """
+        Create a chat completion
+
+        Args:
+            plan: token_budget.plan() the max_tokens came from, for usage tracking
+            **kwargs: Arguments for backend.chat_completion
+
+        Returns:
+            ChatCompletion response
+        """
+        reservation = await self._reserve_tokens(kwargs)
+        start = time.perf_counter()
+        try:
+            response = await self._run(
+                lambda: self.backend.chat_completion(**kwargs),
+                hedge_key=plan["tool"] if plan else "other"
+            )
+        except Exception:
+            token_budget.settle(reservation, token_budget.estimate_prompt_tokens(kwargs["messages"]))
+            raise
+
+        usage = response.usage
+        token_budget.settle(reservation, usage.total_tokens if usage else reservation["tokens"])
+        await token_budget.record(
+            plan,
+            kwargs.get("model"),
+            usage.prompt_tokens if usage else 0,
+            usage.completion_tokens if usage else 0,
+            kwargs.get("max_tokens"),
+            response.choices[0].finish_reason if response.choices else None,
+            (time.perf_counter() - start) * 1000
+        )
+        return response
+
+    async def stream_chat_completion(self, plan: Optional[Dict] = None, **kwargs) -> AsyncIterator[str]:
+        """
+        Create a streaming chat completion
+
+        The concurrency slot is held until the stream is exhausted or closed.
+
+        Args:
+            plan: token_budget.plan() the max_tokens came from, for usage tracking
+            **kwargs: Arguments for backend.chat_completion (without stream)
+
+        Yields:
+            Content deltas as they arrive
+        """
+        reservation = await self._reserve_tokens(kwargs)
+        start = time.perf_counter()
+        usage = None
+        finish_reason = None
+        try:
+            async with self._request_slot():
+                # Only opening the stream is retried; content already yielded can't be taken back
+                stream = await llm_resilience.call(lambda: self.backend.chat_completion(
+                    stream=True, stream_options={"include_usage": True}, **kwargs
+                ))
+                async with stream:
+                    async for chunk in stream:
+                        if chunk.usage:
+                            # Final chunk, no choices
+                            usage = chunk.usage
+                        if chunk.choices and chunk.choices[0].finish_reason:
+                            finish_reason = chunk.choices[0].finish_reason
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            yield chunk.choices[0].delta.content
+        finally:
+            token_budget.settle(
+                reservation,
+                usage.total_tokens if usage else token_budget.estimate_prompt_tokens(kwargs["messages"])
+            )
+
+        if usage:
+            await token_budget.record(
+                plan,
+                kwargs.get("model"),
+                usage.prompt_tokens,
+                usage.completion_tokens,
+                kwargs.get("max_tokens"),
+                finish_reason,
+                (time.perf_counter() - start) * 1000
+            )
+
+    async def embedding(self, text: str, model: str) -> List[float]:
+        """
+        Embed a single text
+
+        Args:
+            text: Text to embed
+            model: Embedding model name
+
+        Returns:
+            Embedding vector
+        """
+        return await self._run(lambda: self.backend.embedding(model, text))
+
+    async def speech_to_file(self, file_path: Path, **kwargs) -> None:
+        """
+        Synthesize speech and stream it straight to a file
+
+        Args:
+            file_path: Destination audio file
+            **kwargs: Arguments for backend.speech_to_file
+        """
+        await self._run(lambda: self.backend.speech_to_file(file_path, **kwargs))
+
+    async def close(self) -> None:
+        if self._backend is not None:
+            await self._backend.close()
+            self._backend = None
+            logger.info("Closed shared LLM backend")
+
+    def stats(self) -> Dict:
+        return {
+            "max_concurrent_requests": settings.OPENAI_MAX_CONCURRENT_REQUESTS,
+            "max_connections": settings.OPENAI_MAX_CONNECTIONS,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "backend": settings.LLM_BACKEND,
+            **self._counters
+        }
+
+
+llm_client = LLMClient()
@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+import httpx
+import openai
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class LLMUnavailableError(Exception):
+    """Raised without calling the API while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated upstream failures
+
+    Opens after LLM_BREAKER_FAILURE_THRESHOLD consecutive retryable failures.
+    After LLM_BREAKER_RESET_SECONDS one probe call is let through (half-open):
+    success closes the breaker, failure opens it again.
+    """
+
+    def __init__(self):
+        self.state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._counters = {"opened": 0, "rejected": 0}
+
+    def before_call(self) -> None:
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < settings.LLM_BREAKER_RESET_SECONDS:
+                self._counters["rejected"] += 1
+                raise LLMUnavailableError("AI service is temporarily unavailable, please retry shortly")
+            self.state = HALF_OPEN
+
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self._counters["rejected"] += 1
+                raise LLMUnavailableError("AI service is recovering, please retry shortly")
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info("LLM circuit breaker closed")
+        self.state = CLOSED
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """The probe call was cancelled before it could tell us anything"""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self._consecutive_failures >= settings.LLM_BREAKER_FAILURE_THRESHOLD:
+            if self.state != OPEN:
+                self._counters["opened"] += 1
+                logger.warning(f"LLM circuit breaker opened after {self._consecutive_failures} consecutive failures")
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            **self._counters
+        }
+
+
+class LLMResilience:
+    """
+    Retry, hedging and circuit-breaker policy around every OpenAI call
+
+    - Retryable errors (connection errors, timeouts, 429 and 5xx) are retried
+      OPENAI_MAX_RETRIES times with full-jitter exponential backoff, honouring
+      Retry-After on rate limits
+    - With LLM_HEDGING_ENABLED, a chat completion still running after the
+      recent p95 latency for its tool gets a second, identical request; the
+      first to succeed wins and the other is cancelled
+    - The circuit breaker rejects calls immediately while the API is failing
+    """
+
+    def __init__(self):
+        self.breaker = CircuitBreaker()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._counters = {"retries": 0, "hedges": 0, "hedge_wins": 0}
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError, httpx.TransportError)):
+            return True
+        if isinstance(error, openai.APIStatusError):
+            return error.status_code in RETRYABLE_STATUS_CODES
+        return False
+
+    @staticmethod
+    def retry_delay(attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff; a server-sent Retry-After takes precedence"""
+        if isinstance(error, openai.APIStatusError):
+            retry_after = error.response.headers.get("retry-after")
+            try:
+                if retry_after is not None:
+                    return min(float(retry_after), settings.LLM_RETRY_MAX_SECONDS)
+            except ValueError:
+                pass
+        ceiling = min(settings.LLM_RETRY_MAX_SECONDS, settings.LLM_RETRY_BASE_SECONDS * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def _p95(self, key: str) -> Optional[float]:
+        samples = self._latencies.get(key)
+        if not samples or len(samples) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """Seconds to wait before hedging, or None when hedging is off or history is too short"""
+        if not settings.LLM_HEDGING_ENABLED:
+            return None
+        p95 = self._p95(key)
+        return max(p95, settings.LLM_HEDGE_MIN_DELAY_SECONDS) if p95 is not None else None
+
+    def _record_latency(self, key: str, seconds: float) -> None:
+        if key not in self._latencies:
+            self._latencies[key] = deque(maxlen=200)
+        self._latencies[key].append(seconds)
+
+    async def _hedged(self, attempt: Callable[[], Awaitable], delay: float):
+        first = asyncio.create_task(attempt())
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+
+        self._counters["hedges"] += 1
+        hedge = asyncio.create_task(attempt())
+        pending = {first, hedge}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._counters["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in (first, hedge):
+                task.cancel()
+
+    async def call(self, attempt: Callable[[], Awaitable], hedge_key: Optional[str] = None):
+        """
+        Run an API call under the retry/hedging/breaker policy
+
+        Args:
+            attempt: Makes one API request (called again for retries and hedges)
+            hedge_key: Latency history to hedge against (chat completions only)
+
+        Returns:
+            The attempt's result
+
+        Raises:
+            LLMUnavailableError: The circuit breaker is open
+        """
+        for retry in range(settings.OPENAI_MAX_RETRIES + 1):
+            self.breaker.before_call()
+            start = time.perf_counter()
+            try:
+                delay = self.hedge_delay(hedge_key) if hedge_key else None
+                result = await (self._hedged(attempt, delay) if delay else attempt())
+            except asyncio.CancelledError:
+                self.breaker.release_probe()
+                raise
+            except Exception as e:
+                if not self.is_retryable(e):
+                    if isinstance(e, openai.APIStatusError) and e.status_code < 500:
+                        # The API answered (e.g. 400): upstream is healthy
+                        self.breaker.record_success()
+                    else:
+                        # Raised on our side (bad arguments, response parsing): says nothing about upstream
+                        self.breaker.release_probe()
+                    raise
+                self.breaker.record_failure()
+                if retry == settings.OPENAI_MAX_RETRIES or self.breaker.state == OPEN:
+                    raise
+                wait = self.retry_delay(retry, e)
+                self._counters["retries"] += 1
+                logger.warning(f"LLM call failed ({type(e).__name__}), retry {retry + 1} in {wait:.2f}s")
+                await asyncio.sleep(wait)
+                continue
+
+            self.breaker.record_success()
+            if hedge_key:
+                self._record_latency(hedge_key, time.perf_counter() - start)
+            return result
+
+    def stats(self) -> Dict:
+        return {
+            "breaker": self.breaker.stats(),
+            "hedging_enabled": settings.LLM_HEDGING_ENABLED,
+            "p95_latency_ms": {
+                key: round(p95 * 1000, 1)
+                for key in self._latencies
+                if (p95 := self._p95(key)) is not None
+            },
+            **self._counters
+        }
+
+
+llm_resilience = LLMResilience()
@@ -1,34 +1,55 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from gtts import gTTS
 from pathlib import Path
-import uuid
-from typing import Dict
+from typing import Optional
+from app.tools.tts_engine import TTSEngine
 from app.config import settings
 
-class LocalTTS:
+class LocalTTS(TTSEngine):
     """Free Text-to-Speech using Google TTS (gTTS)"""
 
-    def __init__(self):
-        self.audio_dir = Path(settings.STORAGE_PATH) / "audio"
-        self.audio_dir.mkdir(parents=True, exist_ok=True)
+    engine = "gtts"
+    voice = "default"
 
-    def generate_audio(
+    # Shared by all instances: TTS_WORKERS chunks are synthesised at a time
+    _executor: Optional[ThreadPoolExecutor] = None
+
+    async def synthesize_async(
+        self,
+        narration: str,
+        language: str,
+        audio_path: Path
+    ) -> None:
+        """Run synthesize() on the TTS thread pool, off the event loop"""
+        if LocalTTS._executor is None:
+            LocalTTS._executor = ThreadPoolExecutor(max_workers=settings.TTS_WORKERS, thread_name_prefix="tts")
+        await asyncio.get_running_loop().run_in_executor(
+            LocalTTS._executor, self.synthesize, narration, language, audio_path
+        )
+
+    @classmethod
+    def shutdown(cls) -> None:
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+
+    def synthesize(
         self,
-        solution_data: Dict,
-        language: str
-    ) -> str:
+        narration: str,
+        language: str,
+        audio_path: Path
+    ) -> None:
         """
-        Convert solution to audio using gTTS (Free)
+        Convert narration to an MP3 file using gTTS (Free)
+
+        Blocking network I/O: run it off the event loop.
 
         Args:
-            solution_data: Solution dictionary with steps
+            narration: Text to speak (see narration_chunks)
             language: Language code (en/ta/hi)
-
-        Returns:
-            Audio file URL path
+            audio_path: Destination file
         """
-        # Format solution for speech
-        narration = self._format_for_speech(solution_data)
-
         # Map language codes to gTTS language codes
         gtts_lang_map = {
             "en": "en",
@@ -40,25 +61,7 @@ class LocalTTS:
         try:
             # Generate audio using gTTS
             tts = gTTS(text=narration, lang=gtts_lang, slow=False)
-
-            # Save audio file
-            audio_filename = f"{uuid.uuid4()}.mp3"
-            audio_path = self.audio_dir / audio_filename
-
             tts.save(str(audio_path))
 
-            return f"/api/solution/audio/{audio_filename}"
-
         except Exception as e:
             raise Exception(f"Error generating audio with gTTS: {str(e)}")
-
-    def _format_for_speech(self, solution_data: Dict) -> str:
-        """Format solution steps into natural speech"""
-        narration = "Let me explain this step by step. "
-
-        for step in solution_data.get("solution_steps", []):
-            narration += f"Step {step['step_number']}: {step['explanation']}. "
-
-        narration += f"So the final answer is: {solution_data.get('final_answer', '')}."
-
-        return narration
@@ -0,0 +1,223 @@
+import copy
+import json
+from typing import Dict, List, Optional, Type
+from pydantic import BaseModel, create_model
+from app.schemas.solution import SolutionStep
+from app.schemas.practice import Question
+from app.schemas.flashcard import Flashcard
+from app.config import settings
+
+LANGUAGE_NAMES = {
+    "en": "English",
+    "ta": "Tamil",
+    "hi": "Hindi"
+}
+
+
+def _without(model: Type[BaseModel], *fields: str) -> Type[BaseModel]:
+    """Copy of a model without the fields we fill in ourselves (IDs)"""
+    return create_model(
+        f"Generated{model.__name__}",
+        **{name: (field.annotation, field) for name, field in model.model_fields.items() if name not in fields}
+    )
+
+
+# Model replies, validated straight into the existing schema models
+GeneratedQuestion = _without(Question, "question_id")
+GeneratedFlashcard = _without(Flashcard, "card_id")
+
+
+class SolutionReply(BaseModel):
+    solution_steps: List[SolutionStep]
+    final_answer: str
+    concepts_covered: List[str]
+
+
+class PracticeReply(BaseModel):
+    questions: List[GeneratedQuestion]
+
+
+class FlashcardReply(BaseModel):
+    cards: List[GeneratedFlashcard]
+
+
+class StudyPackReply(SolutionReply):
+    practice_questions: List[GeneratedQuestion]
+    flashcards: List[GeneratedFlashcard]
+
+
+def strict_json_schema(model: Type[BaseModel]) -> Dict:
+    """
+    JSON schema for OpenAI strict structured outputs
+
+    Strict mode needs every property listed as required, no additional
+    properties and no defaults; optional fields stay nullable.
+    """
+    schema = copy.deepcopy(model.model_json_schema())
+
+    def tighten(node):
+        if isinstance(node, dict):
+            node.pop("default", None)
+            if node.get("type") == "object" and "properties" in node:
+                node["additionalProperties"] = False
+                node["required"] = list(node["properties"])
+            for value in node.values():
+                tighten(value)
+        elif isinstance(node, list):
+            for value in node:
+                tighten(value)
+
+    tighten(schema)
+    return schema
+
+
+class PromptTemplate:
+    """
+    Chat prompt split into a static prefix and a per-request part
+
+    The system message (role plus all instructions) depends only on the
+    output language and is rendered once per language; the
+    question-specific values go in the user message, last.
+    """
+
+    def __init__(self, name: str, instructions: str, request: str, reply_model: Type[BaseModel]):
+        self.name = name
+        self.instructions = instructions
+        self.request = request
+        self.reply_model = reply_model
+        self._prefixes: Dict[str, str] = {}
+        self._response_format: Optional[Dict] = None
+
+    def system_prompt(self, output_language: str) -> str:
+        if output_language not in self._prefixes:
+            prefix = self.instructions.format(language=LANGUAGE_NAMES[output_language])
+            if not settings.OPENAI_STRUCTURED_OUTPUTS:
+                # json_object mode: the schema has to be spelled out in the prompt
+                prefix += f"\n\nReturn JSON matching this schema:\n{json.dumps(strict_json_schema(self.reply_model))}"
+            self._prefixes[output_language] = prefix
+        return self._prefixes[output_language]
+
+    def messages(self, output_language: str, **values) -> List[Dict]:
+        return [
+            {"role": "system", "content": self.system_prompt(output_language)},
+            {"role": "user", "content": self.request.format(**values)}
+        ]
+
+    @property
+    def response_format(self) -> Dict:
+        """Strict JSON schema of the reply model (json_object mode if structured outputs are off)"""
+        if not settings.OPENAI_STRUCTURED_OUTPUTS:
+            return {"type": "json_object"}
+        if self._response_format is None:
+            self._response_format = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": self.name,
+                    "strict": True,
+                    "schema": strict_json_schema(self.reply_model)
+                }
+            }
+        return self._response_format
+
+    def parse(self, message) -> BaseModel:
+        """
+        Validate a chat completion message into the reply model
+
+        Raises:
+            Exception: The model refused or the reply doesn't match the schema
+        """
+        if getattr(message, "refusal", None):
+            raise Exception(f"Model refused: {message.refusal}")
+        return self.reply_model.model_validate_json(message.content)
+
+
+SOLUTION_PROMPT = PromptTemplate(
+    name="solution",
+    instructions="""You are a patient, friendly homework tutor. Always respond in {language}.
+
+Provide a detailed, step-by-step solution suitable for a child. Use simple, easy-to-understand language.
+
+IMPORTANT: Generate the ENTIRE explanation in {language} language.
+
+- solution_steps: numbered steps, each with a clear explanation in {language} and the formula used (or null)
+- final_answer: the final answer in {language}
+- concepts_covered: the concepts the question practises, in {language}
+
+Make sure ALL text content is in {language}.""",
+    request="""Grade level: {grade_level}
+Subject: {subject}
+Question: {question}""",
+    reply_model=SolutionReply
+)
+
+PRACTICE_PROMPT = PromptTemplate(
+    name="practice_questions",
+    instructions="""You create practice questions for students. Always respond in {language}.
+
+Generate EXACTLY the requested number of questions - no more, no less.
+
+Distribute question types approximately as follows:
+- ~50% Multiple Choice Questions (mcq) with exactly 4 options
+- ~30% Fill in the blank questions (fill_blank, options null)
+- ~20% True/False questions (true_false, options ["True", "False"])
+
+For small question counts (1-3), adjust the distribution but NEVER exceed the requested count.
+
+For every question give the correct answer (the option text, the missing word or phrase, or True/False)
+and an explanation of why it is correct.
+
+IMPORTANT: Generate ALL content in {language} language.""",
+    request="""Create practice questions for a student learning about: {topic}
+
+Subject: {subject}
+Difficulty: {difficulty}
+Number of questions: {question_count}""",
+    reply_model=PracticeReply
+)
+
+FLASHCARD_PROMPT = PromptTemplate(
+    name="flashcards",
+    instructions="""You create educational flashcards. Always respond in {language}.
+
+Based on a homework solution, create 5-10 flashcards for studying that cover:
+- Key concepts and definitions
+- Important formulas (if applicable)
+- Key terms and their meanings
+- Important facts to remember
+
+Each card has a question or term on the front and the answer or definition on the back.
+
+IMPORTANT: Generate ALL content in {language} language.""",
+    request="""Question: {question}
+Subject: {subject}
+Concepts covered: {concepts}""",
+    reply_model=FlashcardReply
+)
+
+STUDY_PACK_PROMPT = PromptTemplate(
+    name="study_pack",
+    instructions="""You are a patient homework tutor who also creates practice questions and flashcards. Always respond in {language}.
+
+Create a complete study pack for the question:
+
+1. solution_steps, final_answer, concepts_covered: a detailed, step-by-step solution suitable for a child,
+   in simple, easy-to-understand language, with the formula used in each step (or null).
+2. practice_questions: EXACTLY the requested number of practice questions on the same concepts - no more, no less.
+   Use roughly 50% multiple choice (mcq, exactly 4 options), 30% fill in the blank (fill_blank, options null)
+   and 20% true/false (true_false, options ["True", "False"]).
+   For small question counts (1-3), adjust the distribution but NEVER exceed the requested count.
+3. flashcards: 5-10 flashcards covering key concepts, formulas, terms and facts from the solution.
+
+IMPORTANT: Generate ALL content in {language} language.""",
+    request="""Grade level: {grade_level}
+Subject: {subject}
+Question: {question}
+Number of practice questions: {question_count}
+Practice question difficulty: {difficulty}""",
+    reply_model=StudyPackReply
+)
+
+PROMPT_TEMPLATES = {
+    template.name: template
+    for template in (SOLUTION_PROMPT, PRACTICE_PROMPT, FLASHCARD_PROMPT, STUDY_PACK_PROMPT)
+}
@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional
+from app.database.mongodb import get_database
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Output size model per tool: base tokens + tokens per unit, where a unit is
+# a solution part, practice question or flashcard set (see plan())
+OUTPUT_PROFILES = {
+    "solver": {"base": 300, "per_unit": 350},
+    "practice": {"base": 100, "per_unit": 160},
+    "flashcards": {"base": 100, "per_unit": 700},
+    "study_pack": {"base": 1400, "per_unit": 160},
+    "other": {"base": 500, "per_unit": 500}
+}
+
+# Tamil and Hindi text takes more tokens than English for the same content
+LANGUAGE_TOKEN_FACTORS = {"en": 1.0, "hi": 1.5, "ta": 1.8}
+
+# Prompt characters per token (conservative for mixed English/Indic prompts)
+PROMPT_CHARS_PER_TOKEN = 3
+
+
+class TokenBudget:
+    """
+    Output token sizing and per-minute token budgeting for LLM calls
+
+    - plan() sizes max_tokens from the request (question length, question
+      count, output language) instead of a fixed ceiling. Once a tool/language
+      pair has TOKEN_BUDGET_MIN_SAMPLES recorded calls, the estimate is scaled
+      by the p95 of actual/estimated completion tokens.
+    - reserve() admits calls in FIFO order while the last minute's tokens and
+      requests stay under TOKEN_BUDGET_TOKENS_PER_MINUTE and
+      TOKEN_BUDGET_REQUESTS_PER_MINUTE. Calls over the budget wait for the
+      window to drain instead of failing.
+    - record() stores tokens, latency and cost per call in the `llm_usage`
+      collection.
+    """
+
+    def __init__(self):
+        self._window: Deque[Dict] = deque()
+        self._admission: Optional[asyncio.Lock] = None
+        self._released: Optional[asyncio.Event] = None
+        self._waiting = 0
+        self._ratios: Dict[str, Deque[float]] = {}
+        self._counters = {"reserved": 0, "queued": 0, "truncated": 0}
+
+    @staticmethod
+    def _history_key(tool: str, language: Optional[str]) -> str:
+        return f"{tool}|{language or 'en'}"
+
+    def _history(self, tool: str, language: Optional[str]) -> Deque[float]:
+        key = self._history_key(tool, language)
+        if key not in self._ratios:
+            self._ratios[key] = deque(maxlen=settings.TOKEN_BUDGET_HISTORY)
+        return self._ratios[key]
+
+    def plan(self, tool: str, language: Optional[str], units: int = 1) -> Dict:
+        """
+        Size max_tokens for one call
+
+        Args:
+            tool: Key in OUTPUT_PROFILES
+            language: Output language (en/ta/hi)
+            units: Solution parts, practice questions, ... (see OUTPUT_PROFILES)
+
+        Returns:
+            Dict with tool, language, estimate (heuristic output tokens) and max_tokens
+        """
+        profile = OUTPUT_PROFILES.get(tool, OUTPUT_PROFILES["other"])
+        estimate = (profile["base"] + profile["per_unit"] * max(1, units)) \
+            * LANGUAGE_TOKEN_FACTORS.get(language or "en", 1.5)
+
+        scale = settings.TOKEN_BUDGET_HEADROOM
+        history = self._ratios.get(self._history_key(tool, language), ())
+        if len(history) >= settings.TOKEN_BUDGET_MIN_SAMPLES:
+            ordered = sorted(history)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            scale = max(0.5, p95) * settings.TOKEN_BUDGET_HEADROOM
+
+        max_tokens = int(math.ceil(estimate * scale))
+        max_tokens = max(settings.TOKEN_BUDGET_MIN_OUTPUT_TOKENS, min(settings.OPENAI_MAX_OUTPUT_TOKENS, max_tokens))
+        return {"tool": tool, "language": language, "estimate": int(estimate), "max_tokens": max_tokens}
+
+    @staticmethod
+    def estimate_prompt_tokens(messages: List[Dict]) -> int:
+        return sum(len(m.get("content") or "") for m in messages) // PROMPT_CHARS_PER_TOKEN + 10 * len(messages)
+
+    def _expire(self, now: float) -> None:
+        while self._window and self._window[0]["at"] <= now - 60:
+            self._window.popleft()
+
+    async def reserve(self, tokens: int) -> Dict:
+        """
+        Wait until `tokens` fit in the per-minute budget and reserve them
+
+        A single call larger than the whole budget is admitted once the window
+        is empty.
+
+        Returns:
+            Reservation to pass to settle() once actual usage is known
+        """
+        if self._admission is None:
+            self._admission = asyncio.Lock()
+            self._released = asyncio.Event()
+
+        token_limit = settings.TOKEN_BUDGET_TOKENS_PER_MINUTE
+        request_limit = settings.TOKEN_BUDGET_REQUESTS_PER_MINUTE
+
+        self._waiting += 1
+        try:
+            # Holding the lock while waiting keeps admission first come, first served
+            async with self._admission:
+                queued = False
+                while True:
+                    now = time.monotonic()
+                    self._expire(now)
+                    used = sum(entry["tokens"] for entry in self._window)
+                    over_tokens = token_limit and used + tokens > token_limit
+                    over_requests = request_limit and len(self._window) >= request_limit
+                    if not self._window or not (over_tokens or over_requests):
+                        break
+
+                    if not queued:
+                        queued = True
+                        self._counters["queued"] += 1
+                    # Wake when the oldest entry leaves the window or a call settles below its reservation
+                    self._released.clear()
+                    try:
+                        await asyncio.wait_for(self._released.wait(), timeout=self._window[0]["at"] + 60 - now)
+                    except asyncio.TimeoutError:
+                        pass
+
+                reservation = {"at": time.monotonic(), "tokens": tokens}
+                self._window.append(reservation)
+                self._counters["reserved"] += 1
+                return reservation
+        finally:
+            self._waiting -= 1
+
+    def settle(self, reservation: Dict, tokens: int) -> None:
+        """Replace a reservation with the tokens actually used"""
+        if tokens < reservation["tokens"] and self._released is not None:
+            self._released.set()
+        reservation["tokens"] = tokens
+
+    async def record(
+        self,
+        plan: Optional[Dict],
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        max_tokens: Optional[int],
+        finish_reason: Optional[str],
+        latency_ms: float
+    ) -> None:
+        """Learn from one completed call and store its usage"""
+        tool = plan["tool"] if plan else "other"
+        language = plan["language"] if plan else None
+        truncated = finish_reason == "length"
+        if truncated:
+            self._counters["truncated"] += 1
+
+        if plan and plan["estimate"]:
+            ratio = completion_tokens / plan["estimate"]
+            # A truncated answer needed more than it got
+            self._history(tool, language).append(ratio * 1.5 if truncated else ratio)
+
+        cost = (
+            prompt_tokens * settings.OPENAI_INPUT_COST_PER_MILLION
+            + completion_tokens * settings.OPENAI_OUTPUT_COST_PER_MILLION
+        ) / 1_000_000
+
+        try:
+            await get_database().llm_usage.insert_one({
+                "tool": tool,
+                "language": language,
+                "model": model,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "estimated_tokens": plan["estimate"] if plan else None,
+                "max_tokens": max_tokens,
+                "truncated": truncated,
+                "latency_ms": round(latency_ms, 1),
+                "cost_usd": round(cost, 6),
+                "created_at": datetime.utcnow()
+            })
+        except Exception as e:
+            # Usage accounting must never fail the request
+            logger.warning(f"Could not record LLM usage: {str(e)}")
+
+    async def ensure_indexes(self, db) -> None:
+        await db.llm_usage.create_index("created_at", expireAfterSeconds=settings.TOKEN_USAGE_RETENTION_SECONDS)
+        await db.llm_usage.create_index([("tool", 1), ("language", 1), ("created_at", -1)])
+
+    async def load_history(self, db) -> None:
+        """Rebuild the actual/estimated ratios from recent usage (called at startup)"""
+        cursor = db.llm_usage.find(
+            {"estimated_tokens": {"$gt": 0}},
+            {"tool": 1, "language": 1, "completion_tokens": 1, "estimated_tokens": 1, "truncated": 1}
+        ).sort("created_at", -1).limit(settings.TOKEN_BUDGET_HISTORY * len(OUTPUT_PROFILES) * 3)
+
+        samples = 0
+        async for usage in cursor:
+            history = self._history(usage["tool"], usage["language"])
+            if len(history) < settings.TOKEN_BUDGET_HISTORY:
+                ratio = usage["completion_tokens"] / usage["estimated_tokens"]
+                history.appendleft(ratio * 1.5 if usage.get("truncated") else ratio)
+                samples += 1
+        logger.info(f"Loaded {samples} LLM usage samples for max_tokens sizing")
+
+    async def usage_summary(self, db, minutes: int = 60) -> List[Dict]:
+        """Tokens, cost and latency per tool and language over the last `minutes`"""
+        since = datetime.utcnow() - timedelta(minutes=minutes)
+        rows = await db.llm_usage.aggregate([
+            {"$match": {"created_at": {"$gte": since}}},
+            {"$group": {
+                "_id": {"tool": "$tool", "language": "$language"},
+                "calls": {"$sum": 1},
+                "prompt_tokens": {"$sum": "$prompt_tokens"},
+                "completion_tokens": {"$sum": "$completion_tokens"},
+                "max_tokens": {"$sum": "$max_tokens"},
+                "truncated": {"$sum": {"$cond": ["$truncated", 1, 0]}},
+                "cost_usd": {"$sum": "$cost_usd"},
+                "avg_latency_ms": {"$avg": "$latency_ms"},
+                "max_latency_ms": {"$max": "$latency_ms"}
+            }},
+            {"$sort": {"cost_usd": -1}}
+        ]).to_list(length=None)
+
+        return [
+            {
+                "tool": row["_id"]["tool"],
+                "language": row["_id"]["language"],
+                "calls": row["calls"],
+                "prompt_tokens": row["prompt_tokens"],
+                "completion_tokens": row["completion_tokens"],
+                # Share of the max_tokens allowance actually used
+                "max_tokens_utilization": round(row["completion_tokens"] / row["max_tokens"], 3) if row["max_tokens"] else None,
+                "truncated": row["truncated"],
+                "cost_usd": round(row["cost_usd"], 4),
+                "avg_latency_ms": round(row["avg_latency_ms"], 1),
+                "max_latency_ms": row["max_latency_ms"]
+            }
+            for row in rows
+        ]
+
+    def stats(self) -> Dict:
+        self._expire(time.monotonic())
+        return {
+            "tokens_per_minute_limit": settings.TOKEN_BUDGET_TOKENS_PER_MINUTE,
+            "requests_per_minute_limit": settings.TOKEN_BUDGET_REQUESTS_PER_MINUTE,
+            "window_tokens": sum(entry["tokens"] for entry in self._window),
+            "window_requests": len(self._window),
+            "waiting": self._waiting,
+            "samples": {key: len(history) for key, history in self._ratios.items()},
+            **self._counters
+        }
+
+
+token_budget = TokenBudget()
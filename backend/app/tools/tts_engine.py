@@ -0,0 +1,112 @@
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List
+
+
+class TTSEngine(ABC):
+    """
+    Text-to-speech backend interface
+
+    Subclasses set `engine` (the name requests select it by, also part of the
+    audio cache key) and `voice`, and implement synthesize_async(). `voice`
+    is part of the cache key too, so it must change with every setting that
+    changes the audio. Narration text is built here so every engine speaks
+    the same chunks.
+    """
+
+    engine = "base"
+    voice = "default"
+    offline = False
+
+    @abstractmethod
+    async def synthesize_async(self, narration: str, language: str, audio_path: Path) -> None:
+        """Write the narration as MP3 to audio_path without blocking the event loop"""
+
+    async def render(self, narration: str, language: str, audio_path: Path) -> None:
+        """synthesize_async() with per-engine latency recorded in tts_latency"""
+        start = time.perf_counter()
+        try:
+            await self.synthesize_async(narration, language, audio_path)
+        except Exception:
+            tts_latency.record(self.engine, language, time.perf_counter() - start, len(narration), failed=True)
+            raise
+        tts_latency.record(self.engine, language, time.perf_counter() - start, len(narration))
+
+    @classmethod
+    async def start(cls) -> None:
+        """Warm up workers (engines with a pool)"""
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop workers (engines with a pool)"""
+
+    def narration_chunks(self, solution_data: Dict) -> List[str]:
+        """
+        Split the narration into separately synthesised chunks
+
+        One chunk per solution step (the first one carries the introduction)
+        plus the final answer, so playback can start after step 1 and an
+        edited step only re-synthesises its own chunk.
+        """
+        chunks = [
+            f"Step {step['step_number']}: {step['explanation']}."
+            for step in solution_data.get("solution_steps", [])
+        ]
+        chunks.append(f"So the final answer is: {solution_data.get('final_answer', '')}.")
+        chunks[0] = f"Let me explain this step by step. {chunks[0]}"
+        return chunks
+
+    def format_for_speech(self, solution_data: Dict) -> str:
+        """Format solution steps into natural speech"""
+        return " ".join(self.narration_chunks(solution_data))
+
+
+class TTSLatencyStats:
+    """Synthesis latency per engine and language (last 200 calls each)"""
+
+    def __init__(self):
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._counters: Dict[str, Dict] = {}
+
+    def record(self, engine: str, language: str, seconds: float, characters: int, failed: bool = False) -> None:
+        key = f"{engine}|{language}"
+        if key not in self._counters:
+            self._latencies[key] = deque(maxlen=200)
+            self._counters[key] = {"calls": 0, "failures": 0, "characters": 0, "seconds": 0.0}
+        counters = self._counters[key]
+        counters["calls"] += 1
+        if failed:
+            counters["failures"] += 1
+            return
+        counters["characters"] += characters
+        counters["seconds"] += seconds
+        self._latencies[key].append(seconds * 1000)
+
+    def stats(self) -> List[Dict]:
+        rows = []
+        for key, counters in self._counters.items():
+            engine, language = key.split("|")
+            ordered = sorted(self._latencies[key])
+
+            def pct(p: float):
+                return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 1) if ordered else None
+
+            rows.append({
+                "engine": engine,
+                "language": language,
+                "calls": counters["calls"],
+                "failures": counters["failures"],
+                "p50_ms": pct(0.5),
+                "p95_ms": pct(0.95),
+                "max_ms": round(ordered[-1], 1) if ordered else None,
+                # Comparable across chunk sizes
+                "ms_per_100_chars": round(
+                    counters["seconds"] * 1000 * 100 / counters["characters"], 1
+                ) if counters["characters"] else None
+            })
+        return rows
+
+
+tts_latency = TTSLatencyStats()
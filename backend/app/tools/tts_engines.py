@@ -0,0 +1,40 @@
+from typing import Dict, Optional
+from app.tools.tts_engine import TTSEngine
+from app.tools.local_tts import LocalTTS
+from app.tools.ai_tts import AITTS
+from app.tools.espeak_tts import EspeakTTS
+from app.config import settings
+
+# Engines a request can select by name (tts_engine)
+TTS_ENGINES = {engine.engine: engine for engine in (LocalTTS, AITTS, EspeakTTS)}
+
+_instances: Dict[str, TTSEngine] = {}
+
+
+def get_tts_engine(name: Optional[str] = None) -> TTSEngine:
+    """
+    Shared engine instance by name
+
+    Args:
+        name: gtts, openai or espeak (default: TTS_ENGINE)
+
+    Raises:
+        ValueError: Unknown engine
+    """
+    name = name or settings.TTS_ENGINE
+    if name not in TTS_ENGINES:
+        raise ValueError(f"Unknown TTS engine: {name}")
+    if name not in _instances:
+        _instances[name] = TTS_ENGINES[name]()
+    return _instances[name]
+
+
+async def start_tts_engines() -> None:
+    """Warm the pooled engines in TTS_PRELOAD_ENGINES (and the default engine)"""
+    for name in {settings.TTS_ENGINE, *settings.TTS_PRELOAD_ENGINES}:
+        await TTS_ENGINES[name].start()
+
+
+def shutdown_tts_engines() -> None:
+    for engine in TTS_ENGINES.values():
+        engine.shutdown()
@@ -0,0 +1,67 @@
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+from app.operations.audio_cache import AUDIO_KEY_PATTERN
+from app.config import settings
+
+# Content-addressed files never change under their name
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Older uuid-named files: cache, but revalidate (cheap with the ETag)
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored"""
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def audio_file_response(request: Request, audio_path: Path) -> Response:
+    """
+    Serve an audio file with caching, conditional GET and byte ranges
+
+    - Strong ETag from the file name, size and modification time, so a
+      regenerated file never matches an older copy
+    - If-None-Match / If-Modified-Since answer 304 without a body
+    - Range and If-Range requests get 206 partial content (seeking in the
+      player fetches only the bytes it needs)
+    - Content-addressed files are cached as immutable
+    - The body is sent with zero-copy pathsend where the ASGI server
+      supports it, or handed to nginx with X-Accel-Redirect when
+      AUDIO_X_ACCEL_PREFIX is set
+
+    Args:
+        request: Incoming request (conditional and range headers)
+        audio_path: Existing file in STORAGE_PATH/audio
+
+    Returns:
+        304, 200 or 206 response
+    """
+    stat = audio_path.stat()
+    etag = f'"{audio_path.stem[:32]}-{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if AUDIO_KEY_PATTERN.match(audio_path.name) else REVALIDATE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes"
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+    elif request.headers.get("if-modified-since"):
+        try:
+            if int(stat.st_mtime) <= parsedate_to_datetime(request.headers["if-modified-since"]).timestamp():
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+
+    if settings.AUDIO_X_ACCEL_PREFIX:
+        # nginx serves the bytes (sendfile, ranges) from its internal location
+        headers["X-Accel-Redirect"] = f"{settings.AUDIO_X_ACCEL_PREFIX.rstrip('/')}/{audio_path.name}"
+        return Response(headers=headers, media_type="audio/mpeg")
+
+    return FileResponse(path=audio_path, media_type="audio/mpeg", headers=headers, stat_result=stat)
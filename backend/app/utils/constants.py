@@ -26,3 +26,4 @@ SUBJECT_KEYWORDS = {
 # File upload settings
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tiff"}
+WORKSHEET_EXTENSIONS = ALLOWED_EXTENSIONS | {".tif", ".pdf"}
@@ -0,0 +1,30 @@
+from typing import Dict, Optional
+from fastapi.responses import JSONResponse
+from app.agents.job_agent import JobAgent
+from app.schemas.jobs import AsyncJobRequest
+
+
+async def job_accepted_response(
+    job_agent: JobAgent,
+    job_type: str,
+    request: AsyncJobRequest,
+    payload: Optional[Dict] = None
+) -> JSONResponse:
+    """
+    Queue an async_mode request as a background job
+
+    Args:
+        job_agent: Agent that enqueues the job
+        job_type: Job handler name (see JobAgent.register_handlers)
+        request: The generate request; its idempotency_key is honoured
+        payload: Handler arguments (default: the request fields)
+
+    Returns:
+        202 response with the job_id and polling URLs
+    """
+    job = await job_agent.submit(
+        job_type,
+        payload if payload is not None else request.dict(),
+        request.idempotency_key
+    )
+    return JSONResponse(status_code=202, content=job)
@@ -0,0 +1,373 @@
+"""
+Render synthetic OCR fixtures from the ground truth in fixtures/manifest.json
+
+Printed, math, Tamil and Hindi fixtures are typeset from their ground-truth
+text so the benchmark has a corpus that can be regenerated on any machine.
+`.png` fixtures are clean 300 DPI scans; `.jpg` fixtures get a phone-photo
+treatment (slight rotation, uneven lighting, blur, sensor noise, JPEG).
+Handwritten fixtures with `"source": "synthetic_handwriting"` imitate a
+pen on ruled notebook paper: every word gets its own slant, tilt, size and
+baseline offset, strokes are thinned and elastically distorted, and the ink
+is blue. They exercise the handwriting OCR paths but are no substitute for
+real photos, which go in the `"source": "photo"` entries.
+Worksheet layout fixtures put one question per paragraph so the layout
+check can count the regions LayoutSegmenter finds.
+
+Text is shaped with HarfBuzz (uharfbuzz) so Tamil and Devanagari conjuncts
+and vowel signs are laid out correctly; PIL's basic layout cannot do that
+without libraqm. Glyph outlines are rasterised with OpenCV.
+
+Usage (from the backend directory; needs `pip install uharfbuzz`):
+    python -m benchmarks.generate_fixtures --latin-font NotoSans-Regular.ttf \\
+        --tamil-font NotoSansTamil-Regular.ttf --devanagari-font NotoSansDevanagari-Regular.ttf
+    python -m benchmarks.generate_fixtures ... --only tamil_01 hindi_01
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Fixture language -> font option
+FONT_FOR_LANGUAGE = {"eng": "latin", "tam": "tamil", "hin": "devanagari"}
+
+# Page geometry at 300 DPI
+PAGE_WIDTH = 1800
+MARGIN = 120
+FONT_PX = 56
+LINE_SPACING = 1.6
+SUPERSAMPLE = 4
+SEED = 1234
+
+# Handwriting imitation: pen ink and notebook rules in BGR
+INK_BGR = (140, 60, 25)
+RULE_BGR = (225, 200, 170)
+MARGIN_RULE_BGR = (170, 170, 235)
+
+
+class TextRenderer:
+    """
+    Shapes text with HarfBuzz and draws it as filled glyph outlines
+
+    Outlines are flattened into polygons and filled at SUPERSAMPLE times the
+    target resolution, then area-downsampled for anti-aliased edges.
+    """
+
+    def __init__(self, font_path: str, font_px: int = FONT_PX):
+        import uharfbuzz as hb
+
+        self._hb = hb
+        blob = hb.Blob.from_file_path(font_path)
+        self.face = hb.Face(blob)
+        self.font = hb.Font(self.face)
+        self.scale = font_px / self.face.upem
+        extents = self.font.get_font_extents("ltr")
+        self.ascender = extents.ascender * self.scale
+        self.line_height = (extents.ascender - extents.descender) * self.scale
+
+    def shape(self, text: str) -> List[Tuple[int, float, float, float]]:
+        """Glyphs of a run as (glyph id, x offset, y offset, x advance) in pixels"""
+        buf = self._hb.Buffer()
+        buf.add_str(text)
+        buf.guess_segment_properties()
+        self._hb.shape(self.font, buf)
+        return [
+            (info.codepoint, pos.x_offset * self.scale, pos.y_offset * self.scale, pos.x_advance * self.scale)
+            for info, pos in zip(buf.glyph_infos, buf.glyph_positions)
+        ]
+
+    def width(self, text: str) -> float:
+        return sum(advance for _, _, _, advance in self.shape(text))
+
+    def wrap(self, text: str, max_width: float) -> List[str]:
+        """Greedy word wrap"""
+        lines, current = [], ""
+        for word in text.split():
+            candidate = f"{current} {word}".strip()
+            if current and self.width(candidate) > max_width:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+        if current:
+            lines.append(current)
+        return lines
+
+    def draw(self, canvas: np.ndarray, text: str, x: float, baseline: float) -> None:
+        """Fill a line of text into a supersampled single-channel ink canvas"""
+        for glyph, x_offset, y_offset, advance in self.shape(text):
+            pen = _PolygonPen(SUPERSAMPLE, self.scale, (x + x_offset, baseline - y_offset))
+            self.font.draw_glyph_with_pen(glyph, pen)
+            # One fill per glyph: counters are cut out by parity, while
+            # overlapping marks and bases must not cancel each other
+            if pen.contours:
+                cv2.fillPoly(canvas, pen.contours, 255)
+            x += advance
+
+
+class _PolygonPen:
+    """fontTools-style pen that flattens outlines into integer polygons"""
+
+    CURVE_STEPS = 8
+
+    def __init__(self, supersample: int, scale: float, origin: Tuple[float, float]):
+        self.supersample = supersample
+        self.scale = scale
+        self.origin = origin
+        self.contours: List[np.ndarray] = []
+        self._points: List[Tuple[float, float]] = []
+
+    def _map(self, point: Tuple[float, float]) -> Tuple[float, float]:
+        # Font units are y-up; the canvas is y-down
+        return (
+            (self.origin[0] + point[0] * self.scale) * self.supersample,
+            (self.origin[1] - point[1] * self.scale) * self.supersample
+        )
+
+    def moveTo(self, point):
+        self._points = [self._map(point)]
+
+    def lineTo(self, point):
+        self._points.append(self._map(point))
+
+    def qCurveTo(self, *points):
+        start = self._points[-1]
+        control, end = self._map(points[0]), self._map(points[-1])
+        for step in range(1, self.CURVE_STEPS + 1):
+            t = step / self.CURVE_STEPS
+            self._points.append(tuple(
+                (1 - t) ** 2 * start[i] + 2 * (1 - t) * t * control[i] + t ** 2 * end[i] for i in range(2)
+            ))
+
+    def curveTo(self, *points):
+        start = self._points[-1]
+        c1, c2, end = (self._map(p) for p in points[-3:])
+        for step in range(1, self.CURVE_STEPS + 1):
+            t = step / self.CURVE_STEPS
+            self._points.append(tuple(
+                (1 - t) ** 3 * start[i] + 3 * (1 - t) ** 2 * t * c1[i] + 3 * (1 - t) * t ** 2 * c2[i] + t ** 3 * end[i]
+                for i in range(2)
+            ))
+
+    def closePath(self):
+        if len(self._points) > 2:
+            self.contours.append(np.round(np.array(self._points)).astype(np.int32))
+        self._points = []
+
+    endPath = closePath
+
+
+def render_page(
+    renderer: TextRenderer,
+    paragraphs: List[str],
+    line_spacing: float = LINE_SPACING,
+    paragraph_gap: float = 0.0
+) -> np.ndarray:
+    """
+    Typeset paragraphs top to bottom on a white page
+
+    Args:
+        renderer: Renderer for the page's script
+        paragraphs: Text blocks; each is word-wrapped to the page width
+        line_spacing: Baseline distance in multiples of the font's line height
+        paragraph_gap: Extra space between paragraphs, in baseline distances
+
+    Returns:
+        Grayscale page (uint8, white background)
+    """
+    line_pitch = renderer.line_height * line_spacing
+    wrapped = [renderer.wrap(text, PAGE_WIDTH - 2 * MARGIN) for text in paragraphs]
+    text_height = sum(len(lines) for lines in wrapped) * line_pitch + (len(wrapped) - 1) * paragraph_gap * line_pitch
+    height = int(text_height + 2 * MARGIN)
+
+    ink = np.zeros((height * SUPERSAMPLE, PAGE_WIDTH * SUPERSAMPLE), np.uint8)
+    baseline = MARGIN + renderer.ascender
+    for lines in wrapped:
+        for line in lines:
+            renderer.draw(ink, line, MARGIN, baseline)
+            baseline += line_pitch
+        baseline += paragraph_gap * line_pitch
+
+    ink = cv2.resize(ink, (PAGE_WIDTH, height), interpolation=cv2.INTER_AREA)
+    return 255 - ink
+
+
+def _handwritten_word(renderer: TextRenderer, word: str, rng: np.random.Generator) -> Tuple[np.ndarray, float]:
+    """Ink mask of one word and its advance: letters vary in size, tilt and height, the word in slant"""
+    pad = renderer.line_height
+    width = int(renderer.width(word) * 1.1 + 2 * pad)
+    height = int(renderer.line_height + 2 * pad)
+    ink = np.zeros((height, width), np.uint8)
+
+    x = pad
+    for char in word:
+        letter = np.zeros((height * SUPERSAMPLE, width * SUPERSAMPLE), np.uint8)
+        renderer.draw(letter, char, x, pad + renderer.ascender + rng.normal(0, 2))
+        letter = cv2.resize(letter, (width, height), interpolation=cv2.INTER_AREA)
+        advance = renderer.width(char)
+        center = (x + advance / 2, pad + renderer.ascender / 2)
+        matrix = cv2.getRotationMatrix2D(center, rng.uniform(-6.0, 6.0), rng.uniform(0.88, 1.08))
+        np.maximum(ink, cv2.warpAffine(letter, matrix, (width, height), flags=cv2.INTER_LINEAR), out=ink)
+        x += advance * rng.uniform(0.95, 1.08)
+
+    # Pen strokes are thinner and less even than a bold typeface
+    ink = cv2.erode(ink, np.ones((2, 2), np.uint8), iterations=int(rng.integers(1, 3)))
+
+    slant = rng.uniform(0.05, 0.3)
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), rng.uniform(-3.0, 3.0), 1.0)
+    matrix[0, 1] -= slant
+    matrix[0, 2] += slant * height / 2
+    return cv2.warpAffine(ink, matrix, (width, height), flags=cv2.INTER_LINEAR), x - pad
+
+
+def _elastic(ink: np.ndarray, rng: np.random.Generator, alpha: float = 5.0, sigma: float = 6.0) -> np.ndarray:
+    """Smooth random displacement so strokes wobble like a moving hand"""
+    height, width = ink.shape
+    dx = cv2.GaussianBlur(rng.uniform(-1, 1, ink.shape).astype(np.float32), (0, 0), sigma)
+    dy = cv2.GaussianBlur(rng.uniform(-1, 1, ink.shape).astype(np.float32), (0, 0), sigma)
+    dx *= alpha / (np.abs(dx).max() or 1.0)
+    dy *= alpha / (np.abs(dy).max() or 1.0)
+    xx, yy = np.meshgrid(np.arange(width, dtype=np.float32), np.arange(height, dtype=np.float32))
+    return cv2.remap(ink, xx + dx, yy + dy, cv2.INTER_LINEAR)
+
+
+def render_handwritten_page(renderer: TextRenderer, text: str, rng: np.random.Generator) -> np.ndarray:
+    """
+    Write text word by word on ruled notebook paper in blue pen
+
+    Args:
+        renderer: Renderer for the page's script
+        text: Text to write; wrapped with a little slack for the slant
+        rng: Random source for the per-word variation
+
+    Returns:
+        BGR page (uint8)
+    """
+    line_pitch = renderer.line_height * LINE_SPACING
+    lines = renderer.wrap(text, (PAGE_WIDTH - 2 * MARGIN) * 0.85)
+    height = int(len(lines) * line_pitch + 2 * MARGIN)
+
+    ink = np.zeros((height, PAGE_WIDTH), np.uint8)
+    pad = int(renderer.line_height)
+    baseline = MARGIN + renderer.ascender
+    for line in lines:
+        x = MARGIN + rng.uniform(0, 20)
+        # The whole line drifts a little off the rule
+        drift = rng.uniform(-0.02, 0.02)
+        for word in line.split():
+            word_ink, advance = _handwritten_word(renderer, word, rng)
+            top = int(baseline + (x - MARGIN) * drift + rng.normal(0, 3) - renderer.ascender) - pad
+            left = int(x) - pad
+            h = min(word_ink.shape[0], height - top)
+            w = min(word_ink.shape[1], PAGE_WIDTH - left)
+            if top >= 0 and h > 0 and w > 0:
+                region = ink[top:top + h, left:left + w]
+                np.maximum(region, word_ink[:h, :w], out=region)
+            x += advance + renderer.width(" ") * rng.uniform(0.8, 1.5)
+        baseline += line_pitch
+    ink = _elastic(ink, rng)
+
+    # Notebook paper: a rule under each baseline and a margin line
+    page = np.full((height, PAGE_WIDTH, 3), 250, np.uint8)
+    rule = MARGIN + renderer.ascender + 6
+    while rule < height:
+        cv2.line(page, (0, int(rule)), (PAGE_WIDTH, int(rule)), RULE_BGR, 2)
+        rule += line_pitch
+    cv2.line(page, (MARGIN - 30, 0), (MARGIN - 30, height), MARGIN_RULE_BGR, 2)
+
+    alpha = (ink.astype(np.float32) / 255.0)[..., None]
+    page = page * (1 - alpha) + np.array(INK_BGR, np.float32) * alpha
+    return np.clip(page, 0, 255).astype(np.uint8)
+
+
+def photograph(page: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Make a clean grayscale or BGR page look like a phone photo of paper"""
+    height, width = page.shape[:2]
+    angle = rng.uniform(-2.0, 2.0)
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    border = 255 if page.ndim == 2 else (255, 255, 255)
+    page = cv2.warpAffine(page, matrix, (width, height), flags=cv2.INTER_LINEAR, borderValue=border)
+
+    # Light falling off from one corner, slightly grey paper
+    yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+    corner = (rng.uniform(0, width), rng.uniform(0, height))
+    distance = np.hypot(xx - corner[0], yy - corner[1]) / np.hypot(width, height)
+    lighting = 0.95 - 0.25 * distance
+    if page.ndim == 3:
+        lighting = lighting[..., None]
+    photo = page.astype(np.float32) * lighting
+
+    photo = cv2.GaussianBlur(photo, (0, 0), 0.9)
+    photo += rng.normal(0, 6, photo.shape)
+    photo = np.clip(photo, 0, 255).astype(np.uint8)
+    return photo if photo.ndim == 3 else cv2.cvtColor(photo, cv2.COLOR_GRAY2BGR)
+
+
+def write_image(path: Path, page: np.ndarray, rng: np.random.Generator) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() in (".jpg", ".jpeg"):
+        cv2.imwrite(str(path), photograph(page, rng), [cv2.IMWRITE_JPEG_QUALITY, 85])
+    else:
+        cv2.imwrite(str(path), page)
+
+
+def generate(renderers: Dict[str, TextRenderer], only: Optional[List[str]] = None) -> int:
+    with open(FIXTURES_DIR / "manifest.json", encoding="utf-8") as f:
+        manifest = json.load(f)
+    fixtures = manifest["fixtures"] + manifest.get("worksheets", [])
+
+    written = 0
+    for fixture in fixtures:
+        if only and fixture["id"] not in only:
+            continue
+        if fixture.get("source") not in ("synthetic", "synthetic_handwriting"):
+            print(f"⏭️ {fixture['id']}: not synthetic, supply a real image")
+            continue
+
+        # Seed per fixture so regenerating one fixture doesn't change the others
+        rng = np.random.default_rng([SEED, fixtures.index(fixture)])
+        renderer = renderers[FONT_FOR_LANGUAGE[fixture["language_code"]]]
+        if fixture["source"] == "synthetic_handwriting":
+            page = render_handwritten_page(renderer, fixture["ground_truth"], rng)
+        elif "questions" in fixture:
+            page = render_page(
+                renderer,
+                fixture["questions"],
+                line_spacing=fixture["line_spacing"],
+                paragraph_gap=fixture["question_gap"]
+            )
+        else:
+            page = render_page(renderer, [fixture["ground_truth"]])
+        write_image(FIXTURES_DIR / fixture["image"], page, rng)
+        print(f"✅ {fixture['image']}")
+        written += 1
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latin-font", required=True, help="TTF/OTF used for English fixtures")
+    parser.add_argument("--tamil-font", required=True, help="TTF/OTF with Tamil coverage")
+    parser.add_argument("--devanagari-font", required=True, help="TTF/OTF with Devanagari coverage")
+    parser.add_argument("--only", nargs="+", help="Fixture ids to regenerate")
+    args = parser.parse_args()
+
+    try:
+        renderers = {
+            "latin": TextRenderer(args.latin_font),
+            "tamil": TextRenderer(args.tamil_font),
+            "devanagari": TextRenderer(args.devanagari_font)
+        }
+    except ImportError:
+        sys.exit("uharfbuzz is required: pip install uharfbuzz")
+
+    written = generate(renderers, args.only)
+    print(f"{written} fixture images written to {FIXTURES_DIR / 'images'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Load test for the generation endpoints: throughput, tail latency and event loop lag
+
+Seeds synthetic text homework through the API, then drives
+POST /api/solution/generate, /api/practice/generate and /api/flashcards/generate
+at a fixed concurrency and writes a JSON report that can be compared across
+commits. Run the server with LLM_BACKEND=stub so results measure this service
+(pools, budgets, database, event loop) rather than OpenAI.
+
+Usage (from the backend directory, server running with LLM_BACKEND=stub):
+    python -m benchmarks.generation_loadtest
+    python -m benchmarks.generation_loadtest --concurrency 64 --requests 1000
+    python -m benchmarks.generation_loadtest --endpoints solution --duration 60
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.common import RESULTS_DIR, git_revision, percentile
+
+ENDPOINTS = {
+    "solution": "/api/solution/generate",
+    "practice": "/api/practice/generate",
+    "flashcards": "/api/flashcards/generate"
+}
+
+# Practice and flashcards are generated from a stored solution
+NEEDS_SOLUTION = {"practice", "flashcards"}
+
+QUESTION_TEMPLATES = [
+    "What is {a} + {b}? Show your working.",
+    "A shop sells {a} apples in the morning and {b} in the evening. How many apples were sold in total?",
+    "Find the area of a rectangle with length {a} cm and width {b} cm.",
+    "Explain why water boils at a lower temperature at a height of {a}00 metres.",
+    "If a train travels {a} km in {b} hours, what is its average speed?"
+]
+
+
+class LoopLagProbe:
+    """Event loop lag of the load generator itself, to tell client stalls from server latency"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, (time.perf_counter() - start - self.interval) * 1000))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+async def seed_homework(client: httpx.AsyncClient, count: int, language: str) -> List[str]:
+    """Upload `count` distinct text questions and return their homework IDs"""
+    homework_ids = []
+    for i in range(count):
+        question = QUESTION_TEMPLATES[i % len(QUESTION_TEMPLATES)].format(a=i + 2, b=i % 7 + 3)
+        response = await client.post("/api/homework/upload", data={
+            "input_type": "text",
+            "input_language": language,
+            "output_language": language,
+            "text_input": f"[loadtest {i}] {question}"
+        })
+        response.raise_for_status()
+        homework_ids.append(response.json()["homework_id"])
+    return homework_ids
+
+
+async def cleanup_homework(client: httpx.AsyncClient, homework_ids: List[str]) -> None:
+    """Delete seeded homework and everything generated from it"""
+    for homework_id in homework_ids:
+        try:
+            await client.delete(f"/api/utility/homework/{homework_id}")
+        except httpx.HTTPError as e:
+            print(f"⚠️  Could not delete {homework_id}: {e}")
+
+
+def request_body(endpoint: str, homework_id: str, language: str, question_count: int) -> Dict:
+    body = {"homework_id": homework_id, "output_language": language}
+    if endpoint == "practice":
+        body["question_count"] = question_count
+    return body
+
+
+async def sample_server_lag(client: httpx.AsyncClient, samples: List[Dict], interval: float) -> None:
+    """Poll the server's event loop lag metrics while the load runs"""
+    while True:
+        try:
+            response = await client.get("/api/metrics/event-loop")
+            if response.status_code == 200:
+                samples.append(response.json())
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(interval)
+
+
+def summarize(latencies: List[float], statuses: Dict[str, int], elapsed: float) -> Dict:
+    ok = statuses.get("200", 0)
+    return {
+        "requests": sum(statuses.values()),
+        "ok": ok,
+        "errors": sum(statuses.values()) - ok,
+        "statuses": statuses,
+        "throughput_rps": round(ok / elapsed, 2) if elapsed else None,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": max(latencies) if latencies else None
+    }
+
+
+async def run_load(args) -> Dict:
+    limits = httpx.Limits(max_connections=args.concurrency + 4, max_keepalive_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        root = await client.get("/")
+        root.raise_for_status()
+
+        print(f"🌱 Seeding {args.homework} homework questions...")
+        homework_ids = await seed_homework(client, args.homework, args.language)
+
+        try:
+            if NEEDS_SOLUTION & set(args.endpoints):
+                print("🔥 Warming up: one solution per homework...")
+                warmup = await asyncio.gather(*[
+                    client.post(ENDPOINTS["solution"], json=request_body("solution", homework_id, args.language, 0))
+                    for homework_id in homework_ids
+                ])
+                failed = [r for r in warmup if r.status_code != 200]
+                if failed:
+                    raise SystemExit(f"Warm-up failed ({failed[0].status_code}): {failed[0].text[:300]}")
+
+            latencies: Dict[str, List[float]] = {endpoint: [] for endpoint in args.endpoints}
+            statuses: Dict[str, Dict[str, int]] = {endpoint: {} for endpoint in args.endpoints}
+            server_lag: List[Dict] = []
+            issued = 0
+            deadline = time.perf_counter() + args.duration if args.duration else None
+
+            def next_request() -> Optional[int]:
+                nonlocal issued
+                if deadline is not None:
+                    if time.perf_counter() >= deadline:
+                        return None
+                elif issued >= args.requests:
+                    return None
+                issued += 1
+                return issued - 1
+
+            async def worker() -> None:
+                while (n := next_request()) is not None:
+                    endpoint = args.endpoints[n % len(args.endpoints)]
+                    homework_id = homework_ids[n % len(homework_ids)]
+                    body = request_body(endpoint, homework_id, args.language, args.question_count)
+                    start = time.perf_counter()
+                    try:
+                        response = await client.post(ENDPOINTS[endpoint], json=body)
+                        status = str(response.status_code)
+                    except httpx.HTTPError as e:
+                        status = type(e).__name__
+                    elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+                    statuses[endpoint][status] = statuses[endpoint].get(status, 0) + 1
+                    if status == "200":
+                        latencies[endpoint].append(elapsed_ms)
+
+            target = f"{args.duration}s" if args.duration else f"{args.requests} requests"
+            print(f"🚀 {target} at concurrency {args.concurrency} against {', '.join(args.endpoints)}...")
+            probe = LoopLagProbe()
+            probe.start()
+            sampler = asyncio.create_task(sample_server_lag(client, server_lag, args.lag_interval))
+            start = time.perf_counter()
+            await asyncio.gather(*[worker() for _ in range(args.concurrency)])
+            elapsed = time.perf_counter() - start
+            sampler.cancel()
+            await probe.stop()
+
+            all_latencies = [value for values in latencies.values() for value in values]
+            all_statuses: Dict[str, int] = {}
+            for endpoint_statuses in statuses.values():
+                for status, count in endpoint_statuses.items():
+                    all_statuses[status] = all_statuses.get(status, 0) + count
+
+            server_p99 = [s["p99_ms"] for s in server_lag if s.get("p99_ms") is not None]
+            report = {
+                **git_revision(),
+                "timestamp": datetime.utcnow().isoformat(),
+                "base_url": args.base_url,
+                "concurrency": args.concurrency,
+                "language": args.language,
+                "elapsed_s": round(elapsed, 2),
+                "overall": summarize(all_latencies, all_statuses, elapsed),
+                "endpoints": {
+                    endpoint: summarize(latencies[endpoint], statuses[endpoint], elapsed)
+                    for endpoint in args.endpoints
+                },
+                "server_event_loop": {
+                    "samples": len(server_lag),
+                    "p99_ms": max(server_p99) if server_p99 else None,
+                    "max_ms": max((s["window_max_ms"] or 0) for s in server_lag) if server_lag else None
+                },
+                "client_event_loop": {
+                    "p99_ms": round(percentile(probe.samples, 99), 2) if probe.samples else None,
+                    "max_ms": round(max(probe.samples), 2) if probe.samples else None
+                }
+            }
+
+            try:
+                report["server_llm"] = (await client.get("/api/metrics/llm")).json()
+            except (httpx.HTTPError, ValueError):
+                report["server_llm"] = None
+            return report
+        finally:
+            if not args.keep_data:
+                print("🧹 Removing seeded homework...")
+                await cleanup_homework(client, homework_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the solution, practice and flashcard generation endpoints")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight")
+    parser.add_argument("--requests", type=int, default=300, help="Total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, help="Run for this many seconds instead of a request count")
+    parser.add_argument("--homework", type=int, default=20, help="Distinct homework questions to seed")
+    parser.add_argument("--language", choices=["en", "ta", "hi"], default="en")
+    parser.add_argument("--question-count", type=int, default=5, help="Practice questions per test")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--lag-interval", type=float, default=1.0, help="Seconds between server lag samples")
+    parser.add_argument("--keep-data", action="store_true", help="Don't delete the seeded homework afterwards")
+    parser.add_argument("--output", type=Path, help="Report file (default: results/loadtest-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args))
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        output = RESULTS_DIR / f"loadtest-{(report['commit'] or 'nogit')[:10]}-{stamp}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"\n{'endpoint':<12}{'ok':>7}{'errors':>8}{'rps':>9}{'p50_ms':>10}{'p95_ms':>10}{'p99_ms':>10}")
+    for name, summary in [*report["endpoints"].items(), ("overall", report["overall"])]:
+        print(
+            f"{name:<12}{summary['ok']:>7}{summary['errors']:>8}{str(summary['throughput_rps']):>9}"
+            f"{str(summary['p50_ms']):>10}{str(summary['p95_ms']):>10}{str(summary['p99_ms']):>10}"
+        )
+    print(
+        f"\nEvent loop lag p99/max: server {report['server_event_loop']['p99_ms']}/{report['server_event_loop']['max_ms']} ms, "
+        f"client {report['client_event_loop']['p99_ms']}/{report['client_event_loop']['max_ms']} ms"
+    )
+    print(f"\n✅ Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Worksheet layout check: question regions found per worksheet fixture
+
+Runs LayoutSegmenter.segment on every entry under "worksheets" in
+benchmarks/fixtures/manifest.json and compares the region count with
+expected_regions. Exits non-zero on any mismatch.
+
+Usage (from the backend directory, with .env configured):
+    python -m benchmarks.layout_check
+"""
+import json
+import sys
+import time
+from pathlib import Path
+import cv2
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+def main() -> None:
+    from app.operations.layout_segmenter import LayoutSegmenter
+
+    with open(FIXTURES_DIR / "manifest.json", encoding="utf-8") as f:
+        worksheets = json.load(f).get("worksheets", [])
+
+    failures = 0
+    for worksheet in worksheets:
+        image = cv2.imread(str(FIXTURES_DIR / worksheet["image"]))
+        if image is None:
+            print(f"⚠️ Skipping missing fixture {worksheet['image']}")
+            continue
+
+        started = time.perf_counter()
+        regions = LayoutSegmenter.segment(image)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        ok = len(regions) == worksheet["expected_regions"]
+        failures += not ok
+        print(
+            f"{'✅' if ok else '❌'} {worksheet['id']}: {len(regions)} regions "
+            f"(expected {worksheet['expected_regions']}) in {elapsed_ms:.1f} ms"
+        )
+
+    if failures:
+        sys.exit(f"{failures} worksheet(s) segmented incorrectly")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+OCR benchmark: latency, peak memory and accuracy per ImageProcessor path
+
+Runs every fixture in benchmarks/fixtures/manifest.json through each OCR path
+and writes a JSON report that can be compared across commits.
+
+Usage (from the backend directory, with .env configured):
+    python -m benchmarks.ocr_benchmark
+    python -m benchmarks.ocr_benchmark --paths tesseract multi_psm --repeats 5
+    python -m benchmarks.ocr_benchmark --compare benchmarks/results/<baseline>.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import psutil
+from rapidfuzz.distance import Levenshtein
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.common import RESULTS_DIR, git_revision, percentile
+
+PATHS = ["pix2text", "easyocr", "tesseract", "multi_psm", "fallback"]
+
+# Pix2Text and the EasyOCR reader are English-only; other scripts only run through Tesseract paths
+ENGLISH_ONLY_PATHS = {"pix2text", "easyocr"}
+
+
+def _ocr_paths(processor) -> Dict[str, Callable[[str, str], str]]:
+    """OCR path name -> callable(image_path, language_code)"""
+    return {
+        "pix2text": lambda path, lang: processor.extract_text_with_pix2text(path),
+        "easyocr": lambda path, lang: processor.extract_text_with_easyocr(path),
+        "tesseract": lambda path, lang: processor.extract_text_with_tesseract(path, lang),
+        "multi_psm": lambda path, lang: processor.extract_text_with_multiple_psm_modes(path, lang),
+        "fallback": lambda path, lang: processor.extract_text_with_ocr_fallback(path, lang)
+    }
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalize and collapse whitespace so layout differences don't count as errors"""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def character_error_rate(hypothesis: str, reference: str) -> float:
+    """Levenshtein distance over reference length (can exceed 1.0 for long garbage output)"""
+    reference = normalize_text(reference)
+    hypothesis = normalize_text(hypothesis)
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    return Levenshtein.distance(hypothesis, reference) / len(reference)
+
+
+class PeakRSSSampler:
+    """Samples this process's RSS in the background and keeps the maximum"""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, self._process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self._process.memory_info().rss)
+
+
+def load_manifest(manifest_path: Path) -> List[Dict]:
+    with open(manifest_path, encoding="utf-8") as f:
+        fixtures = json.load(f)["fixtures"]
+
+    available = []
+    for fixture in fixtures:
+        image_path = manifest_path.parent / fixture["image"]
+        if not image_path.exists():
+            print(f"⚠️ Skipping missing fixture {fixture['image']}")
+            continue
+        available.append({**fixture, "image_path": str(image_path)})
+    return available
+
+
+def _benchmark_path(path_name: str, fixtures: List[Dict], repeats: int, warmup: int, queue) -> None:
+    """
+    Run one OCR path over all fixtures (executed in a fresh process)
+
+    A separate process per path keeps model memory and warm caches of one
+    engine from leaking into another engine's numbers.
+    """
+    from app.operations.image_processor import ImageProcessor
+
+    processor = ImageProcessor()
+    run = _ocr_paths(processor)[path_name]
+    results = []
+
+    with PeakRSSSampler() as sampler:
+        for fixture in fixtures:
+            if path_name in ENGLISH_ONLY_PATHS and fixture["language_code"] != "eng":
+                continue
+
+            entry = {
+                "id": fixture["id"],
+                "category": fixture["category"],
+                "language_code": fixture["language_code"],
+                "latencies_ms": [],
+                "cer": None,
+                "error": None
+            }
+            try:
+                # Warm-up runs load models and are not timed
+                for _ in range(warmup):
+                    run(fixture["image_path"], fixture["language_code"])
+
+                text = ""
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    text = run(fixture["image_path"], fixture["language_code"])
+                    entry["latencies_ms"].append(round((time.perf_counter() - start) * 1000, 2))
+
+                entry["cer"] = round(character_error_rate(text, fixture["ground_truth"]), 4)
+                entry["output"] = text
+            except Exception as e:
+                entry["error"] = f"{type(e).__name__}: {str(e)}"
+
+            results.append(entry)
+
+    queue.put({"fixtures": results, "peak_rss_mb": round(sampler.peak_bytes / (1024 * 1024), 1)})
+
+
+def summarize(fixtures: List[Dict]) -> Dict:
+    latencies = [ms for f in fixtures for ms in f["latencies_ms"]]
+    cers = [f["cer"] for f in fixtures if f["cer"] is not None]
+    return {
+        "samples": len(latencies),
+        "errors": sum(1 for f in fixtures if f["error"]),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "mean_cer": round(statistics.mean(cers), 4) if cers else None
+    }
+
+
+def run_benchmark(manifest_path: Path, paths: List[str], repeats: int, warmup: int) -> Dict:
+    fixtures = load_manifest(manifest_path)
+    if not fixtures:
+        raise SystemExit(f"No fixture images found next to {manifest_path}")
+
+    context = multiprocessing.get_context("spawn")
+    report = {
+        **git_revision(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "repeats": repeats,
+        "warmup": warmup,
+        "fixture_count": len(fixtures),
+        "paths": {}
+    }
+
+    for path_name in paths:
+        print(f"▶ {path_name}")
+        queue = context.Queue()
+        worker = context.Process(target=_benchmark_path, args=(path_name, fixtures, repeats, warmup, queue))
+        worker.start()
+        result = queue.get()
+        worker.join()
+
+        categories = sorted({f["category"] for f in result["fixtures"]})
+        report["paths"][path_name] = {
+            **summarize(result["fixtures"]),
+            "peak_rss_mb": result["peak_rss_mb"],
+            "by_category": {
+                category: summarize([f for f in result["fixtures"] if f["category"] == category])
+                for category in categories
+            },
+            "fixtures": result["fixtures"]
+        }
+
+    return report
+
+
+def _delta(current: Optional[float], baseline: Optional[float]) -> str:
+    if current is None or baseline is None:
+        return "n/a"
+    if baseline == 0:
+        return f"{current - baseline:+.3f}"
+    return f"{(current - baseline) / baseline * 100:+.1f}%"
+
+
+def compare(report: Dict, baseline: Dict) -> None:
+    """Print per-path changes against a baseline report"""
+    print(f"\nBaseline {str(baseline.get('commit'))[:10]} -> current {str(report.get('commit'))[:10]}")
+    print(f"{'path':<12}{'metric':<14}{'baseline':>12}{'current':>12}{'change':>10}")
+    for path_name, current in report["paths"].items():
+        previous = baseline.get("paths", {}).get(path_name)
+        if not previous:
+            print(f"{path_name:<12}(not in baseline)")
+            continue
+        for metric in ("p50_ms", "p95_ms", "peak_rss_mb", "mean_cer"):
+            print(
+                f"{path_name:<12}{metric:<14}{str(previous.get(metric)):>12}"
+                f"{str(current.get(metric)):>12}{_delta(current.get(metric), previous.get(metric)):>10}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark ImageProcessor OCR paths")
+    parser.add_argument("--manifest", type=Path, default=FIXTURES_DIR / "manifest.json")
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=PATHS)
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per fixture")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per fixture")
+    parser.add_argument("--output", type=Path, help="Report file (default: results/<commit>-<time>.json)")
+    parser.add_argument("--compare", type=Path, help="Baseline report to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.manifest, args.paths, args.repeats, args.warmup)
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        output = RESULTS_DIR / f"{(report['commit'] or 'nogit')[:10]}-{stamp}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"\n{'path':<12}{'p50_ms':>10}{'p95_ms':>10}{'rss_mb':>10}{'cer':>8}{'errors':>8}")
+    for path_name, summary in report["paths"].items():
+        print(
+            f"{path_name:<12}{str(summary['p50_ms']):>10}{str(summary['p95_ms']):>10}"
+            f"{str(summary['peak_rss_mb']):>10}{str(summary['mean_cer']):>8}{summary['errors']:>8}"
+        )
+    print(f"\n✅ Report written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
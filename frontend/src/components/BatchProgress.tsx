@@ -8,6 +8,7 @@ interface BatchProgressProps {
   onClose: () => void;
   isProcessing: boolean;
   results?: BatchResultItem[];
+  total?: number; // items in the batch, for the progress bar while processing
   totalProcessed?: number;
   successful?: number;
   failed?: number;
@@ -19,6 +20,7 @@ export function BatchProgress({
   onClose,
   isProcessing,
   results = [],
+  total = 0,
   totalProcessed = 0,
   successful = 0,
   failed = 0,
@@ -47,21 +49,26 @@ export function BatchProgress({
         <CardContent className="flex-1 overflow-y-auto p-6">
           {/* Processing Indicator */}
           {isProcessing && (
-            <div className="flex items-center justify-center py-8">
-              <div className="text-center">
-                <Loader2 className="h-12 w-12 animate-spin text-blue-600 mx-auto mb-4" />
+            <div className="py-6">
+              <div className="flex items-center gap-3 mb-3">
+                <Loader2 className="h-6 w-6 animate-spin text-blue-600" />
                 <p className="text-gray-600 text-lg font-medium">
-                  Generating solutions...
-                </p>
-                <p className="text-gray-500 text-sm mt-1">
-                  This may take a minute
+                  Generating solutions... {total > 0 && `${results.length} of ${total}`}
                 </p>
               </div>
+              {total > 0 && (
+                <div className="w-full bg-gray-200 rounded-full h-2">
+                  <div
+                    className="bg-blue-600 h-2 rounded-full transition-all"
+                    style={{ width: `${Math.round((results.length / total) * 100)}%` }}
+                  />
+                </div>
+              )}
             </div>
           )}
 
           {/* Summary Stats */}
-          {!isProcessing && totalProcessed > 0 && (
+          {totalProcessed > 0 && (
             <div className="grid grid-cols-4 gap-4 mb-6">
               <div className="bg-gray-50 p-4 rounded-lg text-center">
                 <p className="text-2xl font-bold text-gray-900">{totalProcessed}</p>
@@ -82,8 +89,8 @@ export function BatchProgress({
             </div>
           )}
 
-          {/* Results List */}
-          {!isProcessing && results.length > 0 && (
+          {/* Results List (filled in as items finish) */}
+          {results.length > 0 && (
             <div className="space-y-3">
               <h3 className="font-semibold text-gray-900 mb-3">Details:</h3>
               {results.map((result, index) => (
@@ -9,7 +9,7 @@ import { searchApi, HomeworkSearchResult, FlashcardSearchResult } from '@/servic
 import { utilityApi, BatchGenerateResponse } from '@/services/utilityApi';
 import { ConfirmDialog } from '@/components/ConfirmDialog';
 import { BatchProgress } from '@/components/BatchProgress';
-import { SUBJECTS } from '@/utils/constants';
+import { BATCH_MAX_ITEMS, SUBJECTS } from '@/utils/constants';
 import { formatDate } from '@/utils/formatters';
 import type { Subject } from '@/types/homework';
 
@@ -175,7 +175,18 @@ export function LibraryPage() {
     setBatchResults(null);
 
     try {
-      const results = await utilityApi.batchGenerateSolutions(Array.from(selectedHomework));
+      // Stream per-item results into the progress dialog as they finish
+      const results = await utilityApi.batchGenerateSolutionsStream(
+        Array.from(selectedHomework),
+        (progress) =>
+          setBatchResults((prev) => ({
+            results: [...(prev?.results ?? []), progress.result],
+            total_processed: progress.completed,
+            successful: progress.successful,
+            failed: progress.failed,
+            skipped: progress.skipped,
+          }))
+      );
       setBatchResults(results);
 
       // Refresh homework list to show newly generated solutions
@@ -242,7 +253,7 @@ export function LibraryPage() {
                 </h3>
                 <p className="text-sm text-blue-700">
                   {selectedHomework.size > 0
-                    ? `${selectedHomework.size} homework selected • Max 10 at a time`
+                    ? `${selectedHomework.size} homework selected • Max ${BATCH_MAX_ITEMS} at a time`
                     : `${unsolvedCount} unsolved homework available`}
                 </p>
               </div>
@@ -255,7 +266,7 @@ export function LibraryPage() {
                     <Button
                       size="sm"
                       onClick={handleBatchGenerate}
-                      disabled={selectedHomework.size === 0 || selectedHomework.size > 10}
+                      disabled={selectedHomework.size === 0 || selectedHomework.size > BATCH_MAX_ITEMS}
                       className="bg-blue-600 hover:bg-blue-700 text-white"
                     >
                       <Zap className="h-4 w-4 mr-2" />
@@ -580,6 +591,7 @@ export function LibraryPage() {
         }}
         isProcessing={isBatchProcessing}
         results={batchResults?.results}
+        total={selectedHomework.size}
         totalProcessed={batchResults?.total_processed}
         successful={batchResults?.successful}
         failed={batchResults?.failed}
@@ -12,6 +12,7 @@ import { solutionApi } from '@/services/solutionApi';
 import { INPUT_TYPES, LANGUAGES } from '@/utils/constants';
 import { validateImageFile, validateTextInput, validateAudioFile } from '@/utils/validators';
 import type { InputType, Language } from '@/types/homework';
+import type { SolutionStep } from '@/types/solution';
 
 export function ScanHomeworkPage() {
   const navigate = useNavigate();
@@ -34,6 +35,9 @@ export function ScanHomeworkPage() {
   const [generateAudio, setGenerateAudio] = useState(false);
   const [audioLanguage, setAudioLanguage] = useState<Language>('en');
 
+  // Solution steps received so far while the solution is streaming
+  const [streamedSteps, setStreamedSteps] = useState<SolutionStep[]>([]);
+
   const handleImageUpload = (e: React.ChangeEvent<HTMLInputElement>) => {
     const file = e.target.files?.[0];
     if (file) {
@@ -107,13 +111,19 @@ export function ScanHomeworkPage() {
         audio_file: audioFile || undefined,
       });
 
-      // Generate solution
-      const solution = await solutionApi.generateSolution({
-        homework_id: homeworkData.homework_id,
-        generate_audio: generateAudio,
-        output_language: outputLanguage,
-        audio_language: generateAudio ? audioLanguage : undefined,
-      });
+      // Generate solution, showing steps as they arrive
+      setStreamedSteps([]);
+      const solution = await solutionApi.generateSolutionStream(
+        {
+          homework_id: homeworkData.homework_id,
+          generate_audio: generateAudio,
+          output_language: outputLanguage,
+          audio_language: generateAudio ? audioLanguage : undefined,
+        },
+        {
+          onStep: (step) => setStreamedSteps((steps) => [...steps, step]),
+        }
+      );
 
       // Navigate to solution page
       navigate(`/solution/${solution.solution_id}`);
@@ -416,6 +426,27 @@ export function ScanHomeworkPage() {
         </Card>
       )}
 
+      {/* Solution Preview (while streaming) */}
+      {isLoading && streamedSteps.length > 0 && (
+        <Card className="mb-6">
+          <CardHeader>
+            <CardTitle>Working on it...</CardTitle>
+          </CardHeader>
+          <CardContent>
+            <ol className="space-y-3">
+              {streamedSteps.map((step) => (
+                <li key={step.step_number} className="flex items-start gap-3">
+                  <div className="flex-shrink-0 w-8 h-8 bg-blue-600 text-white rounded-full flex items-center justify-center font-bold">
+                    {step.step_number}
+                  </div>
+                  <p className="flex-1 text-gray-900 leading-relaxed">{step.explanation}</p>
+                </li>
+              ))}
+            </ol>
+          </CardContent>
+        </Card>
+      )}
+
       {/* Error Message */}
       {error && (
         <div className="bg-red-50 border border-red-200 text-red-700 px-4 py-3 rounded-lg mb-6">
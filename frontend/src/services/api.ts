@@ -1,6 +1,6 @@
 import axios from 'axios';
 
-const API_URL = import.meta.env.VITE_API_URL || 'http://192.168.5.99:8000';
+export const API_URL = import.meta.env.VITE_API_URL || 'http://192.168.5.99:8000';
 
 const api = axios.create({
   baseURL: API_URL,
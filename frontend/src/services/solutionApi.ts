@@ -1,5 +1,11 @@
-import api from './api';
-import { Solution, SolutionGenerateRequest } from '../types/solution';
+import api, { API_URL } from './api';
+import { readEventStream } from './sse';
+import {
+  Solution,
+  SolutionGenerateRequest,
+  SolutionStreamDone,
+  SolutionStreamHandlers,
+} from '../types/solution';
 
 export const solutionApi = {
   generateSolution: async (data: SolutionGenerateRequest): Promise<Solution> => {
@@ -7,6 +13,50 @@ export const solutionApi = {
     return response.data;
   },
 
+  /**
+   * Generate a solution over Server-Sent Events. Steps are delivered to the
+   * handlers as soon as the model produces them; resolves once the solution
+   * has been saved.
+   */
+  generateSolutionStream: async (
+    data: SolutionGenerateRequest,
+    handlers: SolutionStreamHandlers = {},
+    signal?: AbortSignal
+  ): Promise<SolutionStreamDone> => {
+    const response = await fetch(`${API_URL}/api/solution/generate/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+      body: JSON.stringify(data),
+      signal,
+    });
+
+    let result = null as SolutionStreamDone | null;
+    await readEventStream(response, (event, eventData) => {
+      switch (event) {
+        case 'meta':
+          handlers.onMeta?.(eventData);
+          break;
+        case 'step':
+          handlers.onStep?.(eventData);
+          break;
+        case 'final_answer':
+          handlers.onFinalAnswer?.(eventData.final_answer);
+          break;
+        case 'concepts':
+          handlers.onConcepts?.(eventData.concepts_covered);
+          break;
+        case 'done':
+          result = eventData;
+          return true;
+        case 'error':
+          throw new Error(eventData.detail || 'Solution generation failed');
+      }
+    });
+
+    if (result) return result;
+    throw new Error('Solution stream ended unexpectedly');
+  },
+
   getSolution: async (solutionId: string): Promise<Solution> => {
     const response = await api.get(`/api/solution/${solutionId}`);
     return response.data;
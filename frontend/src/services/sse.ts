@@ -0,0 +1,43 @@
+/**
+ * Read a Server-Sent Events response body, calling onEvent for each event.
+ * Stops early when onEvent returns true.
+ */
+export async function readEventStream(
+  response: Response,
+  onEvent: (event: string, data: any) => boolean | void
+): Promise<void> {
+  if (!response.ok || !response.body) {
+    const body = await response.json().catch(() => null);
+    throw new Error(body?.detail || `Request failed (${response.status})`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) return;
+    buffer += decoder.decode(value, { stream: true });
+
+    // Events are separated by a blank line
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+
+      let event = 'message';
+      let payload = '';
+      for (const line of rawEvent.split('\n')) {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) payload += line.slice(5).trim();
+      }
+
+      if (onEvent(event, payload ? JSON.parse(payload) : {})) {
+        await reader.cancel();
+        return;
+      }
+    }
+  }
+}
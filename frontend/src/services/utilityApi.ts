@@ -1,4 +1,5 @@
-import api from './api';
+import api, { API_URL } from './api';
+import { readEventStream } from './sse';
 
 export interface DeleteResponse {
   message: string;
@@ -14,7 +15,7 @@ export interface BatchResultItem {
 }
 
 export interface BatchGenerateRequest {
-  homework_ids: string[]; // 1-10 items
+  homework_ids: string[]; // 1-BATCH_MAX_ITEMS items
 }
 
 export interface BatchGenerateResponse {
@@ -25,6 +26,15 @@ export interface BatchGenerateResponse {
   skipped: number;
 }
 
+export interface BatchProgressEvent {
+  result: BatchResultItem;
+  completed: number;
+  total: number;
+  successful: number;
+  failed: number;
+  skipped: number;
+}
+
 export const utilityApi = {
   deleteHomework: async (homeworkId: string): Promise<DeleteResponse> => {
     const response = await api.delete(`/api/utility/homework/${homeworkId}`);
@@ -42,4 +52,39 @@ export const utilityApi = {
     });
     return response.data;
   },
+
+  /**
+   * Batch generation over Server-Sent Events: onProgress is called as each
+   * homework item finishes; resolves with the final summary.
+   */
+  batchGenerateSolutionsStream: async (
+    homeworkIds: string[],
+    onProgress: (progress: BatchProgressEvent) => void,
+    signal?: AbortSignal
+  ): Promise<BatchGenerateResponse> => {
+    const response = await fetch(`${API_URL}/api/utility/batch/generate-solutions/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+      body: JSON.stringify({ homework_ids: homeworkIds }),
+      signal,
+    });
+
+    const results: BatchResultItem[] = [];
+    let summary = null as Omit<BatchGenerateResponse, 'results'> | null;
+
+    await readEventStream(response, (event, data) => {
+      if (event === 'progress') {
+        results.push(data.result);
+        onProgress(data);
+      } else if (event === 'done') {
+        summary = data;
+        return true;
+      } else if (event === 'error') {
+        throw new Error(data.detail || 'Batch generation failed');
+      }
+    });
+
+    if (!summary) throw new Error('Batch stream ended unexpectedly');
+    return { ...summary, results };
+  },
 };
@@ -23,3 +23,24 @@ export interface SolutionGenerateRequest {
   output_language: string;
   audio_language?: string;
 }
+
+export interface SolutionStreamMeta {
+  homework_id: string;
+  question: string;
+  subject: string;
+  output_language: string;
+}
+
+export interface SolutionStreamDone {
+  solution_id: string;
+  homework_id: string;
+  audio_url?: string | null;
+  created_at: string;
+}
+
+export interface SolutionStreamHandlers {
+  onMeta?: (meta: SolutionStreamMeta) => void;
+  onStep?: (step: SolutionStep) => void;
+  onFinalAnswer?: (finalAnswer: string) => void;
+  onConcepts?: (concepts: string[]) => void;
+}
@@ -17,6 +17,9 @@ export const INPUT_TYPES = {
   audio: { code: 'audio', name: 'Voice Input', icon: '🎤', description: 'Record your question' },
 } as const;
 
+// Must match BATCH_MAX_ITEMS on the backend
+export const BATCH_MAX_ITEMS = 500;
+
 export const API_ROUTES = {
   homework: {
     upload: '/api/homework/upload',